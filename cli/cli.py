@@ -3,45 +3,82 @@ import os
 import random
 import argparse
 import json
+from functools import partial
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.generation.graph_generator import generate_synthetic_graph, convert_to_dag
-from src.generation.graph_annotator import annotate_graph
-from src.utils.graph_io import export_graph, load_graph
-from src.utils.graph_visualizer import visualize_graph
-from src.utils.downloader import read_urls, download_dataset, download_all
-from src.benchmark.heft import heft_schedule, visualize_schedule
-from src.benchmark.edf import edf_schedule, visualize_edf
-from src.benchmark.heft_star import heft_star_schedule
-from src.benchmark.main import (
-    benchmark_algorithms_with_params,
-    plot_comparison_per_network,
-    plot_comparison_per_algorithm,
-    plot_average_per_network,
-)
-from src.benchmark.plotter import (
-    plot_gang_impact_on_makespan,
-    plot_gang_task_percentage,
-    plot_makespan_comparison,
-    plot_utilization_comparison,
-    plot_core_utilization_distribution,
-    plot_scheduling_efficiency,
-    plot_topology_influence_on_scheduling,
+# Only the dependency-free constants the argument parser needs are imported
+# here; each command imports the rest, so NumPy, networkx, plotting and
+# networking load only for the commands using them.
+from src.utils.constants import (
+    CENTRALITY_METHODS,
+    DEFAULT_BASELINE,
+    DEFAULT_MAX_BYTES,
+    DEFAULT_STARTUP_BUDGET_MS,
+    DEFAULT_THRESHOLD,
+    DISTRIBUTIONS,
+    GRAPH_TYPES,
+    HEFT_POLICIES,
+    SUITE_CASE_NAMES,
+    SUITE_SIZES,
+    TRACE_LEVELS,
 )
 
 
+def args_annotation_config(args):
+    from src.generation.graph_annotator import annotation_config
+
+    return annotation_config(
+        weight_distribution=args.weight_distribution,
+        edge_distribution=args.edge_distribution,
+        ccr=args.ccr,
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(description="DAG Scheduling Benchmarks CLI")
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
-    gen_parser = subparsers.add_parser("generate", help="Generate a synthetic graph")
+    seed_parser = argparse.ArgumentParser(add_help=False)
+    seed_parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Random seed for graph generation, annotation and processor speeds.",
+    )
+    annotation_parser = argparse.ArgumentParser(add_help=False)
+    annotation_parser.add_argument(
+        "--weight-distribution",
+        type=str,
+        default=None,
+        choices=DISTRIBUTIONS,
+        help="Distribution of task weights.",
+    )
+    annotation_parser.add_argument(
+        "--edge-distribution",
+        type=str,
+        default=None,
+        choices=DISTRIBUTIONS,
+        help="Distribution of edge communication costs.",
+    )
+    annotation_parser.add_argument(
+        "--ccr",
+        type=float,
+        default=None,
+        help="Scale communication costs to this communication-to-computation ratio.",
+    )
+
+    gen_parser = subparsers.add_parser(
+        "generate",
+        help="Generate a synthetic graph",
+        parents=[seed_parser, annotation_parser],
+    )
     gen_parser.add_argument(
         "--graph-type",
         type=str,
         required=True,
-        choices=["barabasi_albert", "watts_strogatz", "erdos_renyi"],
+        choices=GRAPH_TYPES,
         help="Type of graph to generate.",
     )
     gen_parser.add_argument("--nodes", type=int, default=100, help="Number of nodes.")
@@ -52,7 +89,10 @@ def main():
         help='Graph model parameters as a JSON string (e.g., \'{"m": 3, "p": 0.1}\')',
     )
     gen_parser.add_argument(
-        "--output", type=str, default="output_dag.gml", help="Output filename."
+        "--output",
+        type=str,
+        default="output_dag.gml",
+        help="Output filename; a .dagz extension writes the compact binary format.",
     )
     gen_parser.add_argument(
         "--visualize", action="store_true", help="Visualize the generated DAG."
@@ -71,12 +111,15 @@ def main():
         required=True,
         help="Type of dataset to download (e.g., social_networks, biological_networks).",
     )
+    download_parser.add_argument(
+        "--workers", type=int, default=4, help="Number of concurrent downloads."
+    )
 
     benchmark_parser = subparsers.add_parser(
-        "benchmark", help="Benchmark Scheduling Algorithm"
+        "benchmark", help="Benchmark Scheduling Algorithm", parents=[seed_parser]
     )
     benchmark_parser.add_argument(
-        "--input", type=str, required=True, help="Graph input"
+        "--input", type=str, required=True, help="Graph input (.gml or .dagz)"
     )
     benchmark_parser.add_argument(
         "--num-proc", type=int, default=3, help="Number of processors."
@@ -84,8 +127,80 @@ def main():
     benchmark_parser.add_argument(
         "--visualize", action="store_true", help="Visualize the generated DAG."
     )
+    benchmark_parser.add_argument(
+        "--policy",
+        type=str,
+        default="append",
+        choices=HEFT_POLICIES,
+        help="HEFT placement policy: append after the last task, or insert into idle gaps.",
+    )
+    benchmark_parser.add_argument(
+        "--centrality",
+        type=str,
+        default="exact",
+        choices=CENTRALITY_METHODS,
+        help="Centrality used by HEFT* to prioritize tasks.",
+    )
+    benchmark_parser.add_argument(
+        "--centrality-k",
+        type=int,
+        default=64,
+        help="Number of pivots for sampled centrality.",
+    )
+    benchmark_parser.add_argument(
+        "--cost-matrix",
+        type=str,
+        default=None,
+        help="Execution time of every task on every processor (.npy or CSV, one row per task in graph node order).",
+    )
+    benchmark_parser.add_argument(
+        "--deadline-factor",
+        type=float,
+        default=1.0,
+        help="Each EDF task must finish by its latest finish time in a schedule this many times as long as the critical path, unless the DAG has 'deadline' node attributes.",
+    )
+    benchmark_parser.add_argument(
+        "--trace",
+        type=str,
+        default="summary",
+        choices=TRACE_LEVELS,
+        help="Print a summary per run, or also record every task placement.",
+    )
+    benchmark_parser.add_argument(
+        "--trace-output",
+        type=str,
+        default=None,
+        help="Record every task placement and write the events to this file (.ndjson or .parquet).",
+    )
+    benchmark_parser.add_argument(
+        "--gantt-dir",
+        type=str,
+        default=None,
+        help="Write each schedule's Gantt chart to this directory instead of showing it.",
+    )
+    benchmark_parser.add_argument(
+        "--gantt-format",
+        type=str,
+        default="html",
+        choices=["html", "svg"],
+        help="File format of the Gantt charts written with --gantt-dir.",
+    )
+    benchmark_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print the time, call count and peak memory of every scheduler phase.",
+    )
+    benchmark_parser.add_argument(
+        "--compare-centrality",
+        action="store_true",
+        help="Compare HEFT* time and makespan across centrality methods.",
+    )
 
-    process_parser = subparsers.add_parser("process", help="Process a single dataset")
+    process_parser = subparsers.add_parser(
+        "process",
+        help="Process a single dataset",
+        parents=[seed_parser, annotation_parser],
+    )
     process_parser.add_argument(
         "--input", type=str, required=True, help="Path to the input dataset file."
     )
@@ -97,11 +212,16 @@ def main():
         help="Format of the input dataset.",
     )
     process_parser.add_argument(
-        "--output", type=str, required=True, help="Path to save the processed DAG."
+        "--output",
+        type=str,
+        required=True,
+        help="Path to save the processed DAG (.gml, or .dagz for the compact binary format).",
     )
 
     batch_parser = subparsers.add_parser(
-        "batch-process", help="Process multiple datasets"
+        "batch-process",
+        help="Process multiple datasets",
+        parents=[seed_parser, annotation_parser],
     )
     batch_parser.add_argument(
         "--type",
@@ -109,23 +229,327 @@ def main():
         required=True,
         help="Type of datasets to process (e.g., social_networks, biological_networks).",
     )
+    batch_parser.add_argument(
+        "--output-format",
+        type=str,
+        default="dagz",
+        choices=["dagz", "gml"],
+        help="Format of the processed DAGs: compact binary (dagz) or GML for interchange.",
+    )
+
+    ingest_parser = subparsers.add_parser(
+        "ingest",
+        help="Download and process multiple datasets as a pipeline",
+        parents=[seed_parser, annotation_parser],
+    )
+    ingest_parser.add_argument(
+        "--type",
+        type=str,
+        required=True,
+        help="Type of datasets to ingest (e.g., social_networks, biological_networks).",
+    )
+    ingest_parser.add_argument(
+        "--output-format",
+        type=str,
+        default="dagz",
+        choices=["dagz", "gml"],
+        help="Format of the processed DAGs: compact binary (dagz) or GML for interchange.",
+    )
+    ingest_parser.add_argument(
+        "--download-workers",
+        type=int,
+        default=4,
+        help="Number of concurrent downloads.",
+    )
+    ingest_parser.add_argument(
+        "--process-workers",
+        type=int,
+        default=None,
+        help="Number of processes converting datasets (default: one per CPU).",
+    )
     batch_benchmark = subparsers.add_parser(
-        "batch-benchmark", help="Benchmark multiple networks"
+        "batch-benchmark",
+        help="Benchmark multiple networks",
+        parents=[seed_parser, annotation_parser],
+    )
+    batch_benchmark.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes running benchmark cells in parallel.",
+    )
+    batch_benchmark.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rebuild every DAG instead of using the on-disk DAG cache.",
+    )
+    batch_benchmark.add_argument(
+        "--trace",
+        type=str,
+        default="off",
+        choices=["off", "summary"],
+        help="Print the makespan and utilization of every scheduler run.",
+    )
+    batch_benchmark.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-phase time and memory breakdown of the whole sweep.",
+    )
+    batch_benchmark.add_argument(
+        "--beam-width",
+        type=int,
+        default=2,
+        help="Candidate resources and children examined per task by lookahead HEFT.",
+    )
+    batch_benchmark.add_argument(
+        "--save-plots",
+        action="store_true",
+        help="Render the plots to PNG files without a display instead of showing them.",
+    )
+    batch_benchmark.add_argument(
+        "--plots-dir",
+        type=str,
+        default="results/plots",
+        help="Directory the plots are written to with --save-plots.",
+    )
+    batch_benchmark.add_argument(
+        "--plot-jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes rendering plots (default: one per CPU).",
+    )
+
+    cache_parser = subparsers.add_parser(
+        "cache", help="Inspect or prune the generated DAG cache"
+    )
+    cache_parser.add_argument(
+        "action",
+        choices=["list", "prune", "clear"],
+        help="List entries, evict least recently used ones, or remove all.",
+    )
+    cache_parser.add_argument(
+        "--max-size",
+        type=float,
+        default=DEFAULT_MAX_BYTES / 1024**2,
+        help="Cache size limit in MB used by 'prune'.",
+    )
+
+    perf_parser = subparsers.add_parser(
+        "perf",
+        help="Measure the running time of the schedulers",
+        parents=[seed_parser, annotation_parser],
+    )
+    perf_parser.add_argument(
+        "--graph-type",
+        type=str,
+        default="barabasi_albert",
+        choices=GRAPH_TYPES,
+        help="Type of graph to benchmark on.",
+    )
+    perf_parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=None,
+        help=f"Graph sizes (number of nodes); defaults to 500 1000 2000, or {' '.join(map(str, SUITE_SIZES))} with --suite.",
+    )
+    perf_parser.add_argument(
+        "--params",
+        type=str,
+        default='{"m": 3}',
+        help="Graph model parameters as a JSON string.",
+    )
+    perf_parser.add_argument(
+        "--suite",
+        action="store_true",
+        help="Run the microbenchmark suite on fixed seeded DAGs of every model.",
+    )
+    perf_parser.add_argument(
+        "--eft-kernels",
+        action="store_true",
+        help="Compare the scalar and vector HEFT EFT kernels for 4 to 256 resources.",
+    )
+    perf_parser.add_argument(
+        "--online",
+        action="store_true",
+        help="Measure the throughput and decision latency of the online scheduler.",
+    )
+    perf_parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="Measure the CLI's import time with python -X importtime.",
+    )
+    perf_parser.add_argument(
+        "--startup-budget",
+        type=float,
+        default=DEFAULT_STARTUP_BUDGET_MS,
+        help="Fail when a CLI command takes longer than this many ms to import.",
+    )
+    perf_parser.add_argument(
+        "--graph-types",
+        type=str,
+        nargs="+",
+        default=list(GRAPH_TYPES),
+        choices=GRAPH_TYPES,
+        help="Network models covered by the suite.",
+    )
+    perf_parser.add_argument(
+        "--cases",
+        type=str,
+        nargs="+",
+        default=list(SUITE_CASE_NAMES),
+        choices=SUITE_CASE_NAMES,
+        help="Suite cases to run.",
+    )
+    perf_parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed runs per suite case."
+    )
+    perf_parser.add_argument(
+        "--baseline",
+        type=str,
+        default=DEFAULT_BASELINE,
+        help="JSON baseline to compare the suite against.",
+    )
+    perf_parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store the suite results as the new baseline instead of comparing.",
+    )
+    perf_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Fail when a case is slower than the baseline by more than this fraction.",
     )
 
     args = parser.parse_args()
 
     if args.command == "benchmark":
+        from src.benchmark.cost_model import (
+            CostModel,
+            load_cost_matrix,
+            resolve_cost_model,
+        )
+        from src.benchmark.edf import deadline_report, edf_deadlines, edf_schedule
+        from src.benchmark.gantt import export_gantt
+        from src.benchmark.heft import heft_schedule, visualize_schedule
+        from src.benchmark.heft_star import heft_star_schedule
+        from src.benchmark.main import compare_centrality_methods
+        from src.benchmark.profiler import print_profile_table, profile_schedule
+        from src.benchmark.trace import SchedulerTrace
+        from src.utils.graph_io import load_graph
+
+        rng = random.Random(args.seed)
         processors = [
-            {"speed": random.choice([0.5, 1.0, 1.5, 2.0, 2.5])}
+            {"speed": rng.choice([0.5, 1.0, 1.5, 2.0, 2.5])}
             for _ in range(args.num_proc)
         ]
         saved_graph = load_graph(args.input)
-        visualize_schedule(heft_star_schedule(saved_graph, processors)[0])
-        visualize_schedule(heft_schedule(saved_graph, processors)[0])
-        visualize_schedule(edf_schedule(saved_graph, processors)[0])
+        if args.compare_centrality:
+            compare_centrality_methods(saved_graph, processors, k=args.centrality_k)
+            return
+        cost_model = None
+        if args.cost_matrix:
+            try:
+                cost_model = resolve_cost_model(
+                    saved_graph,
+                    processors,
+                    CostModel.from_matrix(
+                        saved_graph, load_cost_matrix(args.cost_matrix)
+                    ),
+                )
+            except ValueError as e:
+                print(f"Error: {e}")
+                exit(1)
+        trace = SchedulerTrace("task" if args.trace_output else args.trace)
+        runs = {
+            "HEFT*": partial(
+                heft_star_schedule,
+                centrality=args.centrality,
+                centrality_k=args.centrality_k,
+                cost_model=cost_model,
+            ),
+            "HEFT": partial(heft_schedule, policy=args.policy, cost_model=cost_model),
+            "EDF": partial(
+                edf_schedule,
+                deadline_factor=args.deadline_factor,
+                cost_model=cost_model,
+            ),
+        }
+        profiles = {}
+        for alg_name, alg_func in runs.items():
+            if args.profile:
+                schedule, _, _, profile = profile_schedule(
+                    alg_func, saved_graph, processors, trace=trace
+                )
+                profiles[alg_name] = [profile.to_dict()]
+            else:
+                schedule = alg_func(saved_graph, processors, trace=trace)[0]
+            if alg_name == "EDF" and args.trace != "off":
+                report = deadline_report(
+                    schedule,
+                    edf_deadlines(
+                        saved_graph,
+                        processors,
+                        args.deadline_factor,
+                        cost_model=cost_model,
+                    ),
+                )
+                print(
+                    f"EDF deadline misses: {report['misses']}/{report['tasks']} "
+                    f"({report['miss_rate']:.1%}), max lateness {report['max_lateness']:.2f}, "
+                    f"mean tardiness {report['mean_tardiness']:.2f}"
+                )
+            if args.gantt_dir:
+                os.makedirs(args.gantt_dir, exist_ok=True)
+                gantt_file = os.path.join(
+                    args.gantt_dir,
+                    f"{alg_name.lower().replace('*', '_star')}.{args.gantt_format}",
+                )
+                export_gantt(schedule, gantt_file, title=alg_name)
+                print(f"Gantt chart saved to {gantt_file}")
+            else:
+                visualize_schedule(schedule)
+        if args.profile:
+            print_profile_table(profiles)
+        if args.trace_output:
+            trace.dump(args.trace_output)
+            print(f"Trace saved to {args.trace_output}")
 
     if args.command == "batch-benchmark":
+        from src.benchmark.edf import edf_schedule
+        from src.benchmark.heft import heft_schedule
+        from src.benchmark.heft_star import heft_star_schedule
+        from src.benchmark.main import (
+            benchmark_algorithms_with_params,
+            plot_average_per_network,
+            plot_comparison_per_algorithm,
+            plot_comparison_per_network,
+            summarize_profiles,
+            summarize_results,
+        )
+        from src.benchmark.peft import lookahead_heft_schedule, peft_schedule
+        from src.benchmark.plotter import (
+            plot_core_utilization_distribution,
+            plot_gang_impact_on_makespan,
+            plot_gang_task_percentage,
+            plot_makespan_comparison,
+            plot_scheduling_efficiency,
+            plot_topology_influence_on_scheduling,
+            plot_utilization_comparison,
+            render_plots,
+            results_frame,
+        )
+        from src.utils.dag_cache import CACHE_DIR
+
+        plots = {}
+
+        def plot(name, plot_func, *plot_args):
+            if args.save_plots:
+                plots[name] = (plot_func, plot_args)
+            else:
+                plot_func(*plot_args)
+
         param_sets = {
             "barabasi_albert": [{"m": 3}, {"m": 5}, {"m": 8}],
             "watts_strogatz": [
@@ -147,16 +571,43 @@ def main():
         algorithms = {
             "EDF": edf_schedule,
             "HEFT": heft_schedule,
+            "HEFT (insertion)": partial(heft_schedule, policy="insertion"),
             "HEFT*": heft_star_schedule,
+            "PEFT": peft_schedule,
+            "Lookahead HEFT": partial(
+                lookahead_heft_schedule, beam_width=args.beam_width
+            ),
         }
 
+        seed = 0 if args.seed is None else args.seed
+        config = args_annotation_config(args)
+        sweep_results = []
+
         for graph_type, params in param_sets.items():
             print(f"Running benchmarks for {graph_type}...")
             sizes = graph_sizes[graph_type]
             results = benchmark_algorithms_with_params(
-                graph_type, sizes, params, resources, algorithms
+                graph_type,
+                sizes,
+                params,
+                resources,
+                algorithms,
+                jobs=args.jobs,
+                seed=seed,
+                cache_dir=None if args.no_cache else CACHE_DIR,
+                annotation_config=config,
+                trace=args.trace,
+                profile=args.profile,
+            )
+            summarize_results(graph_type, results, params)
+            sweep_results.append(results)
+            plot(
+                f"{graph_type}_comparison",
+                plot_comparison_per_network,
+                graph_type,
+                results,
+                params,
             )
-            plot_comparison_per_network(graph_type, sizes, results, params)
 
         all_results = {}
         graph_sizes = {
@@ -168,38 +619,176 @@ def main():
             print(f"Running benchmarks for {graph_type}...")
             sizes = graph_sizes[graph_type]
             results = benchmark_algorithms_with_params(
-                graph_type, sizes, params, resources, algorithms
+                graph_type,
+                sizes,
+                params,
+                resources,
+                algorithms,
+                jobs=args.jobs,
+                seed=seed,
+                cache_dir=None if args.no_cache else CACHE_DIR,
+                annotation_config=config,
+                trace=args.trace,
+                profile=args.profile,
             )
+            summarize_results(graph_type, results, params)
             all_results[graph_type] = results
+            sweep_results.append(results)
+
+        if args.profile:
+            print("Per-phase breakdown of the whole sweep:")
+            summarize_profiles(sweep_results)
 
         print("Plotting comparison across algorithms...")
-        plot_comparison_per_algorithm(graph_sizes, all_results, param_sets, algorithms, param_sets.keys())
+        plot(
+            "algorithm_comparison",
+            plot_comparison_per_algorithm,
+            all_results,
+            param_sets,
+            list(algorithms),
+            list(param_sets),
+        )
 
         print("Plotting averaged results across all parameters...")
-        plot_average_per_network(graph_sizes, all_results, list(algorithms.keys()), param_sets.keys())
+        plot(
+            "all_average",
+            plot_average_per_network,
+            all_results,
+            list(algorithms),
+            list(param_sets),
+        )
+
+        frame = results_frame(all_results, param_sets)
 
         print("Plotting Makespan Comparison Across All Networks...")
-        plot_makespan_comparison(graph_sizes, all_results, param_sets)
+        plot("makespan_comparison", plot_makespan_comparison, frame)
 
         print("Plotting Utilization Comparison Across All Networks...")
-        plot_utilization_comparison(graph_sizes, all_results, param_sets)
+        plot("utilization_comparison", plot_utilization_comparison, frame)
 
         print("Plotting GANG Task Percentage Across All Networks...")
-        plot_gang_task_percentage(graph_sizes, all_results, param_sets)
+        plot("gang_task_percentage", plot_gang_task_percentage, frame)
 
         print("Plotting GANG Task Impact on Makespan...")
-        plot_gang_impact_on_makespan(graph_sizes, all_results, param_sets)
+        plot("gang_impact_on_makespan", plot_gang_impact_on_makespan, frame)
 
         print("Plotting Scheduling Efficiency Across DAG Models...")
-        plot_scheduling_efficiency(graph_sizes, all_results, param_sets)
+        plot("scheduling_efficiency", plot_scheduling_efficiency, frame)
 
         print("Plotting Core Utilization Distribution...")
-        plot_core_utilization_distribution(graph_sizes, all_results, param_sets)
+        plot("core_utilization_distribution", plot_core_utilization_distribution, frame)
 
         print("Plotting Network Topology Influence on Scheduling...")
-        plot_topology_influence_on_scheduling(graph_sizes, all_results, param_sets)
+        plot(
+            "topology_influence",
+            plot_topology_influence_on_scheduling,
+            frame,
+            graph_sizes,
+        )
+
+        if args.save_plots:
+            paths = render_plots(plots, args.plots_dir, args.plot_jobs)
+            print(f"Saved {len(paths)} plots to {args.plots_dir}")
+
+    if args.command == "perf":
+        from src.benchmark.edf import edf_schedule
+        from src.benchmark.heft import heft_schedule
+        from src.benchmark.heft_star import heft_star_schedule
+        from src.benchmark.perf import (
+            benchmark_compiled_dag,
+            benchmark_eft_kernels,
+            benchmark_online,
+            benchmark_startup,
+            compare_to_baseline,
+            run_perf_suite,
+            save_baseline,
+        )
+
+    if args.command == "perf" and args.startup:
+        if benchmark_startup(budget_ms=args.startup_budget):
+            exit(1)
+
+    elif args.command == "perf" and args.suite:
+        results = run_perf_suite(
+            args.graph_types,
+            args.sizes or SUITE_SIZES,
+            args.cases,
+            repeat=args.repeat,
+        )
+        if args.save_baseline:
+            save_baseline(results, args.baseline)
+        elif not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; run with --save-baseline first.")
+        elif compare_to_baseline(results, args.baseline, args.threshold):
+            exit(1)
+
+    elif args.command == "perf":
+        try:
+            params = json.loads(args.params)
+        except json.JSONDecodeError:
+            print("Error: Invalid JSON format for --params.")
+            exit(1)
+        resources = [{"speed": 1.0}, {"speed": 1.5}, {"speed": 0.5}]
+        if args.eft_kernels:
+            benchmark_eft_kernels(
+                args.graph_type,
+                args.sizes or [2000],
+                params,
+                seed=args.seed,
+                annotation_config=args_annotation_config(args),
+            )
+            return
+        if args.online:
+            benchmark_online(
+                args.graph_type,
+                args.sizes or [500, 1000, 2000],
+                params,
+                resources,
+                seed=args.seed,
+                annotation_config=args_annotation_config(args),
+            )
+            return
+        algorithms = {
+            "EDF": edf_schedule,
+            "HEFT": heft_schedule,
+            "HEFT*": heft_star_schedule,
+        }
+        benchmark_compiled_dag(
+            args.graph_type,
+            args.sizes or [500, 1000, 2000],
+            params,
+            resources,
+            algorithms,
+            seed=args.seed,
+            annotation_config=args_annotation_config(args),
+        )
+
+    if args.command == "cache":
+        from src.utils.dag_cache import CACHE_DIR, list_cache, prune_cache
+
+        if args.action == "list":
+            entries = list_cache()
+            for path, size, _, meta in entries:
+                print(
+                    f"{os.path.basename(path)[:12]}  {size / 1024**2:8.2f} MB  "
+                    f"{meta.get('graph_type')} n={meta.get('n')} "
+                    f"params={meta.get('params')} seed={meta.get('seed')}"
+                )
+            total = sum(size for _, size, _, _ in entries)
+            print(f"{len(entries)} entries, {total / 1024**2:.2f} MB in {CACHE_DIR}")
+        else:
+            max_bytes = 0 if args.action == "clear" else args.max_size * 1024**2
+            removed = prune_cache(max_bytes=max_bytes)
+            print(f"Removed {len(removed)} cached DAGs.")
 
     if args.command == "generate":
+        from src.benchmark.edf import edf_schedule
+        from src.benchmark.heft import heft_schedule, visualize_schedule
+        from src.benchmark.trace import SchedulerTrace
+        from src.generation.dag_generator import generate_dag
+        from src.utils.graph_io import export_graph
+        from src.utils.graph_visualizer import visualize_graph
+
         try:
             try:
                 params = json.loads(args.params)
@@ -207,63 +796,127 @@ def main():
                 print("Error: Invalid JSON format for --params.")
                 exit(1)
 
-            G = generate_synthetic_graph(
-                graph_type=args.graph_type, n=args.nodes, params=params
+            annotated_dag = generate_dag(
+                args.graph_type,
+                args.nodes,
+                params,
+                seed=args.seed,
+                annotation_config=args_annotation_config(args),
             )
-            dag = convert_to_dag(G)
-            annotated_dag = annotate_graph(dag)
 
             export_graph(annotated_dag, args.output, is_generated=True)
 
             if args.visualize:
-                visualize_graph(annotated_dag, title="Generated DAG")
+                visualize_graph(annotated_dag.to_networkx(), title="Generated DAG")
 
             if args.benchmark:
+                rng = random.Random(args.seed)
                 resources = [
-                    {"speed": random.choice([0.5, 1.0, 1.5, 2.0, 2.5])}
+                    {"speed": rng.choice([0.5, 1.0, 1.5, 2.0, 2.5])}
                     for _ in range(args.num_proc)
                 ]
-                visualize_schedule(heft_schedule(annotated_dag, resources)[0])
-                visualize_schedule(edf_schedule(annotated_dag, resources)[0])
+                trace = SchedulerTrace()
+                visualize_schedule(
+                    heft_schedule(annotated_dag, resources, trace=trace)[0]
+                )
+                visualize_schedule(edf_schedule(annotated_dag, resources, trace=trace)[0])
 
         except ValueError as e:
             print(f"Error: {e}")
             exit(1)
 
     elif args.command == "download":
+        from src.utils.downloader import download_all, read_urls
+
         urls = read_urls()
         if args.type not in urls:
             print(f"Error: Dataset type '{args.type}' not found in urls.json.")
             return
-        download_all(urls[args.type], output_dir="data/input/dataset")
+        download_all(
+            urls[args.type], output_dir="data/input/dataset", workers=args.workers
+        )
 
     elif args.command == "process":
+        from src.utils.ingest import process_dataset
+
         if not os.path.exists(args.input):
             print(f"Error: Input file '{args.input}' does not exist.")
             return
-        G = load_graph(args.input, args.format)
-        dag = convert_to_dag(G)
-        annotated_dag = annotate_graph(dag)
-        export_graph(annotated_dag, args.output, is_generated=False)
+        process_dataset(
+            args.input,
+            args.format,
+            args.output,
+            seed=args.seed,
+            config=args_annotation_config(args),
+        )
 
     elif args.command == "batch-process":
+        from src.utils.downloader import dataset_path, read_urls
+        from src.utils.ingest import (
+            dataset_artifact_path,
+            dataset_output_file,
+            process_dataset,
+        )
+        from src.utils.manifest import DatasetManifest
+
         urls = read_urls()
         if args.type not in urls:
             print(f"Error: Dataset type '{args.type}' not found in urls.json.")
             return
+        manifest = DatasetManifest.for_directory("data/input/dataset")
+        config = args_annotation_config(args)
         for dataset in urls[args.type]:
-            input_file = f"data/input/dataset/{os.path.basename(dataset['name'])}.txt"
-            output_file = f"{dataset['name'].replace(' ', '_')}_dag.gml"
+            input_file = dataset_path(dataset, "data/input/dataset")
+            output_file = dataset_output_file(dataset, args.output_format)
             if not os.path.exists(input_file):
                 print(
                     f"Error: Input file '{input_file}' not found. Please download it first."
                 )
                 continue
+            downloaded = manifest.is_downloaded(dataset, input_file)
+            if not downloaded and manifest.source_sha256(dataset) is not None:
+                print(
+                    f"Error: Input file '{input_file}' is incomplete or changed. Please download it again."
+                )
+                continue
+            artifact_path = dataset_artifact_path(dataset, args.output_format)
+            if downloaded and manifest.is_processed(
+                dataset, artifact_path, args.seed, config
+            ):
+                print(f"{dataset['name']} is up to date. Skipping processing.")
+                continue
             print(f"Processing {dataset['name']}...")
-            G = load_graph(input_file, dataset["format"])
-            dag = convert_to_dag(G)
-            annotated_dag = annotate_graph(dag)
-            export_graph(annotated_dag, output_file, is_generated=False)
+            artifact_path = process_dataset(
+                input_file,
+                dataset["format"],
+                output_file,
+                seed=args.seed,
+                config=config,
+            )
+            if downloaded:
+                manifest.record_artifact(dataset, artifact_path, args.seed, config)
+
+    elif args.command == "ingest":
+        from src.utils.downloader import read_urls
+        from src.utils.ingest import ingest_datasets
+
+        urls = read_urls()
+        if args.type not in urls:
+            print(f"Error: Dataset type '{args.type}' not found in urls.json.")
+            return
+        results = ingest_datasets(
+            urls[args.type],
+            dataset_dir="data/input/dataset",
+            output_format=args.output_format,
+            download_workers=args.download_workers,
+            process_workers=args.process_workers,
+            seed=args.seed,
+            config=args_annotation_config(args),
+        )
+        failed = [name for name, output_file in results.items() if output_file is None]
+        print(f"Ingested {len(results) - len(failed)} of {len(results)} datasets.")
+        for name in failed:
+            print(f"Failed: {name}")
 
 
 if __name__ == "__main__":
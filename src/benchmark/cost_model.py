@@ -0,0 +1,104 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+from src.utils.compiled_dag import compile_dag
+
+
+class CostModel:
+    """Execution time of every task on every resource.
+
+    ``exec_time`` is a tasks × resources matrix indexed by task ID, so
+    unrelated machines, where a task runs fast on one resource type and
+    slow on another, are expressed directly. ``rank_cost`` is the per-task
+    cost HEFT and HEFT* rank tasks by; it defaults to the mean execution
+    time over the resources, as in the HEFT paper.
+    """
+
+    def __init__(self, exec_time, rank_cost=None):
+        exec_time = np.asarray(exec_time, dtype=np.float64)
+        if exec_time.ndim != 2:
+            raise ValueError(
+                f"Execution times must be a tasks x resources matrix, got shape {exec_time.shape}"
+            )
+        if (exec_time < 0).any() or not np.isfinite(exec_time).all():
+            raise ValueError("Execution times must be finite and non-negative.")
+        self.exec_time = exec_time
+        self.mean_cost = exec_time.mean(axis=1)
+        self.rank_cost = self.mean_cost if rank_cost is None else rank_cost
+
+    @classmethod
+    def from_speeds(cls, dag, resources):
+        """Related machines: a task takes its weight divided by the resource speed.
+
+        Tasks are ranked by their weight, as the schedulers always did.
+        """
+        dag = compile_dag(dag)
+        speeds = np.array([r["speed"] for r in resources], dtype=np.float64)
+        return cls(
+            dag.weight[:, None] / speeds[None, :],
+            rank_cost=dag.weight.astype(np.float64),
+        )
+
+    @classmethod
+    def from_matrix(cls, dag, matrix):
+        """Unrelated machines from a user matrix.
+
+        ``matrix`` is either an array with one row per task in task ID order
+        (the node order of a networkx DAG) or a ``{label: row}`` mapping.
+        """
+        dag = compile_dag(dag)
+        if isinstance(matrix, Mapping):
+            missing = [label for label in dag.labels if label not in matrix]
+            if missing:
+                raise ValueError(f"No execution times for task {missing[0]}.")
+            matrix = [matrix[label] for label in dag.labels]
+        model = cls(matrix)
+        if model.num_tasks != dag.num_tasks:
+            raise ValueError(
+                f"Execution time matrix has {model.num_tasks} rows for {dag.num_tasks} tasks."
+            )
+        return model
+
+    @property
+    def num_tasks(self):
+        return self.exec_time.shape[0]
+
+    @property
+    def num_resources(self):
+        return self.exec_time.shape[1]
+
+    def resource_groups(self):
+        """Groups resources with identical columns, in order of first appearance.
+
+        Resources in a group run every task in the same time, so they are
+        interchangeable; with speeds these are the resources of equal speed.
+        """
+        groups = {}
+        for resource_id in range(self.num_resources):
+            key = np.ascontiguousarray(self.exec_time[:, resource_id]).tobytes()
+            groups.setdefault(key, []).append(resource_id)
+        return [np.array(group) for group in groups.values()]
+
+
+def resolve_cost_model(dag, resources, cost_model=None):
+    """Returns ``cost_model``, checked against ``dag`` and ``resources``.
+
+    Without one, execution times come from the resource speeds.
+    """
+    dag = compile_dag(dag)
+    if cost_model is None:
+        return CostModel.from_speeds(dag, resources)
+    if cost_model.exec_time.shape != (dag.num_tasks, len(resources)):
+        raise ValueError(
+            f"Cost model is {cost_model.num_tasks} x {cost_model.num_resources}, "
+            f"expected {dag.num_tasks} tasks x {len(resources)} resources."
+        )
+    return cost_model
+
+
+def load_cost_matrix(path):
+    """Reads a tasks × resources matrix from a ``.npy`` file or a CSV file."""
+    if path.endswith(".npy"):
+        return np.load(path)
+    return np.loadtxt(path, delimiter=",", ndmin=2)
@@ -0,0 +1,236 @@
+from collections import defaultdict
+
+import networkx as nx
+
+# Frozen copies of the schedulers as they were before ``CompiledDAG``: every
+# step reads networkx attribute dicts. They are kept only as the baseline of
+# ``perf.benchmark_compiled_dag``, with their per-task printing and plotting
+# removed and the recursive bottom level unrolled so deep DAGs do not hit the
+# recursion limit.
+
+
+def calculate_bottom_level(dag):
+    bottom_level = {}
+    for node in reversed(list(nx.topological_sort(dag))):
+        bottom_level[node] = dag.nodes[node]["weight"] + max(
+            (
+                bottom_level[child] + dag.edges[node, child]["weight"]
+                for child in dag.successors(node)
+            ),
+            default=0,
+        )
+    return bottom_level
+
+
+def edf_schedule(dag, resources):
+    topological_order = list(nx.topological_sort(dag))
+
+    schedule = {resource: [] for resource in range(len(resources))}
+    resource_availability = [0] * len(resources)
+    task_finish_times = {}
+
+    for task in topological_order:
+        earliest_start = 0
+        for parent in dag.predecessors(task):
+            earliest_start = max(earliest_start, task_finish_times[parent])
+
+        best_resource = None
+        best_finish_time = float("inf")
+
+        for resource_id, resource in enumerate(resources):
+            resource_ready_time = max(
+                resource_availability[resource_id], earliest_start
+            )
+            exec_time = dag.nodes[task]["weight"] / resource["speed"]
+            finish_time = resource_ready_time + exec_time
+
+            if finish_time < best_finish_time:
+                best_finish_time = finish_time
+                best_resource = resource_id
+
+        start_time = max(resource_availability[best_resource], earliest_start)
+        end_time = (
+            start_time + dag.nodes[task]["weight"] / resources[best_resource]["speed"]
+        )
+        schedule[best_resource].append((task, start_time, end_time))
+
+        task_finish_times[task] = end_time
+        resource_availability[best_resource] = end_time
+
+    makespan = max(task_finish_times.values())
+
+    utilization = {}
+    for resource_id, tasks in schedule.items():
+        active_time = sum(end - start for _, start, end in tasks)
+        utilization[resource_id] = active_time / makespan if makespan > 0 else 0.0
+
+    return schedule, makespan, utilization
+
+
+def heft_schedule(dag, resources):
+    bottom_level = calculate_bottom_level(dag)
+    tasks = sorted(dag.nodes, key=lambda node: bottom_level[node], reverse=True)
+
+    schedule = {resource: [] for resource in range(len(resources))}
+    task_allocation = {}
+    resource_availability = [0] * len(resources)
+    task_start_times = {}
+
+    for task in tasks:
+        best_time = float("inf")
+        best_resource = None
+
+        for resource_id, resource in enumerate(resources):
+            est = resource_availability[resource_id]
+            for pred in dag.predecessors(task):
+                if pred in task_allocation:
+                    pred_end_time = task_start_times[pred][1]
+                    if task_allocation[pred] != resource_id:
+                        pred_end_time += dag.edges[pred, task]["weight"]
+                    est = max(est, pred_end_time)
+
+            exec_time = dag.nodes[task]["weight"] / resource["speed"]
+            eft = est + exec_time
+
+            if eft < best_time:
+                best_time = eft
+                best_resource = resource_id
+
+        task_allocation[task] = best_resource
+        task_start_times[task] = (
+            best_time - dag.nodes[task]["weight"] / resources[best_resource]["speed"],
+            best_time,
+        )
+        schedule[best_resource].append(
+            (task, task_start_times[task][0], task_start_times[task][1])
+        )
+
+        resource_availability[best_resource] = best_time
+
+    makespan = max(resource_availability)
+
+    utilization = {}
+    for resource_id, tasks in schedule.items():
+        active_time = sum(end - start for _, start, end in tasks)
+        utilization[resource_id] = active_time / makespan if makespan > 0 else 0.0
+
+    return schedule, makespan, utilization
+
+
+def find_available_cores(resource_availability, core_group, required_cores, start_time):
+    available_sets = []
+    for i in range(len(core_group) - required_cores + 1):
+        if all(
+            resource_availability[core_group[j]] <= start_time
+            for j in range(i, i + required_cores)
+        ):
+            available_sets.append(core_group[i : i + required_cores])
+    return available_sets
+
+
+def detect_communities(dag):
+    undirected_graph = dag.to_undirected()
+    communities = nx.community.louvain_communities(undirected_graph, seed=42)
+    community_mapping = {}
+    for community_id, community_nodes in enumerate(communities):
+        for node in community_nodes:
+            community_mapping[node] = community_id
+    return community_mapping
+
+
+def heft_star_schedule(dag, cores):
+    num_cores = len(cores)
+    bottom_level = calculate_bottom_level(dag)
+    centrality = nx.betweenness_centrality(dag)
+    community_mapping = detect_communities(dag)
+    core_groups = defaultdict(list)
+    for i, core in enumerate(cores):
+        core_groups[core["speed"]].append(i)
+
+    tasks = sorted(
+        dag.nodes, key=lambda node: (bottom_level[node], centrality[node]), reverse=True
+    )
+
+    schedule = defaultdict(list)
+    task_allocation = {}
+    task_start_times = {}
+    resource_availability = [0] * num_cores
+    used_cores_by_community = {}
+
+    for task in tasks:
+        required_cores = dag.nodes[task]["num_cores"]
+        best_time = float("inf")
+        best_cores = None
+        best_speed = None
+
+        est = 0
+        for pred in dag.predecessors(task):
+            if pred in task_allocation:
+                pred_end_time = task_start_times[pred][1]
+                if not set(task_allocation[pred]).issubset(set(best_cores or [])):
+                    pred_end_time += dag.edges[pred, task]["weight"]
+                est = max(est, pred_end_time)
+
+        if required_cores == 1:
+            community_id = community_mapping.get(task, -1)
+
+            if community_id in used_cores_by_community:
+                core = used_cores_by_community[community_id]
+                est = max(est, resource_availability[core])
+            else:
+                est, core = min(
+                    (max(est, resource_availability[c]), c) for c in range(num_cores)
+                )
+                used_cores_by_community[community_id] = core
+
+            best_time = est + dag.nodes[task]["weight"] / cores[core]["speed"]
+            best_cores = [core]
+            best_speed = cores[core]["speed"]
+
+        else:
+            for speed, core_group in core_groups.items():
+                for start_time in set(resource_availability):
+                    available_sets = find_available_cores(
+                        resource_availability,
+                        core_group,
+                        required_cores,
+                        max(start_time, est),
+                    )
+                    for core_set in available_sets:
+                        eft = max(start_time, est) + dag.nodes[task]["weight"] / speed
+                        if eft < best_time:
+                            best_time = eft
+                            best_cores = core_set
+                            best_speed = speed
+
+        if best_cores is None:
+            continue
+
+        task_allocation[task] = best_cores
+        task_start_times[task] = (
+            best_time - dag.nodes[task]["weight"] / best_speed,
+            best_time,
+        )
+
+        for core in best_cores:
+            resource_availability[core] = best_time
+            schedule[core].append(
+                (task, task_start_times[task][0], task_start_times[task][1])
+            )
+
+    makespan = max(resource_availability)
+
+    utilization = {}
+    for core_id, tasks in schedule.items():
+        active_time = sum(end - start for _, start, end in tasks)
+        utilization[core_id] = active_time / makespan if makespan > 0 else 0.0
+
+    return schedule, makespan, utilization
+
+
+# Display name in ``cli.py perf``: dict-based scheduler.
+SCHEDULERS = {
+    "EDF": edf_schedule,
+    "HEFT": heft_schedule,
+    "HEFT*": heft_star_schedule,
+}
@@ -1,90 +1,237 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-import networkx as nx
-
+import heapq
+import time
 
-def edf_schedule(dag, resources):
-    topological_order = list(nx.topological_sort(dag))
+import networkx as nx
+import numpy as np
+
+from src.benchmark.cost_model import resolve_cost_model
+from src.benchmark.heft import use_vector_kernel
+from src.benchmark.profiler import phase_timer
+from src.benchmark.ranks import compute_ranks
+from src.utils.compiled_dag import CompiledDAG, compile_dag
+
+
+def edf_deadlines(
+    dag, resources=None, factor=1.0, attribute="deadline", cost_model=None
+):
+    """Returns the deadline of every task as ``{label: deadline}``.
+
+    A networkx DAG whose nodes all carry ``attribute`` keeps those
+    deadlines. Otherwise the critical path is sliced: each task must finish
+    by its latest finish time in a schedule of length ``factor`` times the
+    critical-path length, with tasks costing their mean execution time over
+    ``resources`` (under ``cost_model``, if given), or their weight without
+    resources.
+    """
+    if not isinstance(dag, CompiledDAG):
+        values = nx.get_node_attributes(dag, attribute)
+        if values and len(values) == dag.number_of_nodes():
+            return values
+    dag = compile_dag(dag)
+    if resources is None:
+        costs = dag.weight.astype(np.float64)
+    else:
+        costs = resolve_cost_model(dag, resources, cost_model).mean_cost
+    return dict(zip(dag.labels, _sliced_deadlines(dag, costs, factor).tolist()))
+
+
+def _sliced_deadlines(dag, costs, factor):
+    # A task must leave time for the rest of its longest path, bottom level
+    # minus its own cost, before the end of a schedule factor * CP long.
+    bottom_level, _, critical_path_length = compute_ranks(dag, costs=costs)
+    return factor * critical_path_length - bottom_level + costs
+
+
+def edf_schedule(
+    dag,
+    resources,
+    deadlines=None,
+    deadline_factor=1.0,
+    cost_model=None,
+    kernel="auto",
+    trace=None,
+    profiler=None,
+):
+    """Schedules ``dag`` earliest deadline first.
+
+    Ready tasks, whose predecessors are all placed, are taken from a
+    min-heap keyed on deadline and placed on the resource where they finish
+    first, counting the edge weight as communication time between tasks on
+    different resources. Execution times come from the ``CostModel``
+    ``cost_model``, or from the resource speeds without one. ``deadlines``
+    maps labels to deadlines; by default they come from
+    ``edf_deadlines(dag, resources, deadline_factor, cost_model=cost_model)``.
+    Use ``deadline_report`` to check a schedule against them. ``kernel``
+    selects the scalar or vector EFT kernel, as in ``heft_schedule``.
+    """
+    vector = use_vector_kernel(kernel, len(resources))
+    phase = phase_timer(profiler)
+    graph = dag
+    with phase("compile"):
+        dag = compile_dag(dag)
+    if trace is not None:
+        trace.start("EDF", dag)
+    tracing = trace is not None and trace.per_task
+    labels = dag.labels
+    with phase("cost_model"):
+        cost_model = resolve_cost_model(dag, resources, cost_model)
+        exec_times = cost_model.exec_time if vector else cost_model.exec_time.tolist()
+    pred_ptr = dag.pred_ptr.tolist()
+    pred_idx = dag.pred_idx.tolist()
+    pred_weight = dag.pred_weight.tolist()
+    succ_ptr = dag.succ_ptr.tolist()
+    succ_idx = dag.succ_idx.tolist()
+
+    with phase("deadlines"):
+        if deadlines is None and isinstance(graph, CompiledDAG):
+            deadline = _sliced_deadlines(
+                dag, cost_model.mean_cost, deadline_factor
+            ).tolist()
+        else:
+            if deadlines is None:
+                deadlines = edf_deadlines(
+                    graph, resources, deadline_factor, cost_model=cost_model
+                )
+            deadline = [deadlines[label] for label in labels]
 
     schedule = {resource: [] for resource in range(len(resources))}
     resource_availability = [0] * len(resources)
-    task_finish_times = {}
-
-    for task in topological_order:
-        earliest_start = 0
-        for parent in dag.predecessors(task):
-            if parent not in task_finish_times:
-                raise ValueError(
-                    f"Predecessor task {parent} has not been scheduled before task {task}."
+    task_allocation = [None] * dag.num_tasks
+    task_finish_times = [None] * dag.num_tasks
+    missing = np.diff(dag.pred_ptr).tolist()
+    ready = [
+        (deadline[task], task) for task in range(dag.num_tasks) if not missing[task]
+    ]
+    heapq.heapify(ready)
+    if vector:
+        pred_idx_array = dag.pred_idx
+        pred_weight_array = dag.pred_weight
+        finish_times = np.zeros(dag.num_tasks)
+        allocation = np.zeros(dag.num_tasks, dtype=np.int64)
+        availability = np.zeros(len(resources))
+        resource_ids = np.arange(len(resources))
+
+    placement_start = time.perf_counter()
+    while ready:
+        _, task = heapq.heappop(ready)
+        exec_row = exec_times[task]
+        if vector:
+            # Every predecessor is placed: data arrives at its finish time on
+            # its resource and one edge weight later anywhere else.
+            first, last = pred_ptr[task], pred_ptr[task + 1]
+            starts = availability
+            if first < last:
+                preds = pred_idx_array[first:last]
+                ends = finish_times[preds]
+                arrivals = np.where(
+                    allocation[preds, None] == resource_ids,
+                    ends[:, None],
+                    (ends + pred_weight_array[first:last])[:, None],
                 )
-            earliest_start = max(earliest_start, task_finish_times[parent])
-
-        best_resource = None
-        best_finish_time = float("inf")
+                starts = np.maximum(availability, arrivals.max(axis=0))
+            efts = starts + exec_row
+            best_resource = int(efts.argmin())
+            best_finish_time = float(efts[best_resource])
+            allocation[task] = best_resource
+            finish_times[task] = best_finish_time
+            availability[best_resource] = best_finish_time
+        else:
+            # Data from a parent arrives at its finish time on the parent's
+            # resource and one edge weight later anywhere else. Keeping the
+            # latest arrival per resource makes each start time O(1) below.
+            local = {}
+            remote = {}
+            for e in range(pred_ptr[task], pred_ptr[task + 1]):
+                parent = pred_idx[e]
+                resource_id = task_allocation[parent]
+                finish_time = task_finish_times[parent]
+                if finish_time > local.get(resource_id, 0):
+                    local[resource_id] = finish_time
+                finish_time += pred_weight[e]
+                if finish_time > remote.get(resource_id, 0):
+                    remote[resource_id] = finish_time
+            latest_resource, latest, second = None, 0, 0
+            for resource_id, finish_time in remote.items():
+                if finish_time > latest:
+                    latest_resource, latest, second = resource_id, finish_time, latest
+                elif finish_time > second:
+                    second = finish_time
+
+            best_resource = None
+            best_finish_time = float("inf")
+            for resource_id, exec_time in enumerate(exec_row):
+                start_time = max(
+                    resource_availability[resource_id],
+                    local.get(resource_id, 0),
+                    second if resource_id == latest_resource else latest,
+                )
+                finish_time = start_time + exec_time
 
-        for resource_id, resource in enumerate(resources):
-            resource_ready_time = max(
-                resource_availability[resource_id], earliest_start
-            )
-            exec_time = dag.nodes[task]["weight"] / resource["speed"]
-            finish_time = resource_ready_time + exec_time
+                if finish_time < best_finish_time:
+                    best_finish_time = finish_time
+                    best_resource = resource_id
 
-            if finish_time < best_finish_time:
-                best_finish_time = finish_time
-                best_resource = resource_id
+        start_time = best_finish_time - float(exec_row[best_resource])
+        schedule[best_resource].append((labels[task], start_time, best_finish_time))
 
-        start_time = max(resource_availability[best_resource], earliest_start)
-        end_time = (
-            start_time + dag.nodes[task]["weight"] / resources[best_resource]["speed"]
-        )
-        schedule[best_resource].append((task, start_time, end_time))
+        task_allocation[task] = best_resource
+        task_finish_times[task] = best_finish_time
+        resource_availability[best_resource] = best_finish_time
+        if tracing:
+            trace.record(task, best_resource, start_time, best_finish_time)
 
-        task_finish_times[task] = end_time
-        resource_availability[best_resource] = end_time
+        for child in succ_idx[succ_ptr[task] : succ_ptr[task + 1]]:
+            missing[child] -= 1
+            if not missing[child]:
+                heapq.heappush(ready, (deadline[child], child))
 
-        print(
-            f"Task {task} assigned to Resource {best_resource} at time {start_time}-{end_time}"
-        )
+    if profiler is not None:
+        profiler.add("placement", time.perf_counter() - placement_start)
 
-    makespan = max(task_finish_times.values())
+    makespan = max(task_finish_times)
 
     utilization = {}
     for resource_id, tasks in schedule.items():
         active_time = sum(end - start for _, start, end in tasks)
         utilization[resource_id] = active_time / makespan if makespan > 0 else 0.0
 
+    if trace is not None:
+        trace.finish(makespan, utilization, resources)
     return schedule, makespan, utilization
 
 
+def deadline_report(schedule, deadlines):
+    """Checks a schedule against ``{label: deadline}``.
+
+    Returns the number of tasks, the number and share of missed deadlines,
+    the maximum lateness (finish time minus deadline, negative when every
+    deadline is met with slack) and the mean tardiness (lateness counted
+    only when positive).
+    """
+    lateness = np.array(
+        [
+            end - deadlines[task]
+            for tasks in schedule.values()
+            for task, _, end in tasks
+        ],
+        dtype=np.float64,
+    )
+    num_tasks = len(lateness)
+    misses = int((lateness > 0).sum())
+    return {
+        "tasks": num_tasks,
+        "misses": misses,
+        "miss_rate": misses / num_tasks if num_tasks else 0.0,
+        "max_lateness": float(lateness.max()) if num_tasks else 0.0,
+        "mean_tardiness": (float(np.maximum(lateness, 0).mean()) if num_tasks else 0.0),
+    }
+
+
 def visualize_edf(schedule):
-    fig, ax = plt.subplots(figsize=(12, 6))
-
-    colors = plt.cm.tab20.colors
-    resource_ids = list(schedule.keys())
-
-    for resource_id in resource_ids:
-        tasks = schedule[resource_id]
-        for task_id, start, end in tasks:
-            ax.barh(
-                resource_id,
-                end - start,
-                left=start,
-                color=colors[task_id % len(colors)],
-                edgecolor="black",
-                align="center",
-                label=f"Task {task_id}",
-            )
-
-    ax.set_yticks(resource_ids)
-    ax.set_yticklabels([f"Resource {rid}" for rid in resource_ids])
-    ax.set_xlabel("Time")
-    ax.set_title("EDF Scheduling - Gantt Chart")
-
-    handles = [
-        mpatches.Patch(color=colors[i % len(colors)], label=f"Task {i}")
-        for i in range(len(colors))
-    ]
-    ax.legend(handles=handles, bbox_to_anchor=(1.05, 1), loc="upper left")
+    import matplotlib.pyplot as plt
+
+    from src.benchmark.gantt import plot_gantt
 
+    plot_gantt(schedule, title="EDF Scheduling - Gantt Chart", color_by="task")
     plt.tight_layout()
     plt.show()
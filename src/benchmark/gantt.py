@@ -0,0 +1,266 @@
+import html
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_hex
+from matplotlib.patches import Patch
+
+GANTT_COLORINGS = ("resource", "task")
+RESOURCE_COLORS = ["red", "blue", "green", "orange", "purple"]
+TASK_COLORS = plt.cm.tab20.colors
+LABEL_LIMIT = 100
+BAR_HEIGHT = 0.8
+
+
+def schedule_intervals(schedule):
+    """Returns ``{resource: (starts, ends, tasks)}`` with each resource's intervals sorted by start."""
+    intervals = {}
+    for resource_id, tasks in schedule.items():
+        tasks = sorted(tasks, key=lambda interval: interval[1])
+        intervals[resource_id] = (
+            np.array([start for _, start, _ in tasks], dtype=np.float64),
+            np.array([end for _, _, end in tasks], dtype=np.float64),
+            [task for task, _, _ in tasks],
+        )
+    return intervals
+
+
+def merge_intervals(starts, ends, resolution):
+    """Merges sorted, disjoint intervals too small to tell apart at ``resolution``.
+
+    Two neighbours are merged when the gap between them is at most
+    ``resolution`` and one of them is shorter than it. Returns the merged
+    starts and ends and, for each merged interval, the index of the first
+    interval in it. With ``resolution`` set to the time one pixel covers,
+    every bar drawn is at least about a pixel wide, so their number stays
+    bounded by the axes width.
+    """
+    if len(starts) < 2:
+        return starts, ends, np.arange(len(starts))
+    narrow = ends - starts < resolution
+    merge = (starts[1:] - ends[:-1] <= resolution) & (narrow[:-1] | narrow[1:])
+    breaks = np.flatnonzero(~merge) + 1
+    first = np.concatenate([[0], breaks])
+    last = np.concatenate([breaks - 1, [len(starts) - 1]])
+    return starts[first], ends[last], first
+
+
+def _task_color(task, position):
+    """Colors integer task IDs by ID and other labels by their position on the resource."""
+    index = task if isinstance(task, (int, np.integer)) else position
+    return index % len(TASK_COLORS)
+
+
+class GanttChart:
+    """A Gantt chart of a schedule that stays fast for many thousands of tasks.
+
+    Each resource is one ``PolyCollection`` of bars. Whenever the x-range
+    changes, only the intervals in view are drawn, and runs of intervals
+    narrower than a pixel are merged into one bar, so zooming out never
+    draws more bars than the axes has pixels. Task labels are drawn only
+    when at most ``label_limit`` tasks are in view. ``color_by`` is
+    ``"resource"`` or ``"task"``.
+    """
+
+    def __init__(
+        self,
+        schedule,
+        ax=None,
+        title="Scheduling Result",
+        color_by="resource",
+        label_limit=LABEL_LIMIT,
+    ):
+        if color_by not in GANTT_COLORINGS:
+            raise ValueError(f"Unsupported Gantt coloring: {color_by}")
+        if ax is None:
+            _, ax = plt.subplots(figsize=(12, 6))
+        self.ax = ax
+        self.color_by = color_by
+        self.label_limit = label_limit
+        self.intervals = schedule_intervals(schedule)
+        self.collections = {}
+        self.labels = []
+        self.task_colors = {}
+
+        for resource_id, (starts, ends, tasks) in self.intervals.items():
+            if color_by == "task":
+                self.task_colors[resource_id] = np.array(TASK_COLORS)[
+                    [_task_color(task, i) for i, task in enumerate(tasks)]
+                ].reshape(-1, 3)
+            collection = PolyCollection(
+                [],
+                facecolors=RESOURCE_COLORS[resource_id % len(RESOURCE_COLORS)],
+                edgecolors="black",
+                linewidths=0.5,
+            )
+            ax.add_collection(collection)
+            self.collections[resource_id] = collection
+
+        resource_ids = list(self.intervals)
+        makespan = max(
+            (ends.max() for _, ends, _ in self.intervals.values() if len(ends)),
+            default=1.0,
+        )
+        ax.set_xlim(0, makespan)
+        ax.set_ylim(
+            min(resource_ids, default=0) - 0.5, max(resource_ids, default=0) + 0.5
+        )
+        ax.set_yticks(resource_ids)
+        ax.set_yticklabels([f"Resource {i}" for i in resource_ids])
+        ax.set_xlabel("Time")
+        ax.set_ylabel("Resources")
+        ax.set_title(title)
+        ax.grid(True, linestyle="--", alpha=0.5)
+        num_tasks = sum(len(tasks) for _, _, tasks in self.intervals.values())
+        if color_by == "task" and num_tasks <= len(TASK_COLORS):
+            ax.legend(
+                handles=[
+                    Patch(color=color, label=f"Task {task}")
+                    for resource_id, (_, _, tasks) in self.intervals.items()
+                    for task, color in zip(tasks, self.task_colors[resource_id])
+                ],
+                bbox_to_anchor=(1.05, 1),
+                loc="upper left",
+            )
+
+        self.update()
+        ax.callbacks.connect("xlim_changed", lambda _: self.update())
+
+    def update(self):
+        """Redraws the bars and labels for the current x-range."""
+        low, high = self.ax.get_xlim()
+        width = max(self.ax.get_window_extent().width, 1.0)
+        resolution = (high - low) / width
+        for label in self.labels:
+            label.remove()
+        self.labels = []
+
+        visible = {}
+        for resource_id, (starts, ends, tasks) in self.intervals.items():
+            first = np.searchsorted(ends, low)
+            last = np.searchsorted(starts, high, side="right")
+            visible[resource_id] = (first, last)
+            merged_starts, merged_ends, heads = merge_intervals(
+                starts[first:last], ends[first:last], resolution
+            )
+            bottom = resource_id - BAR_HEIGHT / 2
+            top = resource_id + BAR_HEIGHT / 2
+            verts = np.empty((len(merged_starts), 4, 2))
+            verts[:, [0, 1], 0] = merged_starts[:, None]
+            verts[:, [2, 3], 0] = merged_ends[:, None]
+            verts[:, [0, 3], 1] = bottom
+            verts[:, [1, 2], 1] = top
+            collection = self.collections[resource_id]
+            collection.set_verts(verts)
+            if self.color_by == "task":
+                collection.set_facecolors(
+                    self.task_colors[resource_id][first:last][heads]
+                )
+
+        if sum(last - first for first, last in visible.values()) > self.label_limit:
+            return
+        for resource_id, (first, last) in visible.items():
+            starts, ends, tasks = self.intervals[resource_id]
+            for task, start, end in zip(
+                tasks[first:last], starts[first:last], ends[first:last]
+            ):
+                self.labels.append(
+                    self.ax.text(
+                        (start + end) / 2,
+                        resource_id,
+                        f"T{task}",
+                        color="white",
+                        ha="center",
+                        va="center",
+                        fontsize=10,
+                        clip_on=True,
+                    )
+                )
+
+
+def plot_gantt(
+    schedule,
+    ax=None,
+    title="Scheduling Result",
+    color_by="resource",
+    label_limit=LABEL_LIMIT,
+):
+    """Draws ``schedule`` as a ``GanttChart`` and returns the chart."""
+    return GanttChart(schedule, ax, title, color_by, label_limit)
+
+
+def export_gantt(
+    schedule,
+    path,
+    title="Scheduling Result",
+    color_by="resource",
+    label_limit=LABEL_LIMIT,
+    width=1200,
+    row_height=30,
+):
+    """Writes ``schedule`` as an SVG file, or an HTML page holding the SVG.
+
+    The format follows the extension of ``path`` (``.svg`` or ``.html``).
+    Bars are written one interval at a time, so the whole schedule is never
+    held as a document in memory. Every bar has a tooltip with its task,
+    start and end; labels are written only for schedules of at most
+    ``label_limit`` tasks.
+    """
+    if color_by not in GANTT_COLORINGS:
+        raise ValueError(f"Unsupported Gantt coloring: {color_by}")
+    as_html = path.endswith(".html")
+    if not as_html and not path.endswith(".svg"):
+        raise ValueError(f"Unsupported Gantt export format: {path}")
+    makespan = max(
+        (end for tasks in schedule.values() for _, _, end in tasks), default=0
+    )
+    num_tasks = sum(len(tasks) for tasks in schedule.values())
+    margin = 100
+    scale = (width - margin) / makespan if makespan > 0 else 0.0
+    height = row_height * (len(schedule) + 1)
+    task_colors = [to_hex(color) for color in TASK_COLORS]
+
+    with open(path, "w") as file:
+        if as_html:
+            file.write(
+                f"<!DOCTYPE html>\n<html><head><meta charset='utf-8'>"
+                f"<title>{html.escape(title)}</title></head><body>\n"
+                f"<h3>{html.escape(title)}</h3>\n"
+            )
+        file.write(
+            f"<svg xmlns='http://www.w3.org/2000/svg' width='{width}' height='{height}' "
+            f"font-family='sans-serif' font-size='10'>\n"
+        )
+        for row, (resource_id, tasks) in enumerate(schedule.items()):
+            y = row * row_height
+            file.write(
+                f"<text x='4' y='{y + row_height / 2}' dominant-baseline='middle'>"
+                f"Resource {resource_id}</text>\n"
+            )
+            resource_color = to_hex(RESOURCE_COLORS[resource_id % len(RESOURCE_COLORS)])
+            for i, (task, start, end) in enumerate(tasks):
+                if color_by == "task":
+                    color = task_colors[_task_color(task, i)]
+                else:
+                    color = resource_color
+                x = margin + start * scale
+                label = html.escape(str(task))
+                file.write(
+                    f"<rect x='{x:.2f}' y='{y + 3}' width='{(end - start) * scale:.2f}' "
+                    f"height='{row_height - 6}' fill='{color}' stroke='black' stroke-width='0.5'>"
+                    f"<title>T{label}: {start:g} - {end:g}</title></rect>\n"
+                )
+                if num_tasks <= label_limit:
+                    file.write(
+                        f"<text x='{x + (end - start) * scale / 2:.2f}' y='{y + row_height / 2}' "
+                        f"fill='white' text-anchor='middle' dominant-baseline='middle'>"
+                        f"T{label}</text>\n"
+                    )
+        file.write(
+            f"<text x='{margin}' y='{height - 8}'>0</text>"
+            f"<text x='{width}' y='{height - 8}' text-anchor='end'>{makespan:g}</text>\n"
+        )
+        file.write("</svg>\n")
+        if as_html:
+            file.write("</body></html>\n")
@@ -1,115 +1,310 @@
-import matplotlib.pyplot as plt
+import math
+import time
+from bisect import bisect_right
 
+import numpy as np
 
-def calculate_bottom_level(dag):
-    bottom_level = {}
+from src.benchmark.cost_model import resolve_cost_model
+from src.benchmark.profiler import phase_timer
+from src.benchmark.ranks import calculate_bottom_level
+from src.utils.compiled_dag import compile_dag
+from src.utils.constants import HEFT_POLICIES
 
-    def compute_bottom_level(node):
-        if node in bottom_level:
-            return bottom_level[node]
-        successors = list(dag.successors(node))
-        if not successors:
-            bottom_level[node] = dag.nodes[node]["weight"]
-        else:
-            bottom_level[node] = dag.nodes[node]["weight"] + max(
-                compute_bottom_level(child) + dag.edges[node, child]["weight"]
-                for child in successors
+EFT_KERNELS = ("auto", "scalar", "vector")
+
+# With "auto", resource sets at least this large use the vector kernel;
+# below it, the per-task NumPy call overhead outweighs the loop it replaces.
+VECTOR_MIN_RESOURCES = 8
+
+# Idle slots per block of an ``IdleSlots`` index.
+SLOT_BLOCK = 64
+
+
+def use_vector_kernel(kernel, num_resources):
+    """Returns whether the EFT ``kernel`` runs vectorized for ``num_resources`` resources."""
+    if kernel not in EFT_KERNELS:
+        raise ValueError(f"Unsupported EFT kernel: {kernel}")
+    return kernel == "vector" or (
+        kernel == "auto" and num_resources >= VECTOR_MIN_RESOURCES
+    )
+
+
+def _slot_capacity(start, end):
+    """Bounds from above the longest task fitting in ``[start, end)``.
+
+    The margin of two units in the last place of ``end`` covers the rounding
+    of ``start + duration``, so a slot the exact test accepts is never
+    skipped.
+    """
+    return end - start + 2 * math.ulp(end)
+
+
+class IdleSlots:
+    """Free intervals of one resource, indexed by their length.
+
+    Slots never overlap and the last one is open-ended. They are kept in time
+    order in blocks of about ``SLOT_BLOCK`` sorted start/end lists, and a
+    max-tree over the longest slot of each block finds the first block after
+    the ready time that can hold a task. A lookup therefore bisects to the
+    slot holding the ready time, scans at most that block and one more, and
+    descends the tree in between: O(``SLOT_BLOCK`` + log n) for n slots,
+    however many short gaps precede the first one that fits. Blocks are
+    rebuilt when one empties or grows past twice its size, which costs
+    O(n) about once per ``SLOT_BLOCK`` reservations.
+    """
+
+    def __init__(self):
+        self._rebuild([0], [float("inf")])
+
+    def _rebuild(self, starts, ends):
+        self.starts = [
+            starts[i : i + SLOT_BLOCK] for i in range(0, len(starts), SLOT_BLOCK)
+        ]
+        self.ends = [ends[i : i + SLOT_BLOCK] for i in range(0, len(ends), SLOT_BLOCK)]
+        self.firsts = [block[0] for block in self.starts]
+        size = 1
+        while size < len(self.starts):
+            size *= 2
+        self.size = size
+        self.tree = [-1.0] * (2 * size)
+        for b, (block_starts, block_ends) in enumerate(zip(self.starts, self.ends)):
+            self.tree[size + b] = max(map(_slot_capacity, block_starts, block_ends))
+        for node in range(size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def _update(self, b):
+        if self.size == 1:
+            # A single block holds the open-ended slot, so a lookup never
+            # consults the tree.
+            return
+        node = self.size + b
+        self.tree[node] = max(map(_slot_capacity, self.starts[b], self.ends[b]))
+        node //= 2
+        while node:
+            self.tree[node] = max(self.tree[2 * node], self.tree[2 * node + 1])
+            node //= 2
+
+    def _next_block(self, b, duration):
+        """Returns the first block from ``b`` on that may hold ``duration``."""
+        tree = self.tree
+        node = self.size + b
+        while tree[node] < duration:
+            # Climb while this is a right child, then step to the subtree
+            # just after it. The open-ended last slot always fits, so the
+            # climb never passes the root.
+            while node & 1:
+                node //= 2
+            node += 1
+        while node < self.size:
+            node *= 2
+            if tree[node] < duration:
+                node += 1
+        return node - self.size
+
+    def earliest_start(self, ready_time, duration):
+        b = max(bisect_right(self.firsts, ready_time) - 1, 0) if self.size > 1 else 0
+        starts, ends = self.starts[b], self.ends[b]
+        i = max(bisect_right(starts, ready_time) - 1, 0)
+        start = max(starts[i], ready_time)
+        if start + duration <= ends[i]:
+            return start
+        for i in range(i + 1, len(starts)):
+            if starts[i] + duration <= ends[i]:
+                return starts[i]
+        # Every later slot starts after the ready time.
+        while True:
+            b = self._next_block(b + 1, duration)
+            for start, end in zip(self.starts[b], self.ends[b]):
+                if start + duration <= end:
+                    return start
+
+    def reserve(self, start, end):
+        b = bisect_right(self.firsts, start) - 1
+        starts, ends = self.starts[b], self.ends[b]
+        i = bisect_right(starts, start) - 1
+        slot_start, slot_end = starts[i], ends[i]
+        del starts[i], ends[i]
+        if end < slot_end:
+            starts.insert(i, end)
+            ends.insert(i, slot_end)
+        if slot_start < start:
+            starts.insert(i, slot_start)
+            ends.insert(i, start)
+        if not starts or len(starts) > 2 * SLOT_BLOCK:
+            self._rebuild(
+                [slot for block in self.starts for slot in block],
+                [slot for block in self.ends for slot in block],
             )
-        return bottom_level[node]
+            return
+        self.firsts[b] = starts[0]
+        # The pieces left over are shorter than the slot they came from, so
+        # the block's longest slot only changes if it was this one.
+        if (
+            slot_end != float("inf")
+            and _slot_capacity(slot_start, slot_end) >= self.tree[self.size + b]
+        ):
+            self._update(b)
 
-    for node in dag.nodes:
-        compute_bottom_level(node)
 
-    return bottom_level
+def heft_schedule(
+    dag,
+    resources,
+    policy="append",
+    cost_model=None,
+    kernel="auto",
+    trace=None,
+    profiler=None,
+):
+    """Schedules ``dag`` with HEFT.
 
+    ``policy="append"`` places each task after the last task on a resource;
+    ``policy="insertion"`` may place it in an earlier idle gap, as in the
+    original HEFT paper. Execution times come from the ``CostModel``
+    ``cost_model``, or from the resource speeds without one.
 
-def heft_schedule(dag, resources):
-    print(resources)
-    bottom_level = calculate_bottom_level(dag)
-    tasks = sorted(dag.nodes, key=lambda node: bottom_level[node], reverse=True)
+    ``kernel`` selects how a task's finish time on every resource is found:
+    ``"scalar"`` walks the predecessors once per resource in Python,
+    ``"vector"`` gathers them once and computes all resources in one NumPy
+    pass, and ``"auto"`` picks ``"vector"`` from ``VECTOR_MIN_RESOURCES``
+    resources on. Both produce the same schedule.
+
+    Placements are reported to the ``SchedulerTrace`` ``trace`` and phase
+    timings to the ``SchedulerProfile`` ``profiler``, if given.
+    """
+    if policy not in HEFT_POLICIES:
+        raise ValueError(f"Unsupported HEFT policy: {policy}")
+    vector = use_vector_kernel(kernel, len(resources))
+    phase = phase_timer(profiler)
+    with phase("compile"):
+        dag = compile_dag(dag)
+    if trace is not None:
+        trace.start("HEFT" if policy == "append" else f"HEFT ({policy})", dag)
+    tracing = trace is not None and trace.per_task
+    labels = dag.labels
+    with phase("cost_model"):
+        cost_model = resolve_cost_model(dag, resources, cost_model)
+        exec_times = cost_model.exec_time if vector else cost_model.exec_time.tolist()
+    pred_ptr = dag.pred_ptr.tolist()
+    pred_idx = dag.pred_idx.tolist()
+    pred_weight = dag.pred_weight.tolist()
+
+    with phase("bottom_level"):
+        bottom_level = calculate_bottom_level(dag, costs=cost_model.rank_cost).tolist()
+    with phase("priority_sort"):
+        tasks = sorted(
+            range(dag.num_tasks), key=lambda node: bottom_level[node], reverse=True
+        )
 
     schedule = {resource: [] for resource in range(len(resources))}
-    task_allocation = {}
+    task_allocation = [None] * dag.num_tasks
     resource_availability = [0] * len(resources)
-    task_start_times = {}
+    task_start_times = [None] * dag.num_tasks
+    idle_slots = [IdleSlots() for _ in resources] if policy == "insertion" else None
+    if vector:
+        pred_idx_array = dag.pred_idx
+        pred_weight_array = dag.pred_weight
+        finish_times = np.zeros(dag.num_tasks)
+        allocation = np.full(dag.num_tasks, -1)
+        availability = np.zeros(len(resources))
+        resource_ids = np.arange(len(resources))
 
+    placement_start = time.perf_counter()
     for task in tasks:
         best_time = float("inf")
         best_resource = None
+        best_start = None
+        first, last = pred_ptr[task], pred_ptr[task + 1]
+        exec_row = exec_times[task]
 
-        for resource_id, resource in enumerate(resources):
-            est = resource_availability[resource_id]
-            for pred in dag.predecessors(task):
-                if pred in task_allocation:
-                    pred_end_time = task_start_times[pred][1]
-                    if task_allocation[pred] != resource_id:
-                        pred_end_time += dag.edges[pred, task]["weight"]
-                    est = max(est, pred_end_time)
+        if vector:
+            # Data-ready time on every resource: each placed predecessor's
+            # finish time, plus the edge weight unless it ran there.
+            ready = np.zeros(len(resources))
+            if first < last:
+                preds = pred_idx_array[first:last]
+                pred_resources = allocation[preds]
+                placed = pred_resources >= 0
+                if placed.any():
+                    ends = finish_times[preds][placed]
+                    arrivals = np.where(
+                        pred_resources[placed, None] == resource_ids,
+                        ends[:, None],
+                        (ends + pred_weight_array[first:last][placed])[:, None],
+                    )
+                    ready = arrivals.max(axis=0)
+            if idle_slots:
+                starts = np.array(
+                    [
+                        idle_slots[resource_id].earliest_start(est, exec_time)
+                        for resource_id, (est, exec_time) in enumerate(
+                            zip(ready.tolist(), exec_row.tolist())
+                        )
+                    ]
+                )
+            else:
+                starts = np.maximum(availability, ready)
+            efts = starts + exec_row
+            best_resource = int(efts.argmin())
+            best_time = float(efts[best_resource])
+            best_start = float(starts[best_resource])
+            allocation[task] = best_resource
+            finish_times[task] = best_time
+            availability[best_resource] = max(availability[best_resource], best_time)
+        else:
+            for resource_id, exec_time in enumerate(exec_row):
+                est = 0 if idle_slots else resource_availability[resource_id]
+                for e in range(first, last):
+                    pred = pred_idx[e]
+                    if task_allocation[pred] is not None:
+                        pred_end_time = task_start_times[pred][1]
+                        if task_allocation[pred] != resource_id:
+                            pred_end_time += pred_weight[e]
+                        est = max(est, pred_end_time)
 
-            exec_time = dag.nodes[task]["weight"] / resource["speed"]
-            eft = est + exec_time
+                if idle_slots:
+                    est = idle_slots[resource_id].earliest_start(est, exec_time)
+                eft = est + exec_time
 
-            if eft < best_time:
-                best_time = eft
-                best_resource = resource_id
+                if eft < best_time:
+                    best_time = eft
+                    best_resource = resource_id
+                    best_start = est
 
         task_allocation[task] = best_resource
-        task_start_times[task] = (
-            best_time - dag.nodes[task]["weight"] / resources[best_resource]["speed"],
-            best_time,
-        )
+        if idle_slots:
+            idle_slots[best_resource].reserve(best_start, best_time)
+        else:
+            best_start = best_time - float(exec_row[best_resource])
+        task_start_times[task] = (best_start, best_time)
         schedule[best_resource].append(
-            (task, task_start_times[task][0], task_start_times[task][1])
+            (labels[task], task_start_times[task][0], task_start_times[task][1])
         )
 
-        resource_availability[best_resource] = best_time
-
-        print(
-            f"Task {task} assigned to Resource {best_resource} at time {task_start_times[task][0]}-{task_start_times[task][1]}"
+        resource_availability[best_resource] = max(
+            resource_availability[best_resource], best_time
         )
+        if tracing:
+            trace.record(task, best_resource, best_start, best_time)
+
+    if profiler is not None:
+        profiler.add("placement", time.perf_counter() - placement_start)
 
     makespan = max(resource_availability)
-    print(f"Makespan: {makespan}")
 
     utilization = {}
     for resource_id, tasks in schedule.items():
         active_time = sum(end - start for _, start, end in tasks)
         utilization[resource_id] = active_time / makespan if makespan > 0 else 0.0
 
-    for resource_id, util in utilization.items():
-        print(f"Resource {resource_id} utilization: {util:.2%}")
-
+    if trace is not None:
+        trace.finish(makespan, utilization, resources)
     return schedule, makespan, utilization
 
 
 def visualize_schedule(schedule):
-    print(schedule)
-    _, ax = plt.subplots(figsize=(10, 6))
-    colors = ["red", "blue", "green", "orange", "purple"]
+    import matplotlib.pyplot as plt
 
-    for resource_id, tasks in schedule.items():
-        for task, start, end in tasks:
-            ax.barh(
-                resource_id,
-                end - start,
-                left=start,
-                color=colors[resource_id % len(colors)],
-                edgecolor="black",
-            )
-            ax.text(
-                (start + end) / 2,
-                resource_id,
-                f"T{task}",
-                color="white",
-                ha="center",
-                va="center",
-                fontsize=10,
-            )
+    from src.benchmark.gantt import plot_gantt
 
-    ax.set_yticks(range(len(schedule)))
-    ax.set_yticklabels([f"Resource {i}" for i in range(len(schedule))])
-    ax.set_xlabel("Time")
-    ax.set_ylabel("Resources")
-    ax.set_title("Scheduling Result")
-    ax.grid(True, linestyle="--", alpha=0.5)
+    plot_gantt(schedule, title="Scheduling Result")
     plt.show()
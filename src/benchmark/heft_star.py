@@ -1,52 +1,66 @@
-import matplotlib.pyplot as plt
+import time
 from collections import defaultdict
 import networkx as nx
-import networkx.algorithms.community as nx_comm
-from src.utils.graph_io import export_graph
-from src.generation.graph_annotator import annotate_graph
-
-
-def calculate_bottom_level(dag):
-    bottom_level = {}
-
-    def compute_bottom_level(node):
-        if node in bottom_level:
-            return bottom_level[node]
-        successors = list(dag.successors(node))
-        if not successors:
-            bottom_level[node] = dag.nodes[node]["weight"]
-        else:
-            bottom_level[node] = dag.nodes[node]["weight"] + max(
-                compute_bottom_level(child) + dag.edges[node, child]["weight"]
-                for child in successors
-            )
-        return bottom_level[node]
-
-    for node in dag.nodes:
-        compute_bottom_level(node)
-
-    return bottom_level
-
-
-def find_available_cores(resource_availability, core_group, required_cores, start_time):
-    available_sets = []
-    for i in range(len(core_group) - required_cores + 1):
-        if all(
-            resource_availability[core_group[j]] <= start_time
-            for j in range(i, i + required_cores)
-        ):
-            available_sets.append(core_group[i : i + required_cores])
-    return available_sets
-
-
-def calculate_centrality(dag):
-    return nx.betweenness_centrality(dag)  # Compute centrality scores
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from src.benchmark.cost_model import resolve_cost_model
+from src.benchmark.heft import use_vector_kernel
+from src.benchmark.profiler import phase_timer
+from src.benchmark.ranks import calculate_bottom_level, path_counts
+from src.utils.compiled_dag import compile_dag
+from src.utils.constants import CENTRALITY_METHODS
+
+
+def find_earliest_core_window(core_ready, core_group, required_cores, est):
+    """Finds the earliest start of ``required_cores`` adjacent cores of a group.
+
+    A window of ``core_group`` can start once its latest core is ready, so a
+    sliding maximum over the group's ready times gives every window's ready
+    time at once. Returns ``(start_time, cores)`` for the first window ready
+    by the earliest feasible start, or ``None`` if the group is too small.
+    """
+    if len(core_group) < required_cores:
+        return None
+    window_ready = sliding_window_view(core_ready[core_group], required_cores).max(
+        axis=1
+    )
+    start_time = max(window_ready.min().item(), est)
+    first = int(np.argmax(window_ready <= start_time))
+    return start_time, core_group[first : first + required_cores].tolist()
+
+
+def calculate_centrality(dag, method="exact", k=64, seed=42, graph=None):
+    """Returns a centrality score per task ID, highest for the most central tasks.
+
+    ``exact`` is networkx betweenness; ``sampled`` estimates it from ``k``
+    seeded pivots; ``path_count`` is the natural logarithm of the number of
+    source-to-sink paths running through each task. Path counts grow
+    exponentially with depth, so that score stays on a log scale: it only
+    orders tasks, and exponentiating it would underflow on deep DAGs.
+    ``graph`` is a networkx form of ``dag`` to reuse for the betweenness
+    methods.
+    """
+    if method == "path_count":
+        paths_to, paths_from = path_counts(dag)
+        return paths_to + paths_from
+
+    if graph is None:
+        graph = dag if isinstance(dag, nx.DiGraph) else dag.to_networkx()
+    if method == "exact":
+        scores = nx.betweenness_centrality(graph)
+    elif method == "sampled":
+        scores = nx.betweenness_centrality(
+            graph, k=min(k, graph.number_of_nodes()), seed=seed
+        )
+    else:
+        raise ValueError(f"Unsupported centrality method: {method}")
+    return np.array([scores[node] for node in graph.nodes], dtype=np.float64)
 
 
 def detect_communities(dag):
     """Detects communities of non-GANG tasks using the Louvain method."""
     undirected_graph = dag.to_undirected()
-    communities = nx_comm.louvain_communities(undirected_graph, seed=42)
+    communities = nx.community.louvain_communities(undirected_graph, seed=42)
     community_mapping = {}
     for community_id, community_nodes in enumerate(communities):
         for node in community_nodes:
@@ -54,49 +68,90 @@ def detect_communities(dag):
     return community_mapping
 
 
-def group_cores_by_speed(cores):
-    """Returns a dictionary mapping speed to available cores."""
-    core_groups = defaultdict(list)
-    for i, core in enumerate(cores):
-        core_groups[core["speed"]].append(i)
-    return core_groups
+def heft_star_schedule(
+    dag,
+    cores,
+    centrality="exact",
+    centrality_k=64,
+    cost_model=None,
+    kernel="auto",
+    trace=None,
+    profiler=None,
+):
+    """Schedules ``dag`` with HEFT*, ranking tasks by bottom level and centrality.
+
+    A non-GANG task goes to the core its community already uses, or else to
+    the core where it can start first; a GANG task goes to the window of
+    adjacent, interchangeable cores where it finishes first. ``kernel``
+    selects how the first core is found, as in ``heft_schedule``: a Python
+    scan of the cores, or one NumPy ``argmin`` over them. GANG windows are
+    always searched with NumPy, one core group at a time.
+    """
+    vector = use_vector_kernel(kernel, len(cores))
+    phase = phase_timer(profiler)
+    with phase("compile"):
+        graph = dag if isinstance(dag, nx.DiGraph) else dag.to_networkx()
+        dag = compile_dag(dag)
+    if trace is not None:
+        trace.start("HEFT*", dag)
+    tracing = trace is not None and trace.per_task
+    labels = dag.labels
+    with phase("cost_model"):
+        cost_model = resolve_cost_model(dag, cores, cost_model)
+        exec_times = cost_model.exec_time.tolist()
+    task_num_cores = dag.num_cores.tolist()
+    pred_ptr = dag.pred_ptr.tolist()
+    pred_idx = dag.pred_idx.tolist()
+    pred_weight = dag.pred_weight.tolist()
 
-
-def heft_star_schedule(dag, cores):
     num_cores = len(cores)
-    bottom_level = calculate_bottom_level(dag)
-    centrality = calculate_centrality(dag)
-    community_mapping = detect_communities(dag)
-    core_groups = group_cores_by_speed(cores)
+    with phase("bottom_level"):
+        bottom_level = calculate_bottom_level(dag, costs=cost_model.rank_cost).tolist()
+    with phase("centrality"):
+        centrality = calculate_centrality(
+            dag, centrality, k=centrality_k, graph=graph
+        ).tolist()
+    with phase("communities"):
+        community_mapping = detect_communities(graph)
+    # Cores that run every task in the same time are interchangeable for
+    # GANG tasks; with speeds, these are the cores of equal speed.
+    core_groups = cost_model.resource_groups()
 
     # Prioritize tasks using bottom-level + centrality
-    tasks = sorted(
-        dag.nodes, key=lambda node: (bottom_level[node], centrality[node]), reverse=True
-    )
+    with phase("priority_sort"):
+        tasks = sorted(
+            range(dag.num_tasks),
+            key=lambda node: (bottom_level[node], centrality[node]),
+            reverse=True,
+        )
 
     schedule = defaultdict(list)
-    task_allocation = {}
-    task_start_times = {}
+    task_allocation = [None] * dag.num_tasks
+    task_start_times = [None] * dag.num_tasks
     resource_availability = [0] * num_cores
+    core_ready = np.zeros(num_cores)
     used_cores_by_community = {}
 
+    placement_start = time.perf_counter()
     for task in tasks:
-        required_cores = dag.nodes[task]["num_cores"]
+        required_cores = task_num_cores[task]
         best_time = float("inf")
         best_cores = None
-        best_speed = None
+        best_exec_time = None
+        exec_row = exec_times[task]
 
         # Compute Earliest Start Time (EST) considering precedence
         est = 0
-        for pred in dag.predecessors(task):
-            if pred in task_allocation:
+        for e in range(pred_ptr[task], pred_ptr[task + 1]):
+            pred = pred_idx[e]
+            if task_allocation[pred] is not None:
                 pred_end_time = task_start_times[pred][1]
                 if not set(task_allocation[pred]).issubset(set(best_cores or [])):
-                    pred_end_time += dag.edges[pred, task]["weight"]
+                    pred_end_time += pred_weight[e]
                 est = max(est, pred_end_time)
 
         if required_cores == 1:  # Non-GANG task
-            community_id = community_mapping.get(task, -1)
+            community_id = community_mapping.get(labels[task], -1)
 
             if community_id in used_cores_by_community:
                 # Assign the same core if available
@@ -104,70 +159,70 @@ def heft_star_schedule(dag, cores):
                 est = max(est, resource_availability[core])
             else:
                 # Find the least busy core that maintains precedence order
-                est, core = min(
-                    (max(est, resource_availability[c]), c) for c in range(num_cores)
-                )
+                if vector:
+                    starts = np.maximum(core_ready, est)
+                    core = int(starts.argmin())
+                    est = float(starts[core])
+                else:
+                    est, core = min(
+                        (max(est, resource_availability[c]), c)
+                        for c in range(num_cores)
+                    )
                 used_cores_by_community[community_id] = (
                     core  # Assign this core to the community
                 )
 
-            exec_time = dag.nodes[task]["weight"] / cores[core]["speed"]
-            eft = est + exec_time
-
-            best_time = eft
+            best_exec_time = exec_row[core]
+            best_time = est + best_exec_time
             best_cores = [core]
-            best_speed = cores[core]["speed"]
 
         else:  # GANG task
-            for speed, core_group in core_groups.items():
-                for start_time in set(resource_availability):
-                    available_sets = find_available_cores(
-                        resource_availability,
-                        core_group,
-                        required_cores,
-                        max(start_time, est),
-                    )
-                    for core_set in available_sets:
-                        avg_speed = speed
-                        exec_time = dag.nodes[task]["weight"] / avg_speed
-                        eft = max(start_time, est) + exec_time
-
-                        if eft < best_time:
-                            best_time = eft
-                            best_cores = core_set
-                            best_speed = speed
+            if profiler is not None:
+                search_start = time.perf_counter()
+            for core_group in core_groups:
+                window = find_earliest_core_window(
+                    core_ready, core_group, required_cores, est
+                )
+                if window is None:
+                    continue
+                start_time, core_set = window
+                exec_time = exec_row[core_group[0]]
+                eft = start_time + exec_time
+
+                if eft < best_time:
+                    best_time = eft
+                    best_cores = core_set
+                    best_exec_time = exec_time
+            if profiler is not None:
+                profiler.add("gang_search", time.perf_counter() - search_start)
 
         if best_cores is None:
-            print(f"Task {task} could not be scheduled due to lack of available cores.")
+            if trace is not None:
+                trace.unplaced(labels[task])
             continue
 
         task_allocation[task] = best_cores
-        task_start_times[task] = (
-            best_time - dag.nodes[task]["weight"] / best_speed,
-            best_time,
-        )
+        task_start_times[task] = (best_time - best_exec_time, best_time)
 
         for core in best_cores:
             resource_availability[core] = best_time
+            core_ready[core] = best_time
             schedule[core].append(
-                (task, task_start_times[task][0], task_start_times[task][1])
+                (labels[task], task_start_times[task][0], task_start_times[task][1])
             )
+            if tracing:
+                trace.record(task, core, *task_start_times[task])
 
-        print(
-            f"Task {task} (Centrality {centrality[task]:.3f}) assigned to Cores {best_cores} (Speed {best_speed}) at time {task_start_times[task][0]:.2f}-{task_start_times[task][1]:.2f}"
-        )
+    if profiler is not None:
+        profiler.add("placement", time.perf_counter() - placement_start)
 
     makespan = max(resource_availability)
-    print(f"Makespan: {makespan:.2f}")
 
     utilization = {}
     for core_id, tasks in schedule.items():
         active_time = sum(end - start for _, start, end in tasks)
         utilization[core_id] = active_time / makespan if makespan > 0 else 0.0
 
-    for core_id, util in utilization.items():
-        print(
-            f"Core {core_id} (Speed {cores[core_id]['speed']}) utilization: {util:.2%}"
-        )
-
+    if trace is not None:
+        trace.finish(makespan, utilization, cores)
     return schedule, makespan, utilization
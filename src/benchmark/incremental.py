@@ -0,0 +1,367 @@
+import networkx as nx
+import numpy as np
+
+from src.benchmark.cost_model import CostModel, resolve_cost_model
+from src.benchmark.heft import HEFT_POLICIES, IdleSlots
+from src.benchmark.ranks import calculate_bottom_level
+from src.utils.compiled_dag import compile_dag
+
+
+class IncrementalHEFT:
+    """HEFT schedule that is repaired, not recomputed, when the DAG changes.
+
+    The DAG is edited through ``add_task``, ``remove_task``,
+    ``update_weight``, ``add_edge``, ``remove_edge`` and
+    ``update_edge_weight``; ``reschedule`` then applies all pending edits.
+    Only the changed tasks and their ancestors get new bottom levels, and
+    placements are kept up to the first position where the priority order
+    changes or a task with changed inputs is placed. The result is the same
+    as ``heft_schedule`` on the edited DAG; ``report`` says how much of a
+    full reschedule was skipped.
+
+    Execution times come from the ``CostModel`` ``cost_model``, or from the
+    resource speeds without one. With a cost model, every added or
+    reweighted task must bring its own ``exec_time`` row; ``to_cost_model``
+    returns the model of the edited DAG.
+    """
+
+    def __init__(self, dag, resources, policy="append", cost_model=None):
+        if policy not in HEFT_POLICIES:
+            raise ValueError(f"Unsupported HEFT policy: {policy}")
+        dag = compile_dag(dag)
+        self.resources = resources
+        self.policy = policy
+        self.speeds = (
+            [resource["speed"] for resource in resources]
+            if cost_model is None
+            else None
+        )
+        cost_model = resolve_cost_model(dag, resources, cost_model)
+        self.exec_time = cost_model.exec_time.tolist()
+        self.rank_cost = np.asarray(cost_model.rank_cost, dtype=np.float64).tolist()
+        self.labels = list(dag.labels)
+        self.index = {label: i for i, label in enumerate(self.labels)}
+        self.weight = dag.weight.tolist()
+        self.num_cores = dag.num_cores.tolist()
+        self.preds = [{} for _ in self.labels]
+        self.succs = [{} for _ in self.labels]
+        succ_ptr = dag.succ_ptr.tolist()
+        succ_idx = dag.succ_idx.tolist()
+        succ_weight = dag.succ_weight.tolist()
+        for u in range(dag.num_tasks):
+            for e in range(succ_ptr[u], succ_ptr[u + 1]):
+                self.succs[u][succ_idx[e]] = succ_weight[e]
+                self.preds[succ_idx[e]][u] = succ_weight[e]
+        self.alive = [True] * dag.num_tasks
+        self.bottom_level = calculate_bottom_level(
+            dag, costs=cost_model.rank_cost
+        ).tolist()
+
+        self.order = []
+        self.resource_of = [None] * dag.num_tasks
+        self.start = [None] * dag.num_tasks
+        self.end = [None] * dag.num_tasks
+        self._rank_dirty = set()
+        self._placement_dirty = set()
+        self.report = None
+        self.result = self._place(self._priority_order(), 0)
+
+    @property
+    def num_tasks(self):
+        return sum(self.alive)
+
+    def _task(self, label):
+        task = self.index.get(label)
+        if task is None or not self.alive[task]:
+            raise ValueError(f"Task {label} is not in the DAG.")
+        return task
+
+    def _reaches(self, sources, targets):
+        """Returns whether any of ``targets`` is reachable from ``sources``."""
+        seen = set(sources)
+        stack = list(sources)
+        while stack:
+            node = stack.pop()
+            if node in targets:
+                return True
+            for child in self.succs[node]:
+                if child not in seen:
+                    seen.add(child)
+                    stack.append(child)
+        return False
+
+    def _costs(self, label, weight, exec_time):
+        """Returns the execution time row and rank cost of a task.
+
+        Without ``exec_time``, the row is ``weight`` over each resource speed
+        and the task is ranked by its weight, as in ``CostModel.from_speeds``;
+        a given row is ranked by its mean, as in ``CostModel``.
+        """
+        if exec_time is None:
+            if self.speeds is None:
+                raise ValueError(
+                    f"Task {label} needs execution times under a cost model."
+                )
+            return [weight / speed for speed in self.speeds], float(weight)
+        model = CostModel([exec_time])
+        if model.num_resources != len(self.resources):
+            raise ValueError(
+                f"Task {label} has {model.num_resources} execution times for "
+                f"{len(self.resources)} resources."
+            )
+        return model.exec_time[0].tolist(), float(model.mean_cost[0])
+
+    def add_task(
+        self,
+        label,
+        weight,
+        num_cores=1,
+        predecessors=None,
+        successors=None,
+        exec_time=None,
+    ):
+        """Adds a task with ``{label: edge weight}`` predecessors and successors.
+
+        ``exec_time`` is the task's execution time on every resource.
+        """
+        if label in self.index and self.alive[self.index[label]]:
+            raise ValueError(f"Task {label} is already in the DAG.")
+        exec_row, rank_cost = self._costs(label, weight, exec_time)
+        predecessors = {self._task(p): w for p, w in (predecessors or {}).items()}
+        successors = {self._task(s): w for s, w in (successors or {}).items()}
+        if self._reaches(successors, set(predecessors)):
+            raise ValueError(f"Adding task {label} would create a cycle.")
+
+        task = len(self.labels)
+        self.labels.append(label)
+        self.index[label] = task
+        self.weight.append(weight)
+        self.exec_time.append(exec_row)
+        self.rank_cost.append(rank_cost)
+        self.num_cores.append(num_cores)
+        self.preds.append({})
+        self.succs.append({})
+        self.alive.append(True)
+        self.bottom_level.append(None)
+        self.resource_of.append(None)
+        self.start.append(None)
+        self.end.append(None)
+        self._rank_dirty.add(task)
+        self._placement_dirty.add(task)
+        for pred, w in predecessors.items():
+            self._link(pred, task, w)
+        for succ, w in successors.items():
+            self._link(task, succ, w)
+
+    def remove_task(self, label):
+        task = self._task(label)
+        for pred in list(self.preds[task]):
+            self._unlink(pred, task)
+        for succ in list(self.succs[task]):
+            self._unlink(task, succ)
+        self.alive[task] = False
+        self._rank_dirty.discard(task)
+        self._placement_dirty.discard(task)
+
+    def update_weight(self, label, weight, exec_time=None):
+        task = self._task(label)
+        self.exec_time[task], self.rank_cost[task] = self._costs(
+            label, weight, exec_time
+        )
+        self.weight[task] = weight
+        self._rank_dirty.add(task)
+        self._placement_dirty.add(task)
+
+    def add_edge(self, u, v, weight):
+        u, v = self._task(u), self._task(v)
+        if v in self.succs[u]:
+            raise ValueError(
+                f"Edge {self.labels[u]} -> {self.labels[v]} already exists."
+            )
+        if self._reaches([v], {u}):
+            raise ValueError(
+                f"Edge {self.labels[u]} -> {self.labels[v]} would create a cycle."
+            )
+        self._link(u, v, weight)
+
+    def remove_edge(self, u, v):
+        u, v = self._task(u), self._task(v)
+        if v not in self.succs[u]:
+            raise ValueError(
+                f"Edge {self.labels[u]} -> {self.labels[v]} does not exist."
+            )
+        self._unlink(u, v)
+
+    def update_edge_weight(self, u, v, weight):
+        self.remove_edge(u, v)
+        self._link(self.index[u], self.index[v], weight)
+
+    def _link(self, u, v, weight):
+        self.succs[u][v] = weight
+        self.preds[v][u] = weight
+        self._rank_dirty.add(u)
+        self._placement_dirty.add(v)
+
+    def _unlink(self, u, v):
+        del self.succs[u][v]
+        del self.preds[v][u]
+        self._rank_dirty.add(u)
+        self._placement_dirty.add(v)
+
+    def _update_ranks(self):
+        """Recomputes the bottom levels of the changed tasks and their ancestors."""
+        affected = set(self._rank_dirty)
+        stack = list(affected)
+        while stack:
+            for pred in self.preds[stack.pop()]:
+                if pred not in affected:
+                    affected.add(pred)
+                    stack.append(pred)
+
+        # Walk the affected tasks from sinks up; successors outside the set
+        # keep their bottom level.
+        pending = {
+            task: sum(1 for child in self.succs[task] if child in affected)
+            for task in affected
+        }
+        ready = [task for task, count in pending.items() if count == 0]
+        while ready:
+            task = ready.pop()
+            best = None
+            for child, w in self.succs[task].items():
+                value = self.bottom_level[child] + w
+                best = value if best is None else max(best, value)
+            self.bottom_level[task] = self.rank_cost[task] + (
+                0 if best is None else best
+            )
+            for pred in self.preds[task]:
+                if pred in pending:
+                    pending[pred] -= 1
+                    if pending[pred] == 0:
+                        ready.append(pred)
+        return len(affected)
+
+    def _priority_order(self):
+        bottom_level = self.bottom_level
+        return sorted(
+            (task for task, alive in enumerate(self.alive) if alive),
+            key=lambda task: bottom_level[task],
+            reverse=True,
+        )
+
+    def reschedule(self):
+        """Applies pending edits; returns ``(schedule, makespan, utilization)``."""
+        ranks_recomputed = self._update_ranks()
+        order = self._priority_order()
+
+        # Placements before the first changed position see exactly the same
+        # inputs as before, so they are kept. A removed task shifts the order
+        # from its old position on.
+        first = 0
+        limit = min(len(order), len(self.order))
+        while (
+            first < limit
+            and order[first] == self.order[first]
+            and order[first] not in self._placement_dirty
+        ):
+            first += 1
+
+        self.result = self._place(order, first)
+        num_tasks = len(order)
+        replaced = num_tasks - first
+        self.report = {
+            "tasks": num_tasks,
+            "ranks_recomputed": ranks_recomputed,
+            "tasks_rescheduled": replaced,
+            "rank_work_saved": 1 - ranks_recomputed / num_tasks if num_tasks else 0.0,
+            "placement_work_saved": 1 - replaced / num_tasks if num_tasks else 0.0,
+        }
+        self._rank_dirty.clear()
+        self._placement_dirty.clear()
+        return self.result
+
+    def _place(self, order, first):
+        """Keeps the placements of ``order[:first]`` and places the rest with HEFT."""
+        resources = self.resources
+        resource_of, start, end = self.resource_of, self.start, self.end
+        exec_times, preds = self.exec_time, self.preds
+        resource_availability = [0] * len(resources)
+        idle_slots = (
+            [IdleSlots() for _ in resources] if self.policy == "insertion" else None
+        )
+        for task in order[:first]:
+            resource = resource_of[task]
+            resource_availability[resource] = max(
+                resource_availability[resource], end[task]
+            )
+            if idle_slots:
+                idle_slots[resource].reserve(start[task], end[task])
+        for task in order[first:]:
+            resource_of[task] = None
+
+        for task in order[first:]:
+            best_time = float("inf")
+            best_resource = None
+            best_start = None
+            for resource_id, exec_time in enumerate(exec_times[task]):
+                est = 0 if idle_slots else resource_availability[resource_id]
+                for pred, w in preds[task].items():
+                    if resource_of[pred] is not None:
+                        pred_end_time = end[pred]
+                        if resource_of[pred] != resource_id:
+                            pred_end_time += w
+                        est = max(est, pred_end_time)
+                if idle_slots:
+                    est = idle_slots[resource_id].earliest_start(est, exec_time)
+                eft = est + exec_time
+                if eft < best_time:
+                    best_time = eft
+                    best_resource = resource_id
+                    best_start = est
+
+            resource_of[task] = best_resource
+            if idle_slots:
+                idle_slots[best_resource].reserve(best_start, best_time)
+            else:
+                best_start = best_time - exec_times[task][best_resource]
+            start[task] = best_start
+            end[task] = best_time
+            resource_availability[best_resource] = max(
+                resource_availability[best_resource], best_time
+            )
+
+        self.order = order
+        schedule = {resource: [] for resource in range(len(resources))}
+        for task in order:
+            schedule[resource_of[task]].append(
+                (self.labels[task], start[task], end[task])
+            )
+        makespan = max(resource_availability)
+        utilization = {}
+        for resource_id, tasks in schedule.items():
+            active_time = sum(
+                task_end - task_start for _, task_start, task_end in tasks
+            )
+            utilization[resource_id] = active_time / makespan if makespan > 0 else 0.0
+        return schedule, makespan, utilization
+
+    def to_cost_model(self):
+        """Returns the ``CostModel`` of the current DAG, in ``to_networkx`` node order."""
+        alive = [task for task, alive in enumerate(self.alive) if alive]
+        return CostModel(
+            [self.exec_time[task] for task in alive],
+            rank_cost=np.array([self.rank_cost[task] for task in alive]),
+        )
+
+    def to_networkx(self):
+        """Returns the current DAG as an annotated ``nx.DiGraph``."""
+        dag = nx.DiGraph()
+        for task, label in enumerate(self.labels):
+            if self.alive[task]:
+                dag.add_node(
+                    label, weight=self.weight[task], num_cores=self.num_cores[task]
+                )
+        for u, succs in enumerate(self.succs):
+            for v, w in succs.items():
+                dag.add_edge(self.labels[u], self.labels[v], weight=w)
+        return dag
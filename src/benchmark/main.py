@@ -1,65 +1,225 @@
-from .heft import *
-from .edf import *
-from src.generation.graph_generator import generate_synthetic_graph, convert_to_dag
-from src.generation.graph_annotator import annotate_graph
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 
-import matplotlib.pyplot as plt
+from .heft_star import CENTRALITY_METHODS, heft_star_schedule
+from .trace import SchedulerTrace
+from .profiler import print_profile_table, profile_schedule
+from src.generation.dag_generator import generate_dag
+from src.generation.graph_annotator import ANNOTATION_CONFIG
+from src.utils.compiled_dag import compile_dag
+from src.utils.dag_cache import CACHE_DIR, load_or_build
+
+
+def cell_seed(graph_type, size, params, seed=0):
+    """Derives the seed of one sweep cell from its coordinates and a base seed."""
+    return zlib.crc32(f"{graph_type}|{size}|{params}|{seed}".encode())
+
+
+def _run_cell(cell):
+    """Generates, annotates and schedules one (size, params, algorithm) cell.
+
+    Returns ``(gang_percentage, makespan, utilization, runtime, profile)``,
+    where ``profile`` is a ``SchedulerProfile`` dict when profiling and
+    ``None`` otherwise, or the error message if the graph could not be built
+    or scheduled.
+    """
+    (
+        graph_type,
+        size,
+        params,
+        seed,
+        config,
+        alg_func,
+        resources,
+        cache_dir,
+        trace,
+        profile,
+    ) = cell
+
+    def build():
+        return generate_dag(graph_type, size, params, seed, config)
+
+    try:
+        if cache_dir is None:
+            annotated_dag = build()
+        else:
+            annotated_dag = load_or_build(
+                graph_type, size, params, seed, config, build, cache_dir
+            )
+
+        gang_tasks = int((annotated_dag.num_cores > 1).sum())
+        gang_percentage = gang_tasks / annotated_dag.num_tasks * 100
+
+        kwargs = {} if trace == "off" else {"trace": SchedulerTrace(trace)}
+        start = time.perf_counter()
+        if profile:
+            schedule, makespan, utilization, profile = profile_schedule(
+                alg_func, annotated_dag, resources, **kwargs
+            )
+            profile = profile.to_dict()
+        else:
+            schedule, makespan, utilization = alg_func(
+                annotated_dag, resources, **kwargs
+            )
+            profile = None
+        runtime = time.perf_counter() - start
+    except ValueError as e:
+        return str(e)
+    avg_utilization = sum(utilization.values()) / len(utilization)
+    return gang_percentage, makespan, avg_utilization, runtime, profile
 
 
 def benchmark_algorithms_with_params(
-    graph_type, graph_sizes, param_sets, resources, algorithms
+    graph_type,
+    graph_sizes,
+    param_sets,
+    resources,
+    algorithms,
+    jobs=1,
+    seed=0,
+    cache_dir=CACHE_DIR,
+    annotation_config=ANNOTATION_CONFIG,
+    trace="off",
+    profile=False,
 ):
+    """Runs every (size, params, algorithm) cell, in ``jobs`` worker processes.
+
+    Each cell builds its own DAG from a seed derived from ``seed`` and its
+    size and params, so all algorithms see the same DAG and the results do
+    not depend on ``jobs``. DAGs are annotated with ``annotation_config``
+    and kept in the on-disk cache at ``cache_dir`` unless it is ``None``.
+    ``trace`` is the ``SchedulerTrace`` level of every scheduler run; with
+    ``profile`` each run's ``SchedulerProfile`` is kept under ``"profile"``.
+    """
     results = {
         alg: {
-            str(params): {"makespan": [], "utilization": [], "gang_percentage": []}
+            str(params): {
+                "size": [],
+                "makespan": [],
+                "utilization": [],
+                "gang_percentage": [],
+                "runtime": [],
+                "profile": [],
+            }
             for params in param_sets
         }
         for alg in algorithms.keys()
     }
 
-    for size in graph_sizes:
-        for params in param_sets:
-            try:
-                dag = generate_synthetic_graph(graph_type, n=size, params=params)
-                dag = convert_to_dag(dag)
-                annotated_dag = annotate_graph(dag)
-
-                gang_tasks = sum(
-                    1
-                    for n in annotated_dag.nodes
-                    if annotated_dag.nodes[n]["num_cores"] > 1
-                )
-                gang_percentage = gang_tasks / len(annotated_dag.nodes) * 100
-
-                for alg_name, alg_func in algorithms.items():
-                    schedule, makespan, utilization = alg_func(annotated_dag, resources)
-                    results[alg_name][str(params)]["makespan"].append(makespan)
-                    avg_utilization = sum(utilization.values()) / len(utilization)
-                    results[alg_name][str(params)]["utilization"].append(
-                        avg_utilization
-                    )
-                    results[alg_name][str(params)]["gang_percentage"].append(
-                        gang_percentage
-                    )
-            except ValueError as e:
-                print(
-                    f"Skipping graph with size={size} and params={params} due to: {e}"
-                )
+    keys = [
+        (size, params, alg_name)
+        for size in graph_sizes
+        for params in param_sets
+        for alg_name in algorithms
+    ]
+    cells = [
+        (
+            graph_type,
+            size,
+            params,
+            cell_seed(graph_type, size, params, seed),
+            annotation_config,
+            algorithms[alg_name],
+            resources,
+            cache_dir,
+            trace,
+            profile,
+        )
+        for size, params, alg_name in keys
+    ]
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            outcomes = list(executor.map(_run_cell, cells))
+    else:
+        outcomes = map(_run_cell, cells)
+
+    for (size, params, alg_name), outcome in zip(keys, outcomes):
+        if isinstance(outcome, str):
+            print(
+                f"Skipping {alg_name} on graph with size={size} and params={params} due to: {outcome}"
+            )
+            continue
+        gang_percentage, makespan, avg_utilization, runtime, run_profile = outcome
+        metrics = results[alg_name][str(params)]
+        metrics["size"].append(size)
+        metrics["makespan"].append(makespan)
+        metrics["runtime"].append(runtime)
+        metrics["utilization"].append(avg_utilization)
+        metrics["gang_percentage"].append(gang_percentage)
+        if run_profile is not None:
+            metrics["profile"].append(run_profile)
 
     return results
 
 
-def plot_comparison_per_network(graph_type, graph_sizes, results, param_sets):
+def summarize_results(graph_type, results, param_sets):
+    """Prints the mean makespan and scheduler runtime of every algorithm."""
+    print(f"Summary for {graph_type}:")
+    print(f"{'params':>22} {'algorithm':>18} {'makespan':>12} {'runtime (s)':>12}")
+    for params in param_sets:
+        for alg_name, metrics in results.items():
+            makespans = metrics[str(params)]["makespan"]
+            runtimes = metrics[str(params)]["runtime"]
+            if not makespans:
+                continue
+            print(
+                f"{str(params):>22} {alg_name:>18} {sum(makespans) / len(makespans):>12.2f} {sum(runtimes) / len(runtimes):>12.4f}"
+            )
+
+
+def summarize_profiles(sweep_results):
+    """Prints the per-phase breakdown of every algorithm over a whole sweep.
+
+    ``sweep_results`` lists ``benchmark_algorithms_with_params`` results
+    collected with ``profile=True``.
+    """
+    profiles = {}
+    for results in sweep_results:
+        for alg_name, metrics in results.items():
+            runs = profiles.setdefault(alg_name, [])
+            for param_metrics in metrics.values():
+                runs.extend(param_metrics["profile"])
+    print_profile_table(profiles)
+
+
+def compare_centrality_methods(dag, cores, methods=CENTRALITY_METHODS, k=64):
+    """Runs HEFT* with each centrality method and reports time and makespan change.
+
+    The makespan difference is relative to exact betweenness centrality.
+    """
+    dag = compile_dag(dag)
+    rows = []
+    for method in ("exact",) + tuple(m for m in methods if m != "exact"):
+        start = time.perf_counter()
+        _, makespan, _ = heft_star_schedule(
+            dag, cores, centrality=method, centrality_k=k
+        )
+        rows.append((method, time.perf_counter() - start, makespan))
+
+    exact_makespan = rows[0][2]
+    print(f"{'centrality':>12} {'time (s)':>10} {'makespan':>12} {'vs exact':>10}")
+    for method, runtime, makespan in rows:
+        print(
+            f"{method:>12} {runtime:>10.4f} {makespan:>12.2f} {makespan - exact_makespan:>+10.2f}"
+        )
+    return rows
+
+
+def plot_comparison_per_network(graph_type, results, param_sets, output=None):
+    import matplotlib.pyplot as plt
+
+    from src.benchmark.plotter import finish_figure
+
     fig, axes = plt.subplots(2, len(param_sets), figsize=(15, 8), sharey="row")
 
     for i, params in enumerate(param_sets):
         for alg_name, metrics in results.items():
-            axes[0, i].plot(
-                graph_sizes, metrics[str(params)]["makespan"], label=f"{alg_name}"
-            )
-            axes[1, i].plot(
-                graph_sizes, metrics[str(params)]["utilization"], label=f"{alg_name}"
-            )
+            # Sizes are recorded per run, so skipped cells leave no gaps.
+            runs = metrics[str(params)]
+            axes[0, i].plot(runs["size"], runs["makespan"], label=f"{alg_name}")
+            axes[1, i].plot(runs["size"], runs["utilization"], label=f"{alg_name}")
 
         axes[0, i].set_title(f"{graph_type.upper()} (Params: {params})")
         axes[0, i].set_xlabel("Graph Size (Nodes)")
@@ -72,12 +232,16 @@ def plot_comparison_per_network(graph_type, graph_sizes, results, param_sets):
     axes[0, 0].legend()
     axes[1, 0].legend()
     plt.tight_layout()
-    plt.show()
+    finish_figure(fig, output)
 
 
 def plot_comparison_per_algorithm(
-    graph_sizes, results, param_sets, algorithms, network_models
+    results, param_sets, algorithms, network_models, output=None
 ):
+    import matplotlib.pyplot as plt
+
+    from src.benchmark.plotter import finish_figure
+
     fig, axes = plt.subplots(2, len(algorithms), figsize=(15, 8), sharey="row")
 
     for i, alg_name in enumerate(algorithms):
@@ -89,16 +253,17 @@ def plot_comparison_per_algorithm(
                     and alg_name in results[graph_type]
                     and param_str in results[graph_type][alg_name]
                 ):
+                    runs = results[graph_type][alg_name][param_str]
                     axes[0, i].plot(
-                        graph_sizes[graph_type],
-                        results[graph_type][alg_name][param_str]["makespan"],
+                        runs["size"],
+                        runs["makespan"],
                         label=f"{graph_type} (Params: {params})",
                         linestyle="-",
                         marker="o",
                     )
                     axes[1, i].plot(
-                        graph_sizes[graph_type],
-                        results[graph_type][alg_name][param_str]["utilization"],
+                        runs["size"],
+                        runs["utilization"],
                         label=f"{graph_type} (Params: {params})",
                         linestyle="--",
                         marker="x",
@@ -116,28 +281,31 @@ def plot_comparison_per_algorithm(
     axes[0, 0].legend()
     axes[1, 0].legend()
     plt.tight_layout()
-    plt.show()
+    finish_figure(fig, output)
+
+
+def plot_average_per_network(results, algorithms, network_models, output=None):
+    import matplotlib.pyplot as plt
 
+    from src.benchmark.plotter import finish_figure
 
-def plot_average_per_network(graph_sizes, results, algorithms, network_models):
-    fig, axes = plt.subplots(2, 3, figsize=(15, 10))
+    fig, axes = plt.subplots(2, len(algorithms), figsize=(5 * len(algorithms), 10))
 
     for row, metric in enumerate(["makespan", "utilization"]):
         for col, alg_name in enumerate(algorithms):
             for graph_type in network_models:
-                avg_metric = {size: 0 for size in graph_sizes[graph_type]}
-                count = 0
-
-                for param_str, metrics in results[graph_type][alg_name].items():
-                    count += 1
-                    for i, size in enumerate(graph_sizes[graph_type]):
-                        avg_metric[size] += metrics[metric][i]
-
-                avg_metric = {size: value / count for size, value in avg_metric.items()}
+                # Average each size over the parameter sets that ran it.
+                totals = {}
+                counts = {}
+                for metrics in results[graph_type][alg_name].values():
+                    for size, value in zip(metrics["size"], metrics[metric]):
+                        totals[size] = totals.get(size, 0) + value
+                        counts[size] = counts.get(size, 0) + 1
 
+                sizes = sorted(totals)
                 axes[row, col].plot(
-                    graph_sizes[graph_type],
-                    list(avg_metric.values()),
+                    sizes,
+                    [totals[size] / counts[size] for size in sizes],
                     label=f"{graph_type}",
                     marker="o",
                 )
@@ -152,4 +320,4 @@ def plot_average_per_network(graph_sizes, results, algorithms, network_models):
             axes[row, col].legend()
 
     plt.tight_layout()
-    plt.show()
+    finish_figure(fig, output)
@@ -0,0 +1,270 @@
+import heapq
+import time
+from bisect import bisect_left
+from collections.abc import Mapping
+
+import numpy as np
+
+from src.utils.compiled_dag import compile_dag
+
+READY_POLICIES = ("edf", "fifo")
+
+# Decision latencies are counted into log-spaced bins (20 per decade from
+# 100 ns to 10 s), so percentiles need constant memory however long the
+# stream runs.
+LATENCY_BINS = np.geomspace(1e-7, 10, 141).tolist()
+
+
+class OnlineScheduler:
+    """Schedules tasks as they arrive, without knowing the rest of the DAG.
+
+    Each arrival is
+    ``(task, preds, weight, deadline, release, num_successors, exec_time)``;
+    only the first two are required. ``preds`` is an iterable of task labels
+    or a ``{label: communication cost}`` mapping. ``exec_time`` is the task's
+    row of a ``CostModel``, its execution time on every resource; without
+    it, the task takes ``weight`` divided by the resource speed. A task
+    becomes ready once all its predecessors are placed, and ready tasks are
+    placed from a heap ordered by deadline (``policy="edf"``) or arrival
+    (``policy="fifo"``), each on the resource where it finishes first, as in
+    HEFT.
+
+    A placed task is kept only until ``num_successors`` of its successors
+    have been placed, so scheduling state stays bounded by the tasks in
+    flight; a task that arrives without ``num_successors`` is kept for the
+    whole stream. Only the labels of dropped tasks are remembered, so that a
+    task arriving twice, or naming an evicted task as a predecessor, is
+    rejected with a ``ValueError`` instead of waiting forever.
+    """
+
+    def __init__(self, resources, policy="edf"):
+        if policy not in READY_POLICIES:
+            raise ValueError(f"Unsupported ready queue policy: {policy}")
+        self.resources = resources
+        self.policy = policy
+        # label: [resource, finish time, successors still to be placed]
+        self.placed = {}
+        # labels of placed tasks no longer held in ``placed``
+        self.dropped = set()
+        # label: [missing predecessors, arrival number, arrival]
+        self.waiting = {}
+        # label of a missing predecessor: labels of the tasks waiting for it
+        self.blocked = {}
+        self.ready = []
+        self.resource_availability = [0.0] * len(resources)
+        self.active_time = [0.0] * len(resources)
+        self.arrivals = 0
+        self.tasks_placed = 0
+        self.deadline_misses = 0
+        self.evicted = 0
+        self.peak_resident = 0
+        self.busy_time = 0.0
+        self.latency_counts = [0] * (len(LATENCY_BINS) + 1)
+
+    @property
+    def resident(self):
+        """Number of tasks the scheduler currently holds state for."""
+        return len(self.placed) + len(self.waiting) + len(self.ready)
+
+    def submit(
+        self,
+        task,
+        preds=(),
+        weight=1,
+        deadline=None,
+        release=0.0,
+        num_successors=None,
+        exec_time=None,
+    ):
+        """Accepts one arrival; returns the ``(task, resource, start, end)`` placements it enabled."""
+        start = time.perf_counter()
+        if task in self.placed or task in self.waiting or task in self.dropped:
+            raise ValueError(f"Task {task} has already arrived.")
+        if not isinstance(preds, Mapping):
+            preds = dict.fromkeys(preds, 0.0)
+        for pred in preds:
+            if pred in self.dropped:
+                raise ValueError(
+                    f"Task {task} names evicted task {pred} as a predecessor."
+                )
+        if exec_time is not None and len(exec_time) != len(self.resources):
+            raise ValueError(
+                f"Task {task} has {len(exec_time)} execution times for "
+                f"{len(self.resources)} resources."
+            )
+        arrival = (preds, weight, deadline, release, num_successors, exec_time)
+        missing = [pred for pred in preds if pred not in self.placed]
+        if missing:
+            self.waiting[task] = [len(missing), self.arrivals, arrival]
+            for pred in missing:
+                self.blocked.setdefault(pred, []).append(task)
+        else:
+            self._push(task, self.arrivals, arrival)
+        self.arrivals += 1
+
+        placements = self._dispatch()
+        self.peak_resident = max(self.peak_resident, self.resident)
+        elapsed = time.perf_counter() - start
+        self.busy_time += elapsed
+        self.latency_counts[bisect_left(LATENCY_BINS, elapsed)] += 1
+        return placements
+
+    def _push(self, task, number, arrival):
+        deadline = arrival[2]
+        if self.policy == "edf" and deadline is not None:
+            key = deadline
+        else:
+            key = float("inf")
+        # Arrival numbers are unique, so ties never fall through to labels
+        # and equal keys leave the heap in arrival order.
+        heapq.heappush(self.ready, (key, number, task, arrival))
+
+    def _dispatch(self):
+        placements = []
+        while self.ready:
+            _, _, task, arrival = heapq.heappop(self.ready)
+            placements.append(self._place(task, *arrival))
+            for successor in self.blocked.pop(task, ()):
+                entry = self.waiting[successor]
+                entry[0] -= 1
+                if entry[0] == 0:
+                    del self.waiting[successor]
+                    self._push(successor, entry[1], entry[2])
+        return placements
+
+    def _place(self, task, preds, weight, deadline, release, num_successors, exec_time):
+        placed = self.placed
+        if exec_time is None:
+            exec_time = [weight / resource["speed"] for resource in self.resources]
+        best_time = float("inf")
+        best_resource = None
+        for resource_id, task_time in enumerate(exec_time):
+            est = max(self.resource_availability[resource_id], release)
+            for pred, cost in preds.items():
+                pred_resource, pred_end_time, _ = placed[pred]
+                if pred_resource != resource_id:
+                    pred_end_time += cost
+                est = max(est, pred_end_time)
+            eft = est + task_time
+            if eft < best_time:
+                best_time = eft
+                best_resource = resource_id
+
+        exec_time = exec_time[best_resource]
+        self.resource_availability[best_resource] = best_time
+        self.active_time[best_resource] += exec_time
+        self.tasks_placed += 1
+        if deadline is not None and best_time > deadline:
+            self.deadline_misses += 1
+
+        for pred in preds:
+            entry = placed[pred]
+            if entry[2] is not None:
+                entry[2] -= 1
+                if entry[2] <= 0:
+                    del placed[pred]
+                    self.dropped.add(pred)
+                    self.evicted += 1
+        if num_successors != 0:
+            placed[task] = [best_resource, best_time, num_successors]
+        else:
+            self.dropped.add(task)
+        return task, best_resource, best_time - exec_time, best_time
+
+    def run(self, events):
+        """Feeds an iterable of arrival tuples or dicts; yields placements as they are made."""
+        for event in events:
+            if isinstance(event, Mapping):
+                yield from self.submit(**event)
+            else:
+                yield from self.submit(*event)
+
+    async def run_async(self, queue, on_placement=None):
+        """Consumes arrivals from an ``asyncio.Queue`` until it yields ``None``.
+
+        Every placement is passed to ``on_placement``, if given; returns
+        ``stats()`` at the end of the stream.
+        """
+        while True:
+            event = await queue.get()
+            try:
+                if event is None:
+                    break
+                if isinstance(event, Mapping):
+                    placements = self.submit(**event)
+                else:
+                    placements = self.submit(*event)
+                if on_placement is not None:
+                    for placement in placements:
+                        on_placement(*placement)
+            finally:
+                queue.task_done()
+        return self.stats()
+
+    def latency_percentile(self, q):
+        """Upper bound of the ``q``-th percentile of the decision latency, in seconds."""
+        total = sum(self.latency_counts)
+        if total == 0:
+            return 0.0
+        target = q / 100 * total
+        seen = 0
+        for i, count in enumerate(self.latency_counts):
+            seen += count
+            if seen >= target:
+                return LATENCY_BINS[min(i, len(LATENCY_BINS) - 1)]
+        return LATENCY_BINS[-1]
+
+    def stats(self):
+        makespan = max(self.resource_availability)
+        return {
+            "arrivals": self.arrivals,
+            "tasks_placed": self.tasks_placed,
+            "waiting": len(self.waiting),
+            "throughput": (
+                self.tasks_placed / self.busy_time if self.busy_time > 0 else 0.0
+            ),
+            "latency_p50": self.latency_percentile(50),
+            "latency_p99": self.latency_percentile(99),
+            "makespan": makespan,
+            "utilization": {
+                resource_id: active / makespan if makespan > 0 else 0.0
+                for resource_id, active in enumerate(self.active_time)
+            },
+            "deadline_misses": self.deadline_misses,
+            "evicted": self.evicted,
+            "peak_resident": self.peak_resident,
+        }
+
+
+def dag_events(dag, deadlines=None, cost_model=None):
+    """Turns a DAG into an arrival stream in topological order.
+
+    Every arrival carries its successor count, so the scheduler can evict
+    tasks as soon as they are no longer needed. ``deadlines`` maps task
+    labels to deadlines. With the ``CostModel`` ``cost_model``, every
+    arrival also carries its row of execution times.
+    """
+    dag = compile_dag(dag)
+    labels = dag.labels
+    weight = dag.weight.tolist()
+    pred_ptr = dag.pred_ptr.tolist()
+    pred_idx = dag.pred_idx.tolist()
+    pred_weight = dag.pred_weight.tolist()
+    out_degree = np.diff(dag.succ_ptr).tolist()
+    deadlines = deadlines or {}
+    exec_times = None if cost_model is None else cost_model.exec_time.tolist()
+    for task in dag.topo_order.tolist():
+        preds = {
+            labels[pred_idx[e]]: pred_weight[e]
+            for e in range(pred_ptr[task], pred_ptr[task + 1])
+        }
+        label = labels[task]
+        yield (
+            label,
+            preds,
+            weight[task],
+            deadlines.get(label),
+            0.0,
+            out_degree[task],
+            None if exec_times is None else exec_times[task],
+        )
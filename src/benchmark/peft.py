@@ -0,0 +1,281 @@
+import heapq
+import time
+
+import numpy as np
+
+from src.benchmark.cost_model import resolve_cost_model
+from src.benchmark.profiler import phase_timer
+from src.benchmark.ranks import calculate_bottom_level, level_batches
+from src.utils.compiled_dag import compile_dag
+
+
+def optimistic_cost_table(dag, cost_model):
+    """Computes PEFT's optimistic cost table as a tasks × resources array.
+
+    ``OCT[t, p]`` is the longest path from ``t`` to an exit task when ``t``
+    runs on ``p`` and every later task runs on its best resource:
+    ``max over successors s of min over q of (OCT[s, q] + w(s, q) + c(t, s))``,
+    where the edge weight ``c(t, s)`` is only paid when ``q != p``. Tasks
+    are processed one level batch at a time.
+    """
+    dag = compile_dag(dag)
+    exec_time = cost_model.exec_time
+    table = np.zeros_like(exec_time)
+    if not dag.num_edges:
+        return table
+
+    order, bounds = level_batches(dag)
+    batch_of = np.empty(dag.num_tasks, dtype=np.int64)
+    batch_of[order] = np.repeat(np.arange(len(bounds) - 1), np.diff(bounds))
+    edge_src = np.repeat(np.arange(dag.num_tasks), np.diff(dag.succ_ptr))
+    # Edges grouped by the batch of their source; within a batch they stay
+    # in CSR order, so each source's edges are contiguous.
+    edge_order = np.argsort(batch_of[edge_src], kind="stable")
+    edge_bounds = np.searchsorted(
+        batch_of[edge_src][edge_order], np.arange(len(bounds))
+    ).tolist()
+
+    for first, last in zip(edge_bounds, edge_bounds[1:]):
+        if first == last:
+            continue
+        edges = edge_order[first:last]
+        succ = dag.succ_idx[edges]
+        costs = table[succ] + exec_time[succ]
+        remote = costs.min(axis=1) + dag.succ_weight[edges]
+        values = np.minimum(costs, remote[:, None])
+        src = edge_src[edges]
+        starts = np.flatnonzero(np.r_[True, src[1:] != src[:-1]])
+        table[src[starts]] = np.maximum.reduceat(values, starts, axis=0)
+    return table
+
+
+def _data_ready_times(
+    task, num_resources, pred_ptr, pred_idx, pred_weight, allocation, finish
+):
+    """Returns when the data of ``task``'s placed predecessors is on each resource."""
+    local = {}
+    remote = {}
+    for e in range(pred_ptr[task], pred_ptr[task + 1]):
+        pred = pred_idx[e]
+        resource_id = allocation[pred]
+        if resource_id is None:
+            continue
+        finish_time = finish[pred]
+        if finish_time > local.get(resource_id, 0):
+            local[resource_id] = finish_time
+        finish_time += pred_weight[e]
+        if finish_time > remote.get(resource_id, 0):
+            remote[resource_id] = finish_time
+    latest_resource, latest, second = None, 0, 0
+    for resource_id, finish_time in remote.items():
+        if finish_time > latest:
+            latest_resource, latest, second = resource_id, finish_time, latest
+        elif finish_time > second:
+            second = finish_time
+    return [
+        max(
+            local.get(resource_id, 0),
+            second if resource_id == latest_resource else latest,
+        )
+        for resource_id in range(num_resources)
+    ]
+
+
+def _finish(schedule, resource_availability, trace, resources):
+    makespan = max(resource_availability)
+    utilization = {}
+    for resource_id, tasks in schedule.items():
+        active_time = sum(end - start for _, start, end in tasks)
+        utilization[resource_id] = active_time / makespan if makespan > 0 else 0.0
+    if trace is not None:
+        trace.finish(makespan, utilization, resources)
+    return schedule, makespan, utilization
+
+
+def peft_schedule(dag, resources, cost_model=None, trace=None, profiler=None):
+    """Schedules ``dag`` with PEFT (Predict Earliest Finish Time).
+
+    Ready tasks are taken in decreasing order of their mean optimistic cost
+    and placed on the resource minimizing the earliest finish time plus the
+    task's optimistic cost there, so a resource that is fast now but far
+    from the task's successors is avoided.
+    """
+    phase = phase_timer(profiler)
+    with phase("compile"):
+        dag = compile_dag(dag)
+    if trace is not None:
+        trace.start("PEFT", dag)
+    tracing = trace is not None and trace.per_task
+    labels = dag.labels
+    with phase("cost_model"):
+        cost_model = resolve_cost_model(dag, resources, cost_model)
+        exec_times = cost_model.exec_time.tolist()
+    pred_ptr = dag.pred_ptr.tolist()
+    pred_idx = dag.pred_idx.tolist()
+    pred_weight = dag.pred_weight.tolist()
+    succ_ptr = dag.succ_ptr.tolist()
+    succ_idx = dag.succ_idx.tolist()
+
+    with phase("oct"):
+        table = optimistic_cost_table(dag, cost_model)
+        rank = table.mean(axis=1).tolist()
+        table = table.tolist()
+
+    num_resources = len(resources)
+    schedule = {resource: [] for resource in range(num_resources)}
+    resource_availability = [0] * num_resources
+    task_allocation = [None] * dag.num_tasks
+    task_finish_times = [None] * dag.num_tasks
+    missing = np.diff(dag.pred_ptr).tolist()
+    ready = [(-rank[task], task) for task in range(dag.num_tasks) if not missing[task]]
+    heapq.heapify(ready)
+
+    placement_start = time.perf_counter()
+    while ready:
+        _, task = heapq.heappop(ready)
+        data_ready = _data_ready_times(
+            task,
+            num_resources,
+            pred_ptr,
+            pred_idx,
+            pred_weight,
+            task_allocation,
+            task_finish_times,
+        )
+        exec_row = exec_times[task]
+        oct_row = table[task]
+        best_cost = float("inf")
+        best_resource = None
+        best_time = None
+        for resource_id in range(num_resources):
+            eft = (
+                max(resource_availability[resource_id], data_ready[resource_id])
+                + exec_row[resource_id]
+            )
+            if eft + oct_row[resource_id] < best_cost:
+                best_cost = eft + oct_row[resource_id]
+                best_resource = resource_id
+                best_time = eft
+
+        start_time = best_time - exec_row[best_resource]
+        schedule[best_resource].append((labels[task], start_time, best_time))
+        task_allocation[task] = best_resource
+        task_finish_times[task] = best_time
+        resource_availability[best_resource] = best_time
+        if tracing:
+            trace.record(task, best_resource, start_time, best_time)
+
+        for child in succ_idx[succ_ptr[task] : succ_ptr[task + 1]]:
+            missing[child] -= 1
+            if not missing[child]:
+                heapq.heappush(ready, (-rank[child], child))
+
+    if profiler is not None:
+        profiler.add("placement", time.perf_counter() - placement_start)
+    return _finish(schedule, resource_availability, trace, resources)
+
+
+def lookahead_heft_schedule(
+    dag, resources, beam_width=2, cost_model=None, trace=None, profiler=None
+):
+    """Schedules ``dag`` with HEFT and one level of bounded lookahead.
+
+    Tasks are taken in HEFT's bottom-level order. Instead of the resource
+    with the earliest finish time, each task goes to whichever of its
+    ``beam_width`` earliest-finishing resources lets its ``beam_width``
+    highest-ranked children finish soonest, each child estimated by its
+    best finish time plus optimistic cost over all resources, given only
+    this task's placement. Ties go to the earlier finish time; with
+    ``beam_width=1`` this is plain HEFT. The extra work per task is
+    bounded by ``beam_width ** 2`` times the number of resources.
+    """
+    if beam_width < 1:
+        raise ValueError(f"Beam width must be at least 1, beam_width = {beam_width}")
+    phase = phase_timer(profiler)
+    with phase("compile"):
+        dag = compile_dag(dag)
+    if trace is not None:
+        trace.start(f"Lookahead HEFT (beam {beam_width})", dag)
+    tracing = trace is not None and trace.per_task
+    labels = dag.labels
+    with phase("cost_model"):
+        cost_model = resolve_cost_model(dag, resources, cost_model)
+        exec_time = cost_model.exec_time
+        exec_times = exec_time.tolist()
+    pred_ptr = dag.pred_ptr.tolist()
+    pred_idx = dag.pred_idx.tolist()
+    pred_weight = dag.pred_weight.tolist()
+    succ_ptr = dag.succ_ptr.tolist()
+
+    with phase("bottom_level"):
+        bottom_level = calculate_bottom_level(dag, costs=cost_model.rank_cost)
+    with phase("oct"):
+        table = optimistic_cost_table(dag, cost_model)
+    with phase("priority_sort"):
+        bottom_levels = bottom_level.tolist()
+        tasks = sorted(
+            range(dag.num_tasks), key=lambda node: bottom_levels[node], reverse=True
+        )
+
+    num_resources = len(resources)
+    resource_ids = np.arange(num_resources)
+    schedule = {resource: [] for resource in range(num_resources)}
+    resource_availability = [0] * num_resources
+    task_allocation = [None] * dag.num_tasks
+    task_finish_times = [None] * dag.num_tasks
+
+    placement_start = time.perf_counter()
+    for task in tasks:
+        data_ready = _data_ready_times(
+            task,
+            num_resources,
+            pred_ptr,
+            pred_idx,
+            pred_weight,
+            task_allocation,
+            task_finish_times,
+        )
+        exec_row = exec_times[task]
+        efts = [
+            max(resource_availability[resource_id], data_ready[resource_id])
+            + exec_row[resource_id]
+            for resource_id in range(num_resources)
+        ]
+        candidates = sorted(range(num_resources), key=efts.__getitem__)[:beam_width]
+        best_resource = candidates[0]
+
+        first, last = succ_ptr[task], succ_ptr[task + 1]
+        if len(candidates) > 1 and first < last:
+            children = dag.succ_idx[first:last]
+            child_weight = dag.succ_weight[first:last]
+            if len(children) > beam_width:
+                keep = np.argsort(-bottom_level[children], kind="stable")[:beam_width]
+                children, child_weight = children[keep], child_weight[keep]
+            candidates = np.array(candidates)
+            finish = np.array(efts)[candidates]
+            # Resource availability after placing the task on each candidate.
+            availability = np.tile(resource_availability, (len(candidates), 1))
+            availability[np.arange(len(candidates)), candidates] = finish
+            arrival = finish[:, None, None] + child_weight[None, :, None] * (
+                resource_ids[None, None, :] != candidates[:, None, None]
+            )
+            child_cost = (
+                np.maximum(availability[:, None, :], arrival)
+                + exec_time[children][None]
+                + table[children][None]
+            )
+            score = child_cost.min(axis=2).max(axis=1)
+            best_resource = int(candidates[np.lexsort((finish, score))[0]])
+
+        best_time = efts[best_resource]
+        start_time = best_time - exec_row[best_resource]
+        schedule[best_resource].append((labels[task], start_time, best_time))
+        task_allocation[task] = best_resource
+        task_finish_times[task] = best_time
+        resource_availability[best_resource] = best_time
+        if tracing:
+            trace.record(task, best_resource, start_time, best_time)
+
+    if profiler is not None:
+        profiler.add("placement", time.perf_counter() - placement_start)
+    return _finish(schedule, resource_availability, trace, resources)
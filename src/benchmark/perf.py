@@ -0,0 +1,410 @@
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import networkx as nx
+import numpy as np
+
+from src.benchmark.dict_schedulers import SCHEDULERS as DICT_SCHEDULERS
+from src.benchmark.edf import edf_schedule
+from src.benchmark.heft import heft_schedule
+from src.benchmark.heft_star import heft_star_schedule
+from src.benchmark.online import OnlineScheduler, dag_events
+from src.benchmark.ranks import calculate_bottom_level
+from src.generation.dag_generator import GRAPH_TYPES, generate_dag
+from src.generation.graph_annotator import ANNOTATION_CONFIG, annotate_graph
+from src.utils.compiled_dag import compile_dag, load_compiled_dag, save_compiled_dag
+from src.utils.constants import (
+    DEFAULT_BASELINE,
+    DEFAULT_STARTUP_BUDGET_MS,
+    DEFAULT_THRESHOLD,
+    SUITE_RESOURCES,
+    SUITE_SEED,
+    SUITE_SIZES,
+)
+from src.utils.dag_cache import CACHE_DIR, load_or_build
+
+
+def time_call(func, *args, repeat=3, **kwargs):
+    """Returns the best wall time of ``repeat`` calls, with scheduler output muted."""
+    best = float("inf")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func(*args, **kwargs)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+def benchmark_compiled_dag(
+    graph_type,
+    graph_sizes,
+    params,
+    resources,
+    algorithms,
+    seed=None,
+    annotation_config=None,
+    baselines=DICT_SCHEDULERS,
+):
+    """Times every algorithm against the dict-based scheduler it replaced.
+
+    ``baselines`` maps algorithm names to the frozen dict-based schedulers
+    of ``dict_schedulers``, which walk the networkx graph. Each algorithm is
+    timed on that graph, which includes compiling it, and on its
+    precompiled form; the speedup is the baseline's time over the latter.
+    """
+    print(
+        f"{'size':>8} {'algorithm':>10} {'dict (s)':>10} {'networkx (s)':>14} {'compiled (s)':>14} {'speedup':>8}"
+    )
+    for size in graph_sizes:
+        dag = generate_dag(graph_type, size, params, seed, annotation_config)
+        dag = dag.to_networkx()
+        compile_time = time_call(compile_dag, dag)
+        compiled = compile_dag(dag)
+        for alg_name, alg_func in algorithms.items():
+            graph_time = time_call(alg_func, dag, resources)
+            compiled_time = time_call(alg_func, compiled, resources)
+            if alg_name in baselines:
+                dict_time = time_call(baselines[alg_name], dag, resources)
+                dict_column = f"{dict_time:>10.4f}"
+                speedup = f"{dict_time / compiled_time:>7.2f}x"
+            else:
+                dict_column = f"{'-':>10}"
+                speedup = f"{'-':>8}"
+            print(
+                f"{size:>8} {alg_name:>10} {dict_column} {graph_time:>14.4f} {compiled_time:>14.4f} {speedup}"
+            )
+        print(f"{size:>8} {'compile':>10} {'':>10} {compile_time:>14.4f}")
+
+
+EFT_RESOURCE_COUNTS = (4, 8, 16, 32, 64, 128, 256)
+
+
+def benchmark_eft_kernels(
+    graph_type,
+    graph_sizes,
+    params,
+    resource_counts=EFT_RESOURCE_COUNTS,
+    seed=None,
+    annotation_config=None,
+):
+    """Times HEFT with the scalar and the vector EFT kernel for growing resource counts.
+
+    Resource speeds cycle through 0.5, 1.0, 1.5 and 2.0. Both kernels must
+    produce the same schedule.
+    """
+    print(
+        f"{'size':>8} {'resources':>10} {'scalar (s)':>12} {'vector (s)':>12} {'speedup':>8}"
+    )
+    for size in graph_sizes:
+        dag = generate_dag(graph_type, size, params, seed, annotation_config)
+        for count in resource_counts:
+            resources = [
+                {"speed": speed}
+                for speed in np.resize([0.5, 1.0, 1.5, 2.0], count).tolist()
+            ]
+            if heft_schedule(dag, resources, kernel="scalar") != heft_schedule(
+                dag, resources, kernel="vector"
+            ):
+                raise RuntimeError(
+                    f"EFT kernels disagree on {size} tasks and {count} resources."
+                )
+            scalar_time = time_call(
+                heft_schedule, dag, resources, kernel="scalar", repeat=1
+            )
+            vector_time = time_call(
+                heft_schedule, dag, resources, kernel="vector", repeat=1
+            )
+            print(
+                f"{size:>8} {count:>10} {scalar_time:>12.4f} {vector_time:>12.4f} {scalar_time / vector_time:>7.2f}x"
+            )
+
+
+def benchmark_online(
+    graph_type, graph_sizes, params, resources, seed=None, annotation_config=None
+):
+    """Streams every DAG through an ``OnlineScheduler`` in topological order.
+
+    Prints the scheduler throughput, its median and 99th percentile decision
+    latency and the largest number of tasks it held at once.
+    """
+    print(
+        f"{'size':>8} {'tasks/s':>12} {'p50 (us)':>10} {'p99 (us)':>10} {'peak tasks':>11} {'makespan':>10}"
+    )
+    for size in graph_sizes:
+        dag = generate_dag(graph_type, size, params, seed, annotation_config)
+        scheduler = OnlineScheduler(resources)
+        for _ in scheduler.run(dag_events(dag)):
+            pass
+        stats = scheduler.stats()
+        print(
+            f"{size:>8} {stats['throughput']:>12.0f} {stats['latency_p50'] * 1e6:>10.1f} "
+            f"{stats['latency_p99'] * 1e6:>10.1f} {stats['peak_resident']:>11} {stats['makespan']:>10.2f}"
+        )
+
+
+def suite_params(graph_type, n):
+    """Model parameters of the suite DAGs, keeping about ``n`` to ``4n`` edges."""
+    if graph_type == "barabasi_albert":
+        return {"m": 3}
+    if graph_type == "watts_strogatz":
+        return {"k": 6, "p": 0.1}
+    if graph_type == "erdos_renyi":
+        return {"p": min(1.0, 8 / n)}
+    if graph_type == "fork_join":
+        return {"width": 8}
+    if graph_type == "layer_by_layer":
+        layers = max(2, int(n**0.5))
+        return {"layers": layers, "p": min(1.0, 8 / n * layers / (layers - 1))}
+    raise ValueError(f"Unknown graph type: {graph_type}")
+
+
+def _write_dagz(dag, directory):
+    save_compiled_dag(dag, os.path.join(directory, "dag.dagz"))
+
+
+def _read_dagz(dag, directory):
+    load_compiled_dag(os.path.join(directory, "dag.dagz"), mmap=False)
+
+
+def _write_gml(dag, directory):
+    nx.write_gml(dag, os.path.join(directory, "dag.gml"))
+
+
+def _read_gml(dag, directory):
+    nx.read_gml(os.path.join(directory, "dag.gml"))
+
+
+# name: (function, input form, largest size). The input is the compiled DAG,
+# its networkx form, or either plus a scratch directory for the I/O cases.
+SUITE_CASES = {
+    "edf_schedule": (
+        lambda dag: edf_schedule(dag, SUITE_RESOURCES),
+        "compiled",
+        1_000_000,
+    ),
+    "heft_schedule": (
+        lambda dag: heft_schedule(dag, SUITE_RESOURCES),
+        "compiled",
+        1_000_000,
+    ),
+    "heft_star_schedule": (
+        lambda dag: heft_star_schedule(dag, SUITE_RESOURCES, centrality="path_count"),
+        "compiled",
+        100_000,
+    ),
+    "calculate_bottom_level": (calculate_bottom_level, "compiled", 1_000_000),
+    "annotate_graph": (
+        lambda dag: annotate_graph(dag, seed=SUITE_SEED),
+        "networkx",
+        1_000_000,
+    ),
+    "write_dagz": (_write_dagz, "compiled+dir", 1_000_000),
+    "read_dagz": (_read_dagz, "compiled+dir", 1_000_000),
+    "write_gml": (_write_gml, "networkx+dir", 10_000),
+    "read_gml": (_read_gml, "networkx+dir", 10_000),
+}
+
+_CASE_SETUP = {"read_dagz": _write_dagz, "read_gml": _write_gml}
+
+
+def _time_runs(func, args, repeat, min_sample=0.05):
+    """Times ``repeat`` samples after one untimed warm-up call.
+
+    Fast cases are called several times per sample so that every sample
+    lasts at least ``min_sample`` seconds; sample times are per call.
+    """
+    times = []
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        func(*args)
+        warmup = time.perf_counter() - start
+        number = max(1, int(min_sample / warmup)) if warmup > 0 else 1
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func(*args)
+            times.append((time.perf_counter() - start) / number)
+    return times
+
+
+def run_perf_suite(
+    graph_types=GRAPH_TYPES,
+    sizes=SUITE_SIZES,
+    cases=None,
+    repeat=3,
+    cache_dir=CACHE_DIR,
+):
+    """Times every suite case on fixed seeded DAGs of each model and size.
+
+    Returns ``{"case|graph_type|size": {"min": ..., "median": ..., "repeat": ...}}``
+    with times in seconds. Cases are skipped above their largest size.
+    """
+    cases = list(SUITE_CASES) if cases is None else cases
+    results = {}
+    print(
+        f"{'case':>24} {'graph type':>16} {'size':>9} {'min (s)':>10} {'median (s)':>11}"
+    )
+    for graph_type in graph_types:
+        for size in sizes:
+            selected = [name for name in cases if size <= SUITE_CASES[name][2]]
+            if not selected:
+                continue
+            params = suite_params(graph_type, size)
+
+            def build():
+                return generate_dag(graph_type, size, params, SUITE_SEED)
+
+            if cache_dir is None:
+                dag = build()
+            else:
+                dag = load_or_build(
+                    graph_type,
+                    size,
+                    params,
+                    SUITE_SEED,
+                    ANNOTATION_CONFIG,
+                    build,
+                    cache_dir,
+                )
+            graph = None
+            with tempfile.TemporaryDirectory() as directory:
+                for name in selected:
+                    func, form, _ = SUITE_CASES[name]
+                    if form.startswith("networkx"):
+                        if graph is None:
+                            graph = dag.to_networkx()
+                        args = [graph]
+                    else:
+                        args = [dag]
+                    if form.endswith("+dir"):
+                        args.append(directory)
+                    if name in _CASE_SETUP:
+                        _CASE_SETUP[name](*args)
+                    times = _time_runs(func, args, repeat)
+                    key = f"{name}|{graph_type}|{size}"
+                    results[key] = {
+                        "min": min(times),
+                        "median": statistics.median(times),
+                        "repeat": repeat,
+                    }
+                    print(
+                        f"{name:>24} {graph_type:>16} {size:>9} {min(times):>10.4f} {statistics.median(times):>11.4f}"
+                    )
+    return results
+
+
+def save_baseline(results, path=DEFAULT_BASELINE):
+    """Writes suite results with the interpreter and library versions they ran on."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    baseline = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "networkx": nx.__version__,
+            "machine": platform.machine(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(path, "w") as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+    print(f"Baseline saved to {path}")
+
+
+def compare_to_baseline(results, path=DEFAULT_BASELINE, threshold=DEFAULT_THRESHOLD):
+    """Compares best times against a saved baseline.
+
+    A case regresses when its best time exceeds the baseline's by more than
+    ``threshold`` (a fraction). Cases missing from the baseline are reported
+    but never fail. Returns the keys of the regressed cases.
+    """
+    with open(path) as file:
+        baseline = json.load(file)["results"]
+    regressions = []
+    print(f"{'case':>48} {'baseline (s)':>13} {'current (s)':>12} {'ratio':>7}")
+    for key, current in results.items():
+        if key not in baseline:
+            print(f"{key:>48} {'-':>13} {current['min']:>12.4f} {'new':>7}")
+            continue
+        ratio = current["min"] / baseline[key]["min"]
+        status = ""
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            status = "  REGRESSION"
+        print(
+            f"{key:>48} {baseline[key]['min']:>13.4f} {current['min']:>12.4f} {ratio:>6.2f}x{status}"
+        )
+    print(
+        f"{len(regressions)} of {len(results)} cases regressed by more than {threshold:.0%}."
+    )
+    return regressions
+
+
+CLI_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "cli",
+    "cli.py",
+)
+STARTUP_COMMANDS = (("--help",), ("download", "--help"), ("cache", "list"))
+
+
+def import_times(argv, repeat=3):
+    """Runs the CLI with ``argv`` under ``python -X importtime``.
+
+    Returns the total import time in seconds and ``{module: seconds}`` for
+    the top-level imports, both from the fastest of ``repeat`` runs.
+    """
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", CLI_PATH, *argv],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        total = 0
+        modules = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:"):
+                continue
+            own, cumulative, name = line[len("import time:") :].split("|")
+            if not own.strip().isdigit():
+                continue  # the column header
+            total += int(own) / 1e6
+            if not name[1:].startswith(" "):
+                modules[name.strip()] = int(cumulative) / 1e6
+        if best is None or total < best[0]:
+            best = (total, modules)
+    return best
+
+
+def benchmark_startup(
+    commands=STARTUP_COMMANDS, budget_ms=DEFAULT_STARTUP_BUDGET_MS, repeat=3, top=5
+):
+    """Checks the CLI's import time against a budget.
+
+    Prints the total import time of every command and its slowest top-level
+    imports. Returns the commands whose import time exceeds ``budget_ms``.
+    """
+    over_budget = []
+    for argv in commands:
+        command = " ".join(argv)
+        total, modules = import_times(argv, repeat)
+        status = ""
+        if total * 1000 > budget_ms:
+            over_budget.append(command)
+            status = "  OVER BUDGET"
+        print(f"{command:>24} {total * 1000:>9.1f} ms{status}")
+        for name, seconds in sorted(modules.items(), key=lambda item: -item[1])[:top]:
+            print(f"{'':>24} {seconds * 1000:>9.1f} ms  {name}")
+    print(
+        f"{len(over_budget)} of {len(commands)} commands took longer than {budget_ms:g} ms to import."
+    )
+    return over_budget
@@ -1,128 +1,136 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import numpy as np
 
+PLOTS_DIR = os.getcwd() + "/results/plots"
+FRAME_COLUMNS = [
+    "Graph Type",
+    "Params",
+    "Algorithm",
+    "Size",
+    "Makespan",
+    "Utilization",
+    "GANG Percentage",
+    "Runtime",
+]
+
+
+def results_frame(results, param_sets):
+    """Flattens sweep results into one tidy DataFrame with a row per scheduler run.
+
+    ``results`` maps each graph type to its ``benchmark_algorithms_with_params``
+    results. Graph types, params and algorithms keep their sweep order, so
+    every plot built from the frame lists them in that order.
+    """
+    rows = []
+    for graph_type, graph_results in results.items():
+        for alg_name, metrics_by_params in graph_results.items():
+            for params in param_sets[graph_type]:
+                metrics = metrics_by_params.get(str(params))
+                if metrics is None:
+                    continue
+                for row in zip(
+                    metrics["size"],
+                    metrics["makespan"],
+                    metrics["utilization"],
+                    metrics["gang_percentage"],
+                    metrics["runtime"],
+                ):
+                    rows.append([graph_type, str(params), alg_name, *row])
+    return pd.DataFrame(rows, columns=FRAME_COLUMNS)
+
+
+def _per_params_means(frame, columns):
+    """Averages ``columns`` over the sizes of each (graph type, algorithm, params)."""
+    return (
+        frame.groupby(["Graph Type", "Algorithm", "Params"], sort=False)[columns]
+        .mean()
+        .reset_index()
+    )
+
 
-def plot_makespan_comparison(graph_sizes, results, param_sets):
-    plt.figure(figsize=(10, 6))
+def _ordered_pivot(frame, values):
+    """Pivots per-params means into a graph type × algorithm table in sweep order."""
+    table = _per_params_means(frame, values).pivot_table(
+        index="Graph Type", columns="Algorithm", values=values, aggfunc="mean"
+    )
+    return table.reindex(
+        index=frame["Graph Type"].unique(), columns=frame["Algorithm"].unique()
+    )
 
-    all_data = []
 
-    for graph_type in graph_sizes:
-        for alg_name in results[graph_type]:
-            for params in param_sets[graph_type]:
-                param_str = str(params)
-                if param_str in results[graph_type][alg_name]:
-                    makespan_values = results[graph_type][alg_name][param_str][
-                        "makespan"
-                    ]
-                    for value in makespan_values:
-                        all_data.append([graph_type, alg_name, value])
+def finish_figure(fig, output=None):
+    """Shows ``fig``, or saves it to the file ``output`` and closes it."""
+    if output is None:
+        plt.show()
+        return
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    fig.savefig(output, dpi=150, bbox_inches="tight")
+    plt.close(fig)
+
 
-    df = pd.DataFrame(all_data, columns=["Graph Type", "Algorithm", "Makespan"])
-    sns.boxplot(x="Graph Type", y="Makespan", hue="Algorithm", data=df)
+def plot_makespan_comparison(frame, output=None):
+    fig = plt.figure(figsize=(10, 6))
+
+    sns.boxplot(x="Graph Type", y="Makespan", hue="Algorithm", data=frame)
 
     plt.xlabel("Graph Type")
     plt.ylabel("Makespan")
     plt.title("Makespan Comparison Across Algorithms")
     plt.legend()
     plt.grid()
-    plt.show()
-
+    finish_figure(fig, output)
 
-def plot_utilization_comparison(graph_sizes, results, param_sets):
-    plt.figure(figsize=(10, 6))
 
-    all_data = []
+def plot_utilization_comparison(frame, output=None):
+    fig = plt.figure(figsize=(10, 6))
 
-    for graph_type in graph_sizes:
-        for alg_name in results[graph_type]:
-            for params in param_sets[graph_type]:
-                param_str = str(params)
-                if param_str in results[graph_type][alg_name]:
-                    utilization_values = results[graph_type][alg_name][param_str][
-                        "utilization"
-                    ]
-                    avg_utilization = sum(utilization_values) / len(utilization_values)
-                    all_data.append([graph_type, alg_name, avg_utilization])
-
-    df = pd.DataFrame(all_data, columns=["Graph Type", "Algorithm", "Utilization"])
-    pivot_table = df.pivot_table(
-        index="Graph Type", columns="Algorithm", values="Utilization", aggfunc="mean"
+    sns.heatmap(
+        _ordered_pivot(frame, "Utilization"), annot=True, cmap="coolwarm", fmt=".2f"
     )
 
-    sns.heatmap(pivot_table, annot=True, cmap="coolwarm", fmt=".2f")
-
     plt.xlabel("Algorithm")
     plt.ylabel("Graph Type")
     plt.title("Resource Utilization Heatmap")
-    plt.show()
+    finish_figure(fig, output)
 
 
-def plot_gang_task_percentage(graph_sizes, results, param_sets):
-    plt.figure(figsize=(10, 6))
+def plot_gang_task_percentage(frame, output=None):
+    fig = plt.figure(figsize=(10, 6))
 
-    gang_data = {alg: [] for alg in ["EDF", "HEFT", "HEFT*"]}
-
-    for graph_type in graph_sizes:
-        for alg_name in results[graph_type]:
-            avg_gang = []
-            for params in param_sets[graph_type]:
-                param_str = str(params)
-                if param_str in results[graph_type][alg_name]:
-                    gang_values = results[graph_type][alg_name][param_str][
-                        "gang_percentage"
-                    ]
-                    avg_gang.append(sum(gang_values) / len(gang_values))
-            if avg_gang:
-                gang_data[alg_name].append(sum(avg_gang) / len(avg_gang))
-
-    labels = list(graph_sizes.keys())
+    gang_data = _ordered_pivot(frame, "GANG Percentage")
+    labels = list(gang_data.index)
+    algorithms = list(gang_data.columns)
     x = np.arange(len(labels))
+    width = 0.9 / len(algorithms)
 
-    plt.bar(x, gang_data["EDF"], width=0.3, label="EDF", alpha=0.7)
-    plt.bar(x + 0.3, gang_data["HEFT"], width=0.3, label="HEFT", alpha=0.7)
-    plt.bar(x + 0.6, gang_data["HEFT*"], width=0.3, label="HEFT*", alpha=0.7)
+    for i, alg_name in enumerate(algorithms):
+        plt.bar(
+            x + i * width, gang_data[alg_name], width=width, label=alg_name, alpha=0.7
+        )
 
-    plt.xticks(x + 0.3, labels)
+    plt.xticks(x + width * (len(algorithms) - 1) / 2, labels)
     plt.xlabel("Graph Type")
     plt.ylabel("Percentage of GANG Tasks")
     plt.title("GANG Task Distribution Across Algorithms")
     plt.legend()
-    plt.show()
-
+    finish_figure(fig, output)
 
-def plot_gang_impact_on_makespan(graph_sizes, results, param_sets):
-    plt.figure(figsize=(10, 6))
 
-    all_data = []
+def plot_gang_impact_on_makespan(frame, output=None):
+    means = _per_params_means(frame, ["GANG Percentage", "Makespan"])
 
-    for graph_type in graph_sizes:
-        for alg_name in results[graph_type]:
-            for params in param_sets[graph_type]:
-                param_str = str(params)
-                if param_str in results[graph_type][alg_name]:
-                    gang_values = results[graph_type][alg_name][param_str][
-                        "gang_percentage"
-                    ]
-                    makespan_values = results[graph_type][alg_name][param_str][
-                        "makespan"
-                    ]
-
-                    if gang_values and makespan_values:
-                        avg_gang_percentage = sum(gang_values) / len(gang_values)
-                        avg_makespan = sum(makespan_values) / len(makespan_values)
-                        all_data.append([alg_name, avg_gang_percentage, avg_makespan])
-
-    df = pd.DataFrame(all_data, columns=["Algorithm", "GANG Percentage", "Makespan"])
-
-    sns.lmplot(
+    grid = sns.lmplot(
         x="GANG Percentage",
         y="Makespan",
         hue="Algorithm",
-        data=df,
-        markers=["o", "s", "D"],
+        data=means,
+        markers=["o", "s", "D", "^", "v", "P"][: means["Algorithm"].nunique()],
         height=6,
         aspect=1.2,
     )
@@ -130,109 +138,87 @@ def plot_gang_impact_on_makespan(graph_sizes, results, param_sets):
     plt.xlabel("Percentage of GANG Tasks")
     plt.ylabel("Makespan")
     plt.title("Impact of GANG Tasks on Makespan (Regression)")
-    plt.show()
-
+    finish_figure(grid.figure, output)
 
-def plot_scheduling_efficiency(graph_sizes, results, param_sets):
-    plt.figure(figsize=(10, 6))
 
-    all_data = []
+def plot_scheduling_efficiency(frame, output=None):
+    fig = plt.figure(figsize=(10, 6))
 
-    for graph_type in graph_sizes:
-        for alg_name in results[graph_type]:
-            for params in param_sets[graph_type]:
-                param_str = str(params)
-                if param_str in results[graph_type][alg_name]:
-                    makespan_values = results[graph_type][alg_name][param_str][
-                        "makespan"
-                    ]
-                    avg_makespan = sum(makespan_values) / len(makespan_values)
-                    all_data.append([graph_type, alg_name, avg_makespan])
-
-    df = pd.DataFrame(all_data, columns=["Graph Type", "Algorithm", "Makespan"])
-
-    pivot_table = df.pivot_table(
-        index="Graph Type", columns="Algorithm", values="Makespan", aggfunc="mean"
+    sns.heatmap(
+        _ordered_pivot(frame, "Makespan"), annot=True, cmap="coolwarm", fmt=".2f"
     )
 
-    sns.heatmap(pivot_table, annot=True, cmap="coolwarm", fmt=".2f")
-
     plt.xlabel("Algorithm")
     plt.ylabel("Graph Type")
     plt.title("Scheduling Efficiency Across DAG Models")
-    plt.show()
-
-
-import seaborn as sns
-import pandas as pd
-import matplotlib.pyplot as plt
+    finish_figure(fig, output)
 
 
-def plot_core_utilization_distribution(graph_sizes, results, param_sets):
-    plt.figure(figsize=(10, 6))
+def plot_core_utilization_distribution(frame, output=None):
+    fig = plt.figure(figsize=(10, 6))
 
-    all_data = []
-
-    for graph_type in graph_sizes:
-        for alg_name in results[graph_type]:
-            for params in param_sets[graph_type]:
-                param_str = str(params)
-                if param_str in results[graph_type][alg_name]:
-                    utilization_values = results[graph_type][alg_name][param_str][
-                        "utilization"
-                    ]
-                    for value in utilization_values:
-                        all_data.append([graph_type, alg_name, value])
-
-    df = pd.DataFrame(all_data, columns=["Graph Type", "Algorithm", "Utilization"])
-
-    sns.boxplot(x="Algorithm", y="Utilization", hue="Graph Type", data=df)
+    sns.boxplot(x="Algorithm", y="Utilization", hue="Graph Type", data=frame)
 
     plt.xlabel("Algorithm")
     plt.ylabel("Core Utilization")
     plt.title("Core Utilization Across Algorithms")
     plt.legend()
-    plt.show()
+    finish_figure(fig, output)
 
 
-def plot_topology_influence_on_scheduling(graph_sizes, results, param_sets):
+def plot_topology_influence_on_scheduling(frame, graph_sizes, output=None):
     fig = plt.figure(figsize=(10, 7))
     ax = fig.add_subplot(111, projection="3d")
 
-    x_data, y_data, z_data = [], [], []
+    means = _per_params_means(frame, "Makespan")
+    algorithms = list(frame["Algorithm"].unique())
     algorithm_mapping = {
-        "EDF": 0,
-        "HEFT": 1,
-        "HEFT*": 2,
+        alg_name: i for i, alg_name in enumerate(algorithms)
     }  # Convert algorithm names to numeric values
 
-    for graph_type in graph_sizes:
-        for alg_name in results[graph_type]:
-            for params in param_sets[graph_type]:
-                param_str = str(params)
-                if param_str in results[graph_type][alg_name]:
-                    makespan_values = results[graph_type][alg_name][param_str][
-                        "makespan"
-                    ]
-                    avg_makespan = sum(makespan_values) / len(makespan_values)
-
-                    # Convert graph complexity (e.g., edges/nodes ratio) to a numerical feature
-                    complexity = len(graph_sizes[graph_type]) / max(
-                        graph_sizes[graph_type]
-                    )
-
-                    x_data.append(complexity)
-                    y_data.append(
-                        algorithm_mapping[alg_name]
-                    )  # Convert algorithm name to a number
-                    z_data.append(avg_makespan)
+    # Convert graph complexity (e.g., edges/nodes ratio) to a numerical feature
+    complexity = {
+        graph_type: len(sizes) / max(sizes) for graph_type, sizes in graph_sizes.items()
+    }
+    x_data = means["Graph Type"].map(complexity)
+    y_data = means["Algorithm"].map(algorithm_mapping)
+    z_data = means["Makespan"]
 
     scatter = ax.scatter(x_data, y_data, z_data, c=z_data, cmap="coolwarm")
 
     ax.set_xlabel("Graph Complexity")
-    ax.set_ylabel("Algorithm (0=EDF, 1=HEFT, 2=HEFT*)")
+    ax.set_ylabel("Algorithm")
+    ax.set_yticks(list(algorithm_mapping.values()))
+    ax.set_yticklabels(algorithms)
     ax.set_zlabel("Makespan")
     ax.set_title("Network Topology Influence on Scheduling")
 
     fig.colorbar(scatter, ax=ax, label="Makespan")
-    plt.show()
+    finish_figure(fig, output)
+
+
+def _render(job):
+    plot, args, output = job
+    matplotlib.use("Agg")
+    plot(*args, output=output)
+    return output
+
+
+def render_plots(plots, output_dir=PLOTS_DIR, workers=None):
+    """Renders plots to PNG files with the non-interactive Agg backend.
+
+    ``plots`` maps file names (without extension) to ``(plot, args)``, where
+    ``plot`` is a module-level plotting function taking an ``output`` path.
+    Figures are drawn in ``workers`` processes (one per CPU by default), or
+    in this process with ``workers=1``. Returns the written paths.
+    """
+    matplotlib.use("Agg")
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = [
+        (plot, args, os.path.join(output_dir, f"{name}.png"))
+        for name, (plot, args) in plots.items()
+    ]
+    if workers == 1:
+        return [_render(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_render, jobs))
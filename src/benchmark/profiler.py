@@ -0,0 +1,105 @@
+import contextlib
+import time
+import tracemalloc
+
+
+class SchedulerProfile:
+    """Wall time and call count per phase of a scheduler run, plus peak memory.
+
+    Schedulers accept a profile as ``profiler`` and time their phases with
+    ``phase(name)``; phases run inside a loop are accumulated with ``add``.
+    """
+
+    def __init__(self):
+        self.phases = {}
+        self.total_time = None
+        self.peak_memory = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds, calls=1):
+        entry = self.phases.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += calls
+
+    def to_dict(self):
+        return {
+            "phases": {
+                name: {"time": seconds, "calls": calls}
+                for name, (seconds, calls) in self.phases.items()
+            },
+            "total_time": self.total_time,
+            "peak_memory": self.peak_memory,
+        }
+
+
+def _untimed(name):
+    return contextlib.nullcontext()
+
+
+def phase_timer(profiler):
+    """Returns ``profiler.phase``, or a no-op context factory without a profiler."""
+    return _untimed if profiler is None else profiler.phase
+
+
+def profile_schedule(alg_func, dag, resources, memory=True, **kwargs):
+    """Runs a scheduler with a ``SchedulerProfile``.
+
+    Returns ``(schedule, makespan, utilization, profile)``. With ``memory``
+    the peak memory traced by ``tracemalloc`` during the run is recorded
+    too, which slows allocation-heavy phases down.
+    """
+    profile = SchedulerProfile()
+    was_tracing = tracemalloc.is_tracing()
+    if memory:
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+    start = time.perf_counter()
+    try:
+        schedule, makespan, utilization = alg_func(
+            dag, resources, profiler=profile, **kwargs
+        )
+    finally:
+        profile.total_time = time.perf_counter() - start
+        if memory:
+            profile.peak_memory = tracemalloc.get_traced_memory()[1]
+            if not was_tracing:
+                tracemalloc.stop()
+    return schedule, makespan, utilization, profile
+
+
+def print_profile_table(profiles):
+    """Prints the per-phase breakdown of ``{algorithm: [profile dict, ...]}``.
+
+    Times and calls are summed over all runs of an algorithm; the share is
+    relative to their total time and the memory column is the largest peak.
+    """
+    print(
+        f"{'algorithm':>18} {'phase':>16} {'time (s)':>10} {'share':>7} {'calls':>9} {'peak (MB)':>10}"
+    )
+    for alg_name, runs in profiles.items():
+        if not runs:
+            continue
+        total = sum(run["total_time"] for run in runs)
+        phases = {}
+        for run in runs:
+            for name, entry in run["phases"].items():
+                seconds, calls = phases.get(name, (0.0, 0))
+                phases[name] = (seconds + entry["time"], calls + entry["calls"])
+        peaks = [run["peak_memory"] for run in runs if run["peak_memory"] is not None]
+        peak = f"{max(peaks) / 1024**2:>10.2f}" if peaks else f"{'-':>10}"
+        for name, (seconds, calls) in phases.items():
+            share = seconds / total if total > 0 else 0.0
+            print(
+                f"{alg_name:>18} {name:>16} {seconds:>10.4f} {share:>7.1%} {calls:>9} {peak}"
+            )
+        print(
+            f"{alg_name:>18} {'total':>16} {total:>10.4f} {1:>7.1%} {len(runs):>9} {peak}"
+        )
@@ -0,0 +1,218 @@
+import numpy as np
+
+from src.utils.compiled_dag import compile_dag
+
+# Batches smaller than this are cheaper to walk in Python than to vectorize;
+# long chains (e.g. Watts-Strogatz DAGs) consist almost entirely of them.
+MIN_VECTOR_BATCH = 32
+
+
+def level_batches(dag):
+    """Splits the reverse topological order into batches with no internal edges.
+
+    Returns ``(order, bounds)``: batch ``i`` is ``order[bounds[i]:bounds[i + 1]]``.
+    Every successor of a task lies in an earlier batch, so batches can be
+    processed one array operation at a time, back to front for bottom levels
+    and front to back for top levels.
+    """
+    dag = compile_dag(dag)
+    order = dag.topo_order[::-1]
+    position = np.empty(dag.num_tasks, dtype=np.int64)
+    position[order] = np.arange(dag.num_tasks)
+
+    # Latest reverse-order position among each task's successors (-1 for sinks).
+    latest = np.full(dag.num_tasks, -1, dtype=np.int64)
+    out_degree = np.diff(dag.succ_ptr)
+    has_succ = out_degree > 0
+    if dag.num_edges:
+        latest[has_succ] = np.maximum.reduceat(
+            position[dag.succ_idx], dag.succ_ptr[:-1][has_succ]
+        )
+
+    bounds = [0]
+    start = 0
+    for i, successor_position in enumerate(latest[order].tolist()):
+        if successor_position >= start:
+            start = i
+            bounds.append(i)
+    bounds.append(dag.num_tasks)
+    return order, bounds
+
+
+def _gather_segments(ptr, nodes):
+    """Returns the CSR entry positions of ``nodes``, their counts and segment offsets."""
+    starts = ptr[nodes]
+    counts = ptr[nodes + 1] - starts
+    offsets = np.cumsum(counts) - counts
+    positions = np.repeat(starts - offsets, counts) + np.arange(counts.sum())
+    return positions, counts, offsets
+
+
+def _runs(bounds, batches):
+    """Merges consecutive small batches into runs walked in a single Python loop."""
+    run = None
+    for b in batches:
+        first, last = bounds[b], bounds[b + 1]
+        if last - first >= MIN_VECTOR_BATCH:
+            if run is not None:
+                yield run[0], run[1], False
+                run = None
+            yield first, last, True
+        elif run is None:
+            run = [first, last]
+        else:
+            run = [min(run[0], first), max(run[1], last)]
+    if run is not None:
+        yield run[0], run[1], False
+
+
+def _sweep(
+    costs, ptr, idx, edge_weight, order, bounds, batches, forward, reduce=np.maximum
+):
+    """Propagates levels over the CSR neighbour lists ``ptr``/``idx``.
+
+    Backward sweeps (``forward=False``, successor lists) compute
+    ``cost[v] + reduce(level[c] + edge(v, c))``; forward sweeps
+    (``forward=True``, predecessor lists) compute
+    ``reduce(level[p] + cost[p] + edge(p, v))``. With the default
+    ``np.maximum`` these are bottom and top levels.
+    """
+    combine = max if reduce is np.maximum else reduce
+    level = np.zeros(len(costs), dtype=np.float64)
+    ptr_list = ptr.tolist()
+    idx_list = idx.tolist()
+    weight_list = edge_weight.tolist()
+    cost_list = costs.tolist()
+
+    for first, last, vectorize in _runs(bounds, batches):
+        nodes = order[first:last]
+        if not vectorize:
+            if forward:
+                for node in nodes[::-1].tolist():
+                    best = None
+                    for e in range(ptr_list[node], ptr_list[node + 1]):
+                        parent = idx_list[e]
+                        value = level[parent] + cost_list[parent] + weight_list[e]
+                        best = value if best is None else combine(best, value)
+                    level[node] = 0 if best is None else best
+            else:
+                for node in nodes.tolist():
+                    best = None
+                    for e in range(ptr_list[node], ptr_list[node + 1]):
+                        value = level[idx_list[e]] + weight_list[e]
+                        best = value if best is None else combine(best, value)
+                    level[node] = cost_list[node] + (0 if best is None else best)
+            continue
+
+        positions, counts, offsets = _gather_segments(ptr, nodes)
+        base = np.zeros(len(nodes)) if forward else costs[nodes]
+        level[nodes] = base
+        if len(positions):
+            neighbours = idx[positions]
+            if forward:
+                values = level[neighbours] + costs[neighbours] + edge_weight[positions]
+            else:
+                values = level[neighbours] + edge_weight[positions]
+            nonempty = counts > 0
+            level[nodes[nonempty]] = base[nonempty] + reduce.reduceat(
+                values, offsets[nonempty]
+            )
+    return level
+
+
+def _task_costs(dag, resources, costs=None):
+    if costs is not None:
+        return np.asarray(costs, dtype=np.float64)
+    if resources is None:
+        return dag.weight.astype(np.float64)
+    inverse_speeds = 1.0 / np.array([r["speed"] for r in resources], dtype=np.float64)
+    return dag.weight * inverse_speeds.mean()
+
+
+def compute_ranks(dag, resources=None, costs=None):
+    """Computes bottom level, top level and critical-path length without recursion.
+
+    With ``resources``, each task costs its mean execution time over them
+    (HEFT's upward rank); otherwise it costs its ``weight``. ``costs``, an
+    array indexed by task ID, overrides both. Returns
+    ``(bottom_level, top_level, critical_path_length)`` with both levels as
+    arrays indexed by task ID.
+    """
+    dag = compile_dag(dag)
+    costs = _task_costs(dag, resources, costs)
+    order, bounds = level_batches(dag)
+    batches = range(len(bounds) - 1)
+
+    bottom_level = _sweep(
+        costs,
+        dag.succ_ptr,
+        dag.succ_idx,
+        dag.succ_weight,
+        order,
+        bounds,
+        batches,
+        False,
+    )
+    top_level = _sweep(
+        costs,
+        dag.pred_ptr,
+        dag.pred_idx,
+        dag.pred_weight,
+        order,
+        bounds,
+        reversed(batches),
+        True,
+    )
+    critical_path_length = float(bottom_level.max()) if dag.num_tasks else 0.0
+    return bottom_level, top_level, critical_path_length
+
+
+def calculate_bottom_level(dag, resources=None, costs=None):
+    """Returns the bottom level of every task as an array indexed by task ID."""
+    dag = compile_dag(dag)
+    order, bounds = level_batches(dag)
+    return _sweep(
+        _task_costs(dag, resources, costs),
+        dag.succ_ptr,
+        dag.succ_idx,
+        dag.succ_weight,
+        order,
+        bounds,
+        range(len(bounds) - 1),
+        False,
+    )
+
+
+def path_counts(dag):
+    """Counts source-to-task and task-to-sink paths with two topological sweeps.
+
+    Counts grow exponentially with depth, so both are returned as natural
+    logarithms, as arrays indexed by task ID.
+    """
+    dag = compile_dag(dag)
+    zeros = np.zeros(dag.num_tasks)
+    order, bounds = level_batches(dag)
+    batches = range(len(bounds) - 1)
+    paths_from = _sweep(
+        zeros,
+        dag.succ_ptr,
+        dag.succ_idx,
+        np.zeros(dag.num_edges),
+        order,
+        bounds,
+        batches,
+        False,
+        np.logaddexp,
+    )
+    paths_to = _sweep(
+        zeros,
+        dag.pred_ptr,
+        dag.pred_idx,
+        np.zeros(dag.num_edges),
+        order,
+        bounds,
+        reversed(batches),
+        True,
+        np.logaddexp,
+    )
+    return paths_to, paths_from
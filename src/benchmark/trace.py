@@ -0,0 +1,109 @@
+import json
+
+import numpy as np
+
+from src.utils.constants import TRACE_LEVELS
+
+# One event per (task, resource) a task occupies; GANG tasks emit one per core.
+EVENT_DTYPE = np.dtype(
+    [
+        ("task", np.int64),
+        ("resource", np.int64),
+        ("start", np.float64),
+        ("end", np.float64),
+    ]
+)
+
+
+class SchedulerTrace:
+    """Collects what schedulers report about a run, at one of ``TRACE_LEVELS``.
+
+    ``summary`` prints the makespan, per-resource utilization and the number
+    of tasks that could not be placed at the end of each run. ``task`` also
+    records every placement into a preallocated event buffer, with the same
+    schema for every algorithm, which ``dump`` writes as NDJSON or Parquet,
+    and names every task that could not be placed. ``off`` prints nothing.
+
+    A trace can be passed to several runs; each ``start`` begins a new run.
+    """
+
+    def __init__(self, level="summary"):
+        if level not in TRACE_LEVELS:
+            raise ValueError(f"Unsupported trace level: {level}")
+        self.level = level
+        self.per_task = level == "task"
+        self.runs = []
+        self._events = None
+        self._count = 0
+
+    def start(self, algorithm, dag):
+        """Begins a run of ``algorithm`` on the compiled ``dag``."""
+        self._close_run()
+        self.runs.append({"algorithm": algorithm, "labels": dag.labels, "unplaced": 0})
+        if self.per_task:
+            self._events = np.empty(dag.num_tasks, dtype=EVENT_DTYPE)
+            self._count = 0
+
+    def record(self, task, resource, start, end):
+        if self._count == len(self._events):
+            self._events = np.resize(self._events, max(2 * self._count, 16))
+        self._events[self._count] = (task, resource, start, end)
+        self._count += 1
+
+    def unplaced(self, label):
+        """Counts a task the scheduler could not place."""
+        self.runs[-1]["unplaced"] += 1
+        if self.per_task:
+            print(
+                f"Task {label} could not be scheduled due to lack of available cores."
+            )
+
+    def finish(self, makespan, utilization, resources=None):
+        """Ends the current run, printing its summary unless tracing is off."""
+        run = self.runs[-1]
+        run["makespan"] = makespan
+        run["utilization"] = utilization
+        self._close_run()
+        if self.level == "off":
+            return
+        print(f"{run['algorithm']} makespan: {makespan:.2f}")
+        for resource_id, util in utilization.items():
+            speed = f" (Speed {resources[resource_id]['speed']})" if resources else ""
+            print(f"Resource {resource_id}{speed} utilization: {util:.2%}")
+        if run["unplaced"]:
+            print(f"{run['unplaced']} tasks could not be scheduled.")
+
+    def _close_run(self):
+        if self.per_task and self.runs and "events" not in self.runs[-1]:
+            self.runs[-1]["events"] = self._events[: self._count]
+
+    def events(self):
+        """Yields every recorded event as a dict, labelled with its run's algorithm."""
+        self._close_run()
+        for run in self.runs:
+            labels = run["labels"]
+            events = run.get("events", np.empty(0, dtype=EVENT_DTYPE))
+            for task, resource, start, end in events.tolist():
+                yield {
+                    "algorithm": run["algorithm"],
+                    "task": labels[task],
+                    "resource": resource,
+                    "start": start,
+                    "end": end,
+                }
+
+    def dump(self, path):
+        """Writes the recorded events to ``path``: Parquet for ``.parquet``, else NDJSON."""
+        if path.endswith(".parquet"):
+            try:
+                import pandas as pd
+            except ImportError as e:
+                raise ImportError("Writing Parquet traces requires pandas.") from e
+            pd.DataFrame(
+                list(self.events()),
+                columns=["algorithm", "task", "resource", "start", "end"],
+            ).to_parquet(path, index=False)
+            return
+        with open(path, "w") as file:
+            for event in self.events():
+                file.write(json.dumps(event) + "\n")
@@ -0,0 +1,218 @@
+import numpy as np
+
+from src.generation.graph_annotator import annotate_arrays
+from src.utils.compiled_dag import CompiledDAG
+from src.utils.constants import GRAPH_TYPES
+
+
+def _pair_index_to_edges(positions):
+    """Maps indices into the pairs ``(i, j)``, ``i < j``, ordered by ``j`` then ``i``."""
+    positions = np.asarray(positions, dtype=np.int64)
+    j = ((1 + np.sqrt(1 + 8 * positions.astype(np.float64))) // 2).astype(np.int64)
+    # Correct the rare off-by-one of the floating-point square root.
+    j -= j * (j - 1) // 2 > positions
+    j += (j + 1) * j // 2 <= positions
+    i = positions - j * (j - 1) // 2
+    return i, j
+
+
+def _sample_pairs(rng, n, p):
+    """Picks every pair ``i < j`` of ``n`` nodes independently with probability ``p``.
+
+    Gaps between picked pairs are geometric, so only the picked pairs are
+    ever drawn: the cost is O(n + m) instead of O(n^2).
+    """
+    num_pairs = n * (n - 1) // 2
+    if p <= 0 or num_pairs == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    if p >= 1:
+        return _pair_index_to_edges(np.arange(num_pairs))
+
+    expected = p * num_pairs
+    batch = int(expected + 5 * np.sqrt(expected)) + 16
+    chunks = []
+    last = -1
+    while last < num_pairs:
+        positions = last + np.cumsum(rng.geometric(p, batch))
+        last = int(positions[-1])
+        chunks.append(positions[positions < num_pairs])
+    return _pair_index_to_edges(np.concatenate(chunks))
+
+
+def _barabasi_albert_edges(rng, n, m):
+    """Preferential attachment as in ``nx.barabasi_albert_graph``.
+
+    Starting from the star graph 0 - (1..m), every new node is linked to
+    ``m`` distinct nodes drawn uniformly from a list holding each node once
+    per incident edge. The uniform draws are made in bulk.
+    """
+    if m < 1 or m >= n:
+        raise ValueError(
+            f"Barabási–Albert network must have m >= 1 and m < n, m = {m}, n = {n}"
+        )
+    repeated = [0] * m + list(range(1, m + 1))
+    src = [0] * m
+    draws = []
+    for source in range(m + 1, n):
+        targets = set()
+        while len(targets) < m:
+            if not draws:
+                draws = rng.random(m * (n - source) + 16).tolist()
+            targets.add(repeated[int(draws.pop() * len(repeated))])
+        src.extend(targets)
+        repeated.extend(targets)
+        repeated.extend([source] * m)
+
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.concatenate(
+        [np.arange(1, m + 1), np.repeat(np.arange(m + 1, n, dtype=np.int64), m)]
+    )
+    return src, dst
+
+
+def _watts_strogatz_edges(rng, n, k, p):
+    """Ring lattice rewiring as in ``nx.watts_strogatz_graph``.
+
+    Only the edges chosen for rewiring are visited in Python, in the same
+    order as networkx; lattice membership is computed arithmetically.
+    """
+    if k > n:
+        raise ValueError("k>n, choose smaller k or larger n")
+    if k == n:
+        return _sample_pairs(rng, n, 1.0)
+
+    half = k // 2
+    nodes = np.arange(n, dtype=np.int64)
+    u = np.tile(nodes, half)
+    v = (u + np.repeat(np.arange(1, half + 1), n)) % n
+    lattice = np.unique(np.minimum(u, v) * n + np.maximum(u, v))
+    degree = np.bincount(
+        np.concatenate([lattice // n, lattice % n]), minlength=n
+    ).tolist()
+
+    def in_lattice(a, b):
+        distance = (b - a) % n
+        return 0 < distance <= half or 0 < n - distance <= half
+
+    removed, added = set(), set()
+
+    def has_edge(a, b):
+        key = min(a, b) * n + max(a, b)
+        return key in added or (in_lattice(a, b) and key not in removed)
+
+    rewired = np.flatnonzero(rng.random(len(u)) < p)
+    buffer = []
+
+    def draw():
+        if not buffer:
+            buffer.extend(rng.integers(0, n, 2 * len(rewired) + 16).tolist()[::-1])
+        return buffer.pop()
+
+    for e in rewired.tolist():
+        a, b = int(u[e]), int(v[e])
+        w = draw()
+        skip = False
+        while w == a or has_edge(a, w):
+            w = draw()
+            if degree[a] >= n - 1:
+                skip = True
+                break
+        if skip:
+            continue
+        removed.add(min(a, b) * n + max(a, b))
+        added.add(min(a, w) * n + max(a, w))
+        degree[b] -= 1
+        degree[w] += 1
+
+    keys = np.setdiff1d(lattice, np.fromiter(removed, np.int64, len(removed)))
+    keys = np.union1d(keys, np.fromiter(added, np.int64, len(added)))
+    return keys // n, keys % n
+
+
+def _fork_join_edges(n, width):
+    """Chains fork-join stages: a fork task, ``width`` parallel tasks, a join task.
+
+    Each join task is the fork task of the next stage; the last stage is cut
+    short when ``n`` runs out.
+    """
+    if width < 1:
+        raise ValueError(f"Fork-join width must be at least 1, width = {width}")
+    src, dst = [], []
+    fork = 0
+    while fork < n - 1:
+        tasks = range(fork + 1, min(fork + width + 1, n))
+        join = fork + width + 1
+        for task in tasks:
+            src.append(fork)
+            dst.append(task)
+            if join < n:
+                src.append(task)
+                dst.append(join)
+        fork = join
+    return np.asarray(src, dtype=np.int64), np.asarray(dst, dtype=np.int64)
+
+
+def _layer_by_layer_edges(rng, n, layers, p):
+    """Spreads nodes over ``layers`` random layers in order.
+
+    Each pair of nodes in different layers is linked, from the lower layer
+    to the higher one, with probability ``p``.
+    """
+    if layers < 1:
+        raise ValueError(f"Number of layers must be at least 1, layers = {layers}")
+    layer = np.sort(rng.integers(0, layers, n))
+    src, dst = _sample_pairs(rng, n, p)
+    keep = layer[src] < layer[dst]
+    return src[keep], dst[keep]
+
+
+def generate_dag_edges(graph_type="barabasi_albert", n=100, params=None, seed=None):
+    """Returns the ``(src, dst)`` edge arrays of a random DAG, with ``src < dst``.
+
+    For the Barabási-Albert, Watts-Strogatz and Erdős-Rényi models this is
+    the undirected networkx model of the same name with every edge oriented
+    from the smaller node to the larger one, as ``convert_to_dag`` does,
+    without building either graph.
+    """
+    params = params or {}
+    rng = np.random.default_rng(seed)
+    if graph_type == "barabasi_albert":
+        return _barabasi_albert_edges(rng, n, params.get("m", 3))
+    elif graph_type == "watts_strogatz":
+        return _watts_strogatz_edges(rng, n, params.get("k", 4), params.get("p", 0.1))
+    elif graph_type == "erdos_renyi":
+        return _sample_pairs(rng, n, params.get("p", 0.1))
+    elif graph_type == "fork_join":
+        return _fork_join_edges(n, params.get("width", 4))
+    elif graph_type == "layer_by_layer":
+        return _layer_by_layer_edges(
+            rng, n, params.get("layers", 5), params.get("p", 0.5)
+        )
+    raise ValueError(f"Unknown graph type: {graph_type}")
+
+
+def generate_dag(
+    graph_type="barabasi_albert", n=100, params=None, seed=None, annotation_config=None
+):
+    """Generates and annotates a random DAG straight into a ``CompiledDAG``.
+
+    Like ``convert_to_dag``, nodes without edges are left out; the rest keep
+    their node numbers as labels.
+    """
+    structure_seed, annotation_seed = np.random.SeedSequence(seed).spawn(2)
+    src, dst = generate_dag_edges(graph_type, n, params, structure_seed)
+    nodes = np.unique(np.concatenate([src, dst]))
+    weight, num_cores, edge_weight = annotate_arrays(
+        len(nodes), len(src), seed=annotation_seed, config=annotation_config
+    )
+    # Edges point from smaller to larger node numbers, so increasing task
+    # IDs are a topological order.
+    return CompiledDAG.from_edges(
+        nodes.tolist(),
+        weight,
+        num_cores,
+        np.searchsorted(nodes, src),
+        np.searchsorted(nodes, dst),
+        edge_weight,
+        topo_order=np.arange(len(nodes)),
+    )
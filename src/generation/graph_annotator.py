@@ -1,11 +1,94 @@
-import random
-
-def annotate_graph(dag):
-    num_cores = [1, 2, 3]
-    weights = [0.7, 0.2, 0.1]
-    for node in dag.nodes():
-        dag.nodes[node]['weight'] = random.randint(1, 10)
-        dag.nodes[node]['num_cores'] = random.choices(num_cores, weights, k=1)[0]
-    for u, v in dag.edges():
-        dag.edges[u, v]['weight'] = random.uniform(0.1, 1.0)
+import numpy as np
+
+from src.utils.constants import DISTRIBUTIONS
+
+# "weight" and "edge_weight" give the [low, high] range of a uniform draw, or
+# the range whose geometric mean is the median of a log-normal draw with
+# shape "*_sigma". With "ccr" set, edge weights are rescaled so that their
+# mean is "ccr" times the mean node weight (communication-to-computation ratio).
+ANNOTATION_CONFIG = {
+    "weight": [1, 10],
+    "weight_distribution": "uniform",
+    "weight_sigma": 0.5,
+    "num_cores": [1, 2, 3],
+    "num_cores_weights": [0.7, 0.2, 0.1],
+    "edge_weight": [0.1, 1.0],
+    "edge_distribution": "uniform",
+    "edge_sigma": 0.5,
+    "ccr": None,
+}
+
+
+def annotation_config(**overrides):
+    """Returns ``ANNOTATION_CONFIG`` with the given keys replaced, ignoring ``None``."""
+    config = dict(ANNOTATION_CONFIG)
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    for key in ("weight_distribution", "edge_distribution"):
+        if config[key] not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution for {key}: {config[key]}")
+    return config
+
+
+def _draw(rng, distribution, low, high, sigma, size):
+    if distribution == "uniform":
+        return rng.uniform(low, high, size)
+    if distribution == "lognormal":
+        return rng.lognormal(np.log(np.sqrt(low * high)), sigma, size)
+    raise ValueError(f"Unknown distribution: {distribution}")
+
+
+def annotate_arrays(num_nodes, num_edges, seed=None, config=None):
+    """Draws node weights, core counts and edge weights in bulk.
+
+    Returns ``(node_weight, node_cores, edge_weight)`` as arrays. Node
+    weights are integers no smaller than the low end of their range.
+    """
+    config = ANNOTATION_CONFIG if config is None else config
+    rng = np.random.default_rng(seed)
+
+    low, high = config["weight"]
+    if config["weight_distribution"] == "uniform":
+        node_weight = rng.integers(low, high, num_nodes, endpoint=True)
+    else:
+        node_weight = _draw(
+            rng,
+            config["weight_distribution"],
+            low,
+            high,
+            config["weight_sigma"],
+            num_nodes,
+        )
+        node_weight = np.maximum(np.rint(node_weight), low).astype(np.int64)
+
+    probabilities = np.asarray(config["num_cores_weights"], dtype=np.float64)
+    node_cores = rng.choice(
+        np.asarray(config["num_cores"], dtype=np.int64),
+        num_nodes,
+        p=probabilities / probabilities.sum(),
+    )
+
+    edge_low, edge_high = config["edge_weight"]
+    edge_weight = _draw(
+        rng,
+        config["edge_distribution"],
+        edge_low,
+        edge_high,
+        config["edge_sigma"],
+        num_edges,
+    )
+    if config["ccr"] is not None and num_edges and num_nodes:
+        edge_weight *= config["ccr"] * node_weight.mean() / edge_weight.mean()
+    return node_weight, node_cores, edge_weight
+
+
+def annotate_graph(dag, seed=None, config=None):
+    node_weight, node_cores, edge_weight = annotate_arrays(
+        dag.number_of_nodes(), dag.number_of_edges(), seed=seed, config=config
+    )
+    nodes = zip(dag.nodes(), node_weight.tolist(), node_cores.tolist())
+    for node, weight, cores in nodes:
+        dag.nodes[node]['weight'] = weight
+        dag.nodes[node]['num_cores'] = cores
+    for (u, v), weight in zip(dag.edges(), edge_weight.tolist()):
+        dag.edges[u, v]['weight'] = weight
     return dag
@@ -0,0 +1,274 @@
+import json
+import struct
+from collections import deque
+
+import networkx as nx
+import numpy as np
+
+
+class CompiledDAG:
+    """Array-backed form of an annotated DAG, built once and shared by schedulers.
+
+    Task ``i`` is the node ``labels[i]`` of the source graph. Predecessors of
+    task ``i`` are ``pred_idx[pred_ptr[i]:pred_ptr[i + 1]]`` with the matching
+    edge weights in ``pred_weight`` over the same slice; successors use the
+    ``succ_*`` arrays the same way. ``topo_order`` lists every task ID in a
+    topological order.
+    """
+
+    def __init__(
+        self,
+        labels,
+        weight,
+        num_cores,
+        pred_ptr,
+        pred_idx,
+        pred_weight,
+        succ_ptr,
+        succ_idx,
+        succ_weight,
+        topo_order,
+    ):
+        self.labels = labels
+        self.weight = weight
+        self.num_cores = num_cores
+        self.pred_ptr = pred_ptr
+        self.pred_idx = pred_idx
+        self.pred_weight = pred_weight
+        self.succ_ptr = succ_ptr
+        self.succ_idx = succ_idx
+        self.succ_weight = succ_weight
+        self.topo_order = topo_order
+        self._index = None
+
+    @classmethod
+    def from_edges(
+        cls, labels, weight, num_cores, src, dst, edge_weight, topo_order=None
+    ):
+        """Builds the CSR arrays from parallel edge arrays of task IDs."""
+        num_tasks = len(weight)
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        edge_weight = np.asarray(edge_weight, dtype=np.float64)
+
+        by_src = np.argsort(src, kind="stable")
+        succ_ptr = np.zeros(num_tasks + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=num_tasks), out=succ_ptr[1:])
+
+        by_dst = np.argsort(dst, kind="stable")
+        pred_ptr = np.zeros(num_tasks + 1, dtype=np.int64)
+        np.cumsum(np.bincount(dst, minlength=num_tasks), out=pred_ptr[1:])
+
+        dag = cls(
+            labels,
+            np.asarray(weight),
+            np.asarray(num_cores, dtype=np.int64),
+            pred_ptr,
+            src[by_dst],
+            edge_weight[by_dst],
+            succ_ptr,
+            dst[by_src],
+            edge_weight[by_src],
+            None,
+        )
+        if topo_order is None:
+            topo_order = dag._topological_order()
+        dag.topo_order = np.asarray(topo_order, dtype=np.int64)
+        return dag
+
+    @property
+    def num_tasks(self):
+        return len(self.weight)
+
+    @property
+    def num_edges(self):
+        return len(self.succ_idx)
+
+    @property
+    def index(self):
+        """Maps each source-graph label to its task ID."""
+        if self._index is None:
+            self._index = {label: i for i, label in enumerate(self.labels)}
+        return self._index
+
+    def predecessors(self, task):
+        lo, hi = self.pred_ptr[task], self.pred_ptr[task + 1]
+        return self.pred_idx[lo:hi], self.pred_weight[lo:hi]
+
+    def successors(self, task):
+        lo, hi = self.succ_ptr[task], self.succ_ptr[task + 1]
+        return self.succ_idx[lo:hi], self.succ_weight[lo:hi]
+
+    def _topological_order(self):
+        in_degree = np.diff(self.pred_ptr).tolist()
+        succ_ptr = self.succ_ptr.tolist()
+        succ_idx = self.succ_idx.tolist()
+        ready = deque(i for i, d in enumerate(in_degree) if d == 0)
+        order = []
+        while ready:
+            task = ready.popleft()
+            order.append(task)
+            for child in succ_idx[succ_ptr[task] : succ_ptr[task + 1]]:
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    ready.append(child)
+        if len(order) != self.num_tasks:
+            raise ValueError("Graph contains a cycle and cannot be compiled.")
+        return order
+
+    def to_networkx(self):
+        """Rebuilds an annotated ``nx.DiGraph`` with the original node and edge order."""
+        dag = nx.DiGraph()
+        weight = self.weight.tolist()
+        num_cores = self.num_cores.tolist()
+        dag.add_nodes_from(
+            (label, {"weight": weight[i], "num_cores": num_cores[i]})
+            for i, label in enumerate(self.labels)
+        )
+        labels = self.labels
+        succ_ptr = self.succ_ptr.tolist()
+        succ_idx = self.succ_idx.tolist()
+        succ_weight = self.succ_weight.tolist()
+        dag.add_edges_from(
+            (labels[u], labels[succ_idx[e]], {"weight": succ_weight[e]})
+            for u in range(self.num_tasks)
+            for e in range(succ_ptr[u], succ_ptr[u + 1])
+        )
+        return dag
+
+
+def compile_dag(dag):
+    """Compiles an annotated ``nx.DiGraph``; compiled DAGs are returned unchanged."""
+    if isinstance(dag, CompiledDAG):
+        return dag
+
+    labels = list(dag.nodes)
+    index = {label: i for i, label in enumerate(labels)}
+    weight = [dag.nodes[label]["weight"] for label in labels]
+    num_cores = [dag.nodes[label].get("num_cores", 1) for label in labels]
+
+    src, dst, edge_weight = [], [], []
+    for u, successors in dag.succ.items():
+        for v, attrs in successors.items():
+            src.append(index[u])
+            dst.append(index[v])
+            edge_weight.append(attrs["weight"])
+
+    topo_order = [index[label] for label in nx.topological_sort(dag)]
+    compiled = CompiledDAG.from_edges(
+        labels, weight, num_cores, src, dst, edge_weight, topo_order
+    )
+    compiled._index = index
+    return compiled
+
+
+MAGIC = b"DAGZ"
+FORMAT_VERSION = 1
+_ALIGNMENT = 64
+_ARRAYS = (
+    "weight",
+    "num_cores",
+    "pred_ptr",
+    "pred_idx",
+    "pred_weight",
+    "succ_ptr",
+    "succ_idx",
+    "succ_weight",
+    "topo_order",
+)
+
+
+def _labels_array(labels):
+    """Returns integer labels as an array, or ``None`` if they are not all ints."""
+    if isinstance(labels, range):
+        return np.arange(labels.start, labels.stop, labels.step, dtype=np.int64)
+    if all(type(label) is int for label in labels):
+        return np.asarray(labels, dtype=np.int64)
+    return None
+
+
+def save_compiled_dag(dag, path, meta=None):
+    """Writes ``dag`` as a header followed by 64-byte aligned raw arrays.
+
+    The file starts with ``MAGIC``, a format version and the length of a JSON
+    header describing the dtype, shape and offset of every array, so it can
+    be loaded without parsing the data. Integer labels are stored as an
+    array; any other labels go into the header.
+    """
+    arrays = {name: np.ascontiguousarray(getattr(dag, name)) for name in _ARRAYS}
+    header = {"num_tasks": dag.num_tasks, "labels": None, "meta": meta or {}}
+    label_array = _labels_array(dag.labels)
+    if label_array is None:
+        header["labels"] = list(dag.labels)
+    elif not np.array_equal(label_array, np.arange(dag.num_tasks)):
+        arrays["labels"] = label_array
+
+    specs = {}
+    offset = 0
+    for name, array in arrays.items():
+        specs[name] = {
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "offset": offset,
+        }
+        offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    header["arrays"] = specs
+
+    encoded = json.dumps(header).encode()
+    prefix = len(MAGIC) + 12
+    data_start = -(-(prefix + len(encoded)) // _ALIGNMENT) * _ALIGNMENT
+    header_bytes = encoded.ljust(data_start - prefix)
+
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<IQ", FORMAT_VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        for name, array in arrays.items():
+            file.seek(data_start + specs[name]["offset"])
+            array.tofile(file)
+        file.truncate(data_start + offset)
+
+
+def read_compiled_dag_header(path):
+    """Returns the JSON header and the offset where the array data starts."""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{path}' is not a .dagz file.")
+        version, header_length = struct.unpack("<IQ", file.read(12))
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled DAG format version: {version}")
+        header = json.loads(file.read(header_length))
+    return header, len(MAGIC) + 12 + header_length
+
+
+def load_compiled_dag(path, mmap=True):
+    """Loads a file written by ``save_compiled_dag``.
+
+    With ``mmap`` the arrays are read-only memory maps of the file, so loading
+    costs no copy and pages are read on first access.
+    """
+    header, data_start = read_compiled_dag_header(path)
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        offset = data_start + spec["offset"]
+        if mmap and int(np.prod(shape)):
+            arrays[name] = np.memmap(
+                path, dtype=dtype, mode="r", offset=offset, shape=shape
+            )
+        else:
+            count = int(np.prod(shape))
+            with open(path, "rb") as file:
+                file.seek(offset)
+                arrays[name] = np.fromfile(file, dtype=dtype, count=count).reshape(
+                    shape
+                )
+
+    if header["labels"] is not None:
+        labels = header["labels"]
+    elif "labels" in arrays:
+        labels = arrays.pop("labels").tolist()
+    else:
+        labels = range(header["num_tasks"])
+    return CompiledDAG(labels, *(arrays[name] for name in _ARRAYS))
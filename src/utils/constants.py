@@ -0,0 +1,45 @@
+import os
+
+# Names and defaults the CLI's argument parser needs. This module imports
+# nothing but the standard library, so the CLI can start without loading
+# NumPy, networkx or the schedulers; the modules using these re-export them.
+
+# src.generation.dag_generator
+GRAPH_TYPES = (
+    "barabasi_albert",
+    "watts_strogatz",
+    "erdos_renyi",
+    "fork_join",
+    "layer_by_layer",
+)
+
+# src.generation.graph_annotator
+DISTRIBUTIONS = ("uniform", "lognormal")
+
+# src.utils.dag_cache
+CACHE_DIR = os.getcwd() + "/data/cache/dags/"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# src.benchmark.heft, src.benchmark.heft_star and src.benchmark.trace
+HEFT_POLICIES = ("append", "insertion")
+CENTRALITY_METHODS = ("exact", "sampled", "path_count")
+TRACE_LEVELS = ("off", "summary", "task")
+
+# src.benchmark.perf
+SUITE_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+SUITE_SEED = 0
+SUITE_RESOURCES = [{"speed": 1.0}, {"speed": 1.5}, {"speed": 0.5}]
+SUITE_CASE_NAMES = (
+    "edf_schedule",
+    "heft_schedule",
+    "heft_star_schedule",
+    "calculate_bottom_level",
+    "annotate_graph",
+    "write_dagz",
+    "read_dagz",
+    "write_gml",
+    "read_gml",
+)
+DEFAULT_BASELINE = os.getcwd() + "/results/perf/baseline.json"
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_STARTUP_BUDGET_MS = 500
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+
+from src.utils.compiled_dag import (
+    load_compiled_dag,
+    read_compiled_dag_header,
+    save_compiled_dag,
+)
+from src.utils.constants import CACHE_DIR, DEFAULT_MAX_BYTES
+
+CACHE_VERSION = 2
+
+
+def cache_key(graph_type, n, params, seed, annotation_config):
+    """Hashes everything that determines a generated and annotated DAG."""
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "graph_type": graph_type,
+            "n": n,
+            "params": params,
+            "seed": seed,
+            "annotation": annotation_config,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_or_build(
+    graph_type,
+    n,
+    params,
+    seed,
+    annotation_config,
+    build,
+    cache_dir=CACHE_DIR,
+    max_bytes=DEFAULT_MAX_BYTES,
+):
+    """Returns the cached compiled DAG for these inputs, building it with ``build`` on a miss.
+
+    Hits are memory-mapped and marked as recently used; misses are written
+    atomically and may evict the least recently used entries.
+    """
+    key = cache_key(graph_type, n, params, seed, annotation_config)
+    path = os.path.join(cache_dir, key + ".dagz")
+    if os.path.exists(path):
+        try:
+            dag = load_compiled_dag(path)
+            os.utime(path)
+            return dag
+        except (OSError, ValueError):
+            pass
+
+    dag = build()
+    os.makedirs(cache_dir, exist_ok=True)
+    partial_path = f"{path}.{os.getpid()}.tmp"
+    save_compiled_dag(
+        dag,
+        partial_path,
+        meta={"graph_type": graph_type, "n": n, "params": params, "seed": seed},
+    )
+    os.replace(partial_path, path)
+    prune_cache(cache_dir, max_bytes)
+    return dag
+
+
+def list_cache(cache_dir=CACHE_DIR):
+    """Returns ``(path, size, last_used, meta)`` per entry, most recently used first."""
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = []
+    for name in os.listdir(cache_dir):
+        if not name.endswith(".dagz"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        try:
+            meta = read_compiled_dag_header(path)[0]["meta"]
+        except (OSError, ValueError):
+            meta = {}
+        entries.append((path, stat.st_size, stat.st_mtime, meta))
+    entries.sort(key=lambda entry: entry[2], reverse=True)
+    return entries
+
+
+def prune_cache(cache_dir=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+    """Evicts least recently used entries until the cache fits in ``max_bytes``.
+
+    Returns the paths that were removed.
+    """
+    entries = list_cache(cache_dir)
+    total = sum(size for _, size, _, _ in entries)
+    removed = []
+    while entries and total > max_bytes:
+        path, size, _, _ = entries.pop()
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed.append(path)
+    return removed
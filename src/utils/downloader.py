@@ -1,8 +1,15 @@
 import os
 import json
+import zlib
+import hashlib
 import requests
-import gzip
-import shutil
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from src.utils.manifest import DatasetManifest
+
+CHUNK_SIZE = 64 * 1024
+MAX_RESUMES = 5
 
 def read_urls(file_path="data/input/urls.json"):
     if not os.path.exists(file_path):
@@ -10,33 +17,173 @@ def read_urls(file_path="data/input/urls.json"):
     with open(file_path, "r") as file:
         return json.load(file)
 
-def download_dataset(url, save_path):
-    response = requests.get(url, stream=True)
-    if response.status_code == 200:
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        compressed_file = save_path + ".gz" if url.endswith(".gz") else save_path
-        
-        with open(compressed_file, "wb") as file:
-            for chunk in response.iter_content(chunk_size=8192):
-                file.write(chunk)
-        print(f"Dataset downloaded and saved to '{compressed_file}'.")
-        
-        if compressed_file.endswith(".gz"):
-            with gzip.open(compressed_file, "rb") as f_in:
-                with open(save_path, "wb") as f_out:
-                    shutil.copyfileobj(f_in, f_out)
-            os.remove(compressed_file)
-            print(f"Extracted '{save_path}'.")
-    else:
-        print(f"Failed to download {url}. HTTP Status Code: {response.status_code}")
-
-def download_all(datasets, output_dir="data/input/dateset"):
+def dataset_path(dataset, output_dir):
+    return os.path.join(output_dir, os.path.basename(dataset["name"]) + ".txt")
+
+def make_session(pool_size=4):
+    """Returns a ``requests.Session`` keeping up to ``pool_size`` connections per host open."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def download_dataset(url, save_path, session=None, max_resumes=MAX_RESUMES):
+    """Downloads ``url`` to ``save_path``, gunzipping ``.gz`` files on the fly.
+
+    Bytes are written to ``save_path + ".part"`` and renamed into place once
+    complete, so ``save_path`` only ever holds a whole dataset. If the
+    connection drops, the download continues from the last byte received with
+    an HTTP Range request, up to ``max_resumes`` times. An uncompressed
+    ``.part`` file left by an earlier run is resumed the same way; a
+    compressed one is restarted, since the decompressor state is lost.
+    Resumed requests carry the first response's ``ETag`` (or
+    ``Last-Modified``) in ``If-Range``, so a file that changed on the server
+    is fetched again from the start rather than spliced. The validators are
+    kept next to the ``.part`` file for later runs, and a download whose
+    response had neither restarts instead of resuming.
+
+    Returns ``{"path", "size", "sha256", "etag", "last_modified"}`` for the
+    saved file, or ``None`` if the download failed. A body that cannot be
+    decompressed fails the download and its ``.part`` file is removed.
+    """
+    session = session or requests
+    compressed = urlparse(url).path.endswith(".gz")
+    part_path = save_path + ".part"
+    validators_path = part_path + ".json"
+    os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
+    offset = 0
+    digest = hashlib.sha256()
+    validators = {}
+    if not compressed and os.path.exists(part_path) and os.path.exists(validators_path):
+        try:
+            with open(validators_path, "r") as file:
+                validators = json.load(file)
+        except (OSError, ValueError):
+            validators = {}
+    if validators.get("etag") or validators.get("last_modified"):
+        with open(part_path, "rb") as file:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+                offset += len(chunk)
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if compressed else None
+    size = offset
+    with open(part_path, "ab" if offset else "wb") as file:
+        resumes = 0
+        while True:
+            headers = {}
+            validator = validators.get("etag") or validators.get("last_modified")
+            # Without a validator a changed file would go unnoticed, so only
+            # resume with one; otherwise the 200 response below starts over.
+            if offset and validator:
+                headers["Range"] = f"bytes={offset}-"
+                headers["If-Range"] = validator
+            try:
+                with session.get(url, stream=True, headers=headers, timeout=60) as response:
+                    if offset and response.status_code == 416:
+                        # An earlier run already received every byte.
+                        chunks = ()
+                    elif response.status_code in (200, 206):
+                        if offset and response.status_code == 200:
+                            # The server ignored the range, so start over.
+                            offset = size = 0
+                            digest = hashlib.sha256()
+                            file.seek(0)
+                            file.truncate()
+                            if compressed:
+                                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                        if response.status_code == 200 or not validators:
+                            validators = {
+                                "etag": response.headers.get("ETag"),
+                                "last_modified": response.headers.get("Last-Modified"),
+                            }
+                            if not compressed:
+                                with open(validators_path, "w") as validators_file:
+                                    json.dump(validators, validators_file)
+                        chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+                    else:
+                        print(f"Failed to download {url}. HTTP Status Code: {response.status_code}")
+                        break
+                    for chunk in chunks:
+                        offset += len(chunk)
+                        data = decompressor.decompress(chunk) if compressed else chunk
+                        digest.update(data)
+                        size += len(data)
+                        file.write(data)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                resumes += 1
+                if resumes > max_resumes:
+                    print(f"Failed to download {url}: {e}")
+                    break
+                print(f"Connection to {url} lost after {offset} bytes, resuming...")
+                continue
+            except (zlib.error, OSError) as e:
+                # A corrupt or non-gzip body, or a failed write: give up on this
+                # dataset without leaving a partial file to resume from.
+                print(f"Failed to download {url}: {e}")
+                file.close()
+                _remove(part_path, validators_path)
+                return None
+            if compressed:
+                if not decompressor.eof:
+                    print(f"Failed to download {url}: truncated gzip stream.")
+                    break
+                data = decompressor.flush()
+                digest.update(data)
+                size += len(data)
+                file.write(data)
+            file.close()
+            os.replace(part_path, save_path)
+            _remove(validators_path)
+            print(f"Dataset downloaded and saved to '{save_path}'.")
+            return {
+                "path": save_path,
+                "size": size,
+                "sha256": digest.hexdigest(),
+                "etag": validators.get("etag"),
+                "last_modified": validators.get("last_modified"),
+            }
+    if compressed:
+        _remove(part_path)
+    return None
+
+def _remove(*paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+def iter_downloads(datasets, output_dir, workers=4, session=None, manifest=None):
+    """Downloads ``datasets`` with up to ``workers`` concurrent downloads.
+
+    Datasets whose file in ``output_dir`` matches the ``DatasetManifest``
+    ``manifest`` (by default the one in ``output_dir``) are skipped, and
+    every finished download is recorded in it. Yields ``(dataset, path)``
+    as each one becomes available, in completion order, with ``path`` set
+    to ``None`` for failed downloads.
+    """
     os.makedirs(output_dir, exist_ok=True)
-    for dataset in datasets:
-        file_name = os.path.basename(dataset["name"]) + '.txt'
-        save_path = os.path.join(output_dir, file_name)
-        if not os.path.exists(save_path):
-            print(f"Downloading {dataset['name']}...")
-            download_dataset(dataset["url"], save_path)
-        else:
-            print(f"Dataset '{file_name}' already exists. Skipping download.")
+    session = session or make_session(workers)
+    manifest = manifest or DatasetManifest.for_directory(output_dir)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for dataset in datasets:
+            save_path = dataset_path(dataset, output_dir)
+            if manifest.is_downloaded(dataset, save_path):
+                print(f"Dataset '{os.path.basename(save_path)}' already exists. Skipping download.")
+                yield dataset, save_path
+                continue
+            if os.path.exists(save_path):
+                print(f"Dataset '{os.path.basename(save_path)}' does not match the manifest. Downloading it again...")
+            else:
+                print(f"Downloading {dataset['name']}...")
+            futures[pool.submit(download_dataset, dataset["url"], save_path, session)] = dataset
+        for future in as_completed(futures):
+            dataset, download = futures[future], future.result()
+            if download is None:
+                yield dataset, None
+                continue
+            manifest.record_download(dataset, download)
+            yield dataset, download["path"]
+
+def download_all(datasets, output_dir="data/input/dateset", workers=4):
+    return list(iter_downloads(datasets, output_dir, workers))
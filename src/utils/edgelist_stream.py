@@ -0,0 +1,159 @@
+import re
+import tracemalloc
+
+import numpy as np
+
+from src.generation.graph_annotator import annotate_arrays
+from src.utils.compiled_dag import CompiledDAG
+
+_COMMENT = re.compile(r"^#.*\n?", re.MULTILINE)
+# A line break followed by a blank line.
+_BLANK_LINE = re.compile(r"\n(?=[ \t\r]*\n)")
+
+
+def _count_data_lines(text):
+    """Counts the lines of ``text`` that are not blank; ``text`` ends with a line break."""
+    blank = len(_BLANK_LINE.findall(text)) + (not text.partition("\n")[0].strip())
+    return text.count("\n") - blank
+
+
+def _parse_chunk(text, node_ids):
+    """Returns the endpoint columns of a block of complete edgelist lines.
+
+    Node IDs are parsed as integers; if ``node_ids`` is a dict, they are
+    instead mapped to integers in order of first appearance.
+    """
+    if "#" in text:
+        text = _COMMENT.sub("", text)
+    if node_ids is None:
+        try:
+            values = np.fromstring(text, dtype=np.int64, sep=" ")
+        except ValueError:  # extra non-integer columns such as weights
+            values = None
+        if values is not None and len(values) == 2 * _count_data_lines(text):
+            edges = values.reshape(-1, 2)
+        else:  # extra columns such as weights or timestamps
+            edges = np.array(
+                [line.split(None, 2)[:2] for line in text.splitlines() if line.strip()],
+                dtype=np.int64,
+            ).reshape(-1, 2)
+    else:
+        edges = np.array(
+            [
+                [node_ids.setdefault(name, len(node_ids)) for name in line.split()[:2]]
+                for line in text.splitlines()
+                if line.strip()
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 2)
+    return edges[:, 0], edges[:, 1]
+
+
+def _sorted_unique(values):
+    values = np.sort(values)
+    if len(values):
+        values = values[np.concatenate([[True], values[1:] != values[:-1]])]
+    return values
+
+
+def _unique_edges(edges):
+    """Sorts ``edges`` by (source, target) and drops duplicates."""
+    if len(edges) and edges.min() >= 0 and edges.max() < 2**31:
+        keys = _sorted_unique((edges[:, 0] << 32) | edges[:, 1])
+        return np.stack([keys >> 32, keys & 0xFFFFFFFF], axis=1)
+    return np.unique(edges, axis=0)
+
+
+def _is_numeric(file_path):
+    with open(file_path, "r") as file:
+        for line in file:
+            if line.startswith("#"):
+                continue
+            fields = line.split(None, 2)
+            if len(fields) >= 2:
+                try:
+                    int(fields[0]), int(fields[1])
+                except ValueError:
+                    return False
+                return True
+    return True
+
+
+def _read_edges(file_path, chunk_size, node_ids):
+    """Reads the oriented, deduplicated edges of an edgelist file chunk by chunk."""
+    chunks = []
+    with open(file_path, "r") as file:
+        while True:
+            text = file.read(chunk_size)
+            if not text:
+                break
+            text += file.readline()
+            if not text.endswith("\n"):
+                text += "\n"
+            a, b = _parse_chunk(text, node_ids)
+            del text
+            keep = a != b
+            edges = np.stack(
+                [np.minimum(a[keep], b[keep]), np.maximum(a[keep], b[keep])], axis=1
+            )
+            chunks.append(_unique_edges(edges))
+    return _unique_edges(np.concatenate(chunks or [np.empty((0, 2), np.int64)]))
+
+
+def stream_edgelist_to_dag(
+    file_path, chunk_size=64 * 1024 * 1024, seed=None, annotation_config=None
+):
+    """Converts an edgelist file into an annotated ``CompiledDAG`` chunk by chunk.
+
+    The file is read in blocks of about ``chunk_size`` characters and lines
+    starting with ``#`` are skipped. Every undirected edge is oriented from
+    the numerically smaller node ID to the larger one (non-numeric IDs are
+    numbered in order of first appearance, as are all IDs of a file mixing
+    integer and non-integer ones), self-loops are dropped and duplicate
+    edges are merged, all without building a networkx graph.
+    Returns ``(dag, peak_bytes)``, where ``peak_bytes`` is the peak memory
+    traced during the conversion.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    node_ids = None if _is_numeric(file_path) else {}
+    try:
+        edges = _read_edges(file_path, chunk_size, node_ids)
+    except ValueError:
+        if node_ids is not None:
+            raise
+        # A later line holds a non-integer ID, so number all IDs as strings.
+        node_ids = {}
+        edges = _read_edges(file_path, chunk_size, node_ids)
+    nodes = _sorted_unique(edges.ravel())
+    endpoints = np.searchsorted(nodes, edges)
+    del edges
+
+    if node_ids is None:
+        labels = nodes.tolist()
+    else:
+        names = list(node_ids)
+        labels = [names[i] for i in nodes.tolist()]
+
+    weight, num_cores, edge_weight = annotate_arrays(
+        len(nodes), len(endpoints), seed=seed, config=annotation_config
+    )
+    # IDs are compacted in increasing order and edges point upwards, so the
+    # identity permutation is already a topological order.
+    dag = CompiledDAG.from_edges(
+        labels,
+        weight,
+        num_cores,
+        endpoints[:, 0],
+        endpoints[:, 1],
+        edge_weight,
+        topo_order=np.arange(len(nodes)),
+    )
+
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    if not was_tracing:
+        tracemalloc.stop()
+    return dag, peak_bytes
@@ -1,6 +1,8 @@
 import networkx as nx
 import os
 
+from src.utils.compiled_dag import CompiledDAG, compile_dag, load_compiled_dag, save_compiled_dag
+
 OUTPUT_DIR = os.getcwd() + '/data/output/graphs/'
 
 def export_graph(dag, filename, is_generated=True):
@@ -9,15 +11,25 @@ def export_graph(dag, filename, is_generated=True):
     else:
         save_address =  OUTPUT_DIR + 'dataset/'
     os.makedirs(os.path.dirname(save_address), exist_ok=True)
-    nx.write_gml(dag, save_address + filename)
+    if filename.endswith('.dagz'):
+        save_compiled_dag(compile_dag(dag), save_address + filename)
+    else:
+        if isinstance(dag, CompiledDAG):
+            dag = dag.to_networkx()
+        nx.write_gml(dag, save_address + filename)
     print(f"Graph saved to {filename}")
+    return save_address + filename
 
-def load_graph(file_path, file_format="gml"):
+def load_graph(file_path, file_format=None):
+    if file_format is None:
+        file_format = 'dagz' if file_path.endswith('.dagz') else 'gml'
     if file_format == "edgelist":
         return nx.read_edgelist(file_path)
     elif file_format == "mtx":
         return nx.read_graphml(file_path)
     elif file_format == "gml":
         return nx.read_gml(file_path)
+    elif file_format == "dagz":
+        return load_compiled_dag(file_path, mmap=True)
     else:
-        raise ValueError(f"Unsupported file format: {file_format}")
\ No newline at end of file
+        raise ValueError(f"Unsupported file format: {file_format}")
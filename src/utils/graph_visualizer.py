@@ -1,7 +1,7 @@
-import matplotlib.pyplot as plt
 import networkx as nx
 
 def visualize_graph(dag, title="Directed Acyclic Graph"):
+    import matplotlib.pyplot as plt
     pos = nx.spring_layout(dag)
     node_weights = nx.get_node_attributes(dag, 'weight')
     edge_weights = {k: round(w, 2) for k, w in nx.get_edge_attributes(dag, 'weight').items()}
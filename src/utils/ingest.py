@@ -0,0 +1,89 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from src.generation.graph_annotator import annotate_graph
+from src.generation.graph_generator import convert_to_dag
+from src.utils.downloader import iter_downloads, make_session
+from src.utils.edgelist_stream import stream_edgelist_to_dag
+from src.utils.graph_io import OUTPUT_DIR, export_graph, load_graph
+from src.utils.manifest import DatasetManifest
+
+
+def process_dataset(input_file, file_format, output_file, seed=None, config=None):
+    if file_format == "edgelist":
+        annotated_dag, peak_bytes = stream_edgelist_to_dag(
+            input_file, seed=seed, annotation_config=config
+        )
+        print(
+            f"Converted {annotated_dag.num_tasks} tasks and {annotated_dag.num_edges} edges "
+            f"(peak memory {peak_bytes / 1024**2:.1f} MB)."
+        )
+    else:
+        G = load_graph(input_file, file_format)
+        dag = convert_to_dag(G)
+        annotated_dag = annotate_graph(dag, seed=seed, config=config)
+    return export_graph(annotated_dag, output_file, is_generated=False)
+
+
+def dataset_output_file(dataset, output_format="dagz"):
+    return f"{dataset['name'].replace(' ', '_')}_dag.{output_format}"
+
+
+def dataset_artifact_path(dataset, output_format="dagz"):
+    """Where ``process_dataset`` saves the DAG built from ``dataset``."""
+    return OUTPUT_DIR + "dataset/" + dataset_output_file(dataset, output_format)
+
+
+def ingest_datasets(
+    datasets,
+    dataset_dir="data/input/dataset",
+    output_format="dagz",
+    download_workers=4,
+    process_workers=None,
+    seed=None,
+    config=None,
+):
+    """Downloads ``datasets`` and converts each one to an annotated DAG.
+
+    Up to ``download_workers`` downloads run at once over pooled
+    connections; each dataset is handed to a pool of ``process_workers``
+    processes (one per CPU by default) as soon as its download finishes,
+    so conversion overlaps with the remaining downloads. Downloads and
+    DAGs that the dataset manifest shows to be up to date are skipped.
+    Returns ``{name: artifact_path}``, with ``None`` for datasets that
+    failed.
+    """
+    session = make_session(download_workers)
+    manifest = DatasetManifest.for_directory(dataset_dir)
+    results = {}
+    datasets = {dataset["name"]: dataset for dataset in datasets}
+    with ProcessPoolExecutor(max_workers=process_workers) as pool:
+        conversions = {}
+        for dataset, path in iter_downloads(
+            datasets.values(), dataset_dir, download_workers, session, manifest
+        ):
+            if path is None:
+                results[dataset["name"]] = None
+                continue
+            artifact_path = dataset_artifact_path(dataset, output_format)
+            if manifest.is_processed(dataset, artifact_path, seed, config):
+                print(f"{dataset['name']} is up to date. Skipping processing.")
+                results[dataset["name"]] = artifact_path
+                continue
+            print(f"Processing {dataset['name']}...")
+            conversions[dataset["name"]] = pool.submit(
+                process_dataset,
+                path,
+                dataset["format"],
+                dataset_output_file(dataset, output_format),
+                seed,
+                config,
+            )
+        for name, future in conversions.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"Error: Failed to process {name}: {e}")
+                results[name] = None
+                continue
+            manifest.record_artifact(datasets[name], results[name], seed, config)
+    return results
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import threading
+
+MANIFEST_NAME = "manifest.json"
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def settings_key(seed, config):
+    """Hashes everything besides the source file that determines a processed DAG."""
+    payload = json.dumps({"seed": seed, "annotation": config}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _matches(entry, path):
+    """Checks ``path`` against the size and checksum recorded in ``entry``.
+
+    A file whose size and modification time are unchanged is trusted
+    without rehashing; otherwise its checksum must still match, and the
+    new modification time is recorded.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    if stat.st_size != entry["size"]:
+        return False
+    if stat.st_mtime_ns == entry["mtime_ns"]:
+        return True
+    if file_sha256(path) != entry["sha256"]:
+        return False
+    entry["mtime_ns"] = stat.st_mtime_ns
+    return True
+
+
+class DatasetManifest:
+    """What is known about each downloaded dataset, kept as JSON beside the datasets.
+
+    Entries are keyed by the dataset name in ``urls.json`` and record the
+    source URL, the downloaded file's path, size, SHA-256 and modification
+    time, the server's ``ETag`` and ``Last-Modified`` headers, and the
+    processed DAGs built from it. Only files that pass these checks are
+    skipped, so a truncated or replaced file is downloaded or processed
+    again. Methods may be called from several threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, "r") as file:
+                self.entries = json.load(file)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_directory(cls, dataset_dir):
+        return cls(os.path.join(dataset_dir, MANIFEST_NAME))
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        partial_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(partial_path, "w") as file:
+            json.dump(self.entries, file, indent=2, sort_keys=True)
+        os.replace(partial_path, self.path)
+
+    def is_downloaded(self, dataset, path):
+        """Returns whether ``path`` holds the complete download of ``dataset``."""
+        with self._lock:
+            entry = self.entries.get(dataset["name"])
+            if entry is None or entry["url"] != dataset["url"]:
+                return False
+            if entry["path"] != path:
+                return False
+            mtime_ns = entry["mtime_ns"]
+            if not _matches(entry, path):
+                return False
+            if entry["mtime_ns"] != mtime_ns:
+                self.save()
+            return True
+
+    def record_download(self, dataset, download):
+        """Records the result of ``download_dataset``, dropping older artifacts."""
+        with self._lock:
+            self.entries[dataset["name"]] = {
+                "url": dataset["url"],
+                "path": download["path"],
+                "size": download["size"],
+                "sha256": download["sha256"],
+                "mtime_ns": os.stat(download["path"]).st_mtime_ns,
+                "etag": download["etag"],
+                "last_modified": download["last_modified"],
+                "artifacts": {},
+            }
+            self.save()
+
+    def source_sha256(self, dataset):
+        entry = self.entries.get(dataset["name"])
+        return entry["sha256"] if entry is not None else None
+
+    def is_processed(self, dataset, artifact_path, seed=None, config=None):
+        """Returns whether ``artifact_path`` was built from the recorded download with these settings."""
+        with self._lock:
+            entry = self.entries.get(dataset["name"])
+            if entry is None:
+                return False
+            artifact = entry["artifacts"].get(artifact_path)
+            if artifact is None or artifact["settings"] != settings_key(seed, config):
+                return False
+            mtime_ns = artifact["mtime_ns"]
+            if not _matches(artifact, artifact_path):
+                return False
+            if artifact["mtime_ns"] != mtime_ns:
+                self.save()
+            return True
+
+    def record_artifact(self, dataset, artifact_path, seed=None, config=None):
+        with self._lock:
+            entry = self.entries.get(dataset["name"])
+            if entry is None:
+                return
+            stat = os.stat(artifact_path)
+            entry["artifacts"][artifact_path] = {
+                "settings": settings_key(seed, config),
+                "size": stat.st_size,
+                "sha256": file_sha256(artifact_path),
+                "mtime_ns": stat.st_mtime_ns,
+            }
+            self.save()
@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+import pytest
+
+from src.benchmark.perf import CLI_PATH, SUITE_CASES
+from src.utils.constants import SUITE_CASE_NAMES
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["download", "--help"]])
+def test_help_does_not_load_numerical_libraries(argv):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", CLI_PATH, *argv],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = {
+        line.split("|")[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    assert not imported & {"numpy", "networkx", "src.benchmark.perf"}
+
+
+def test_suite_case_names_match_suite_cases():
+    assert tuple(SUITE_CASES) == SUITE_CASE_NAMES
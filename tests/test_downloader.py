@@ -0,0 +1,223 @@
+import gzip
+import os
+import random
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.utils import graph_io, ingest
+from src.utils.downloader import download_dataset
+from src.utils.ingest import ingest_datasets
+from src.utils.manifest import DatasetManifest
+
+_rng = random.Random(0)
+# Large enough that a dropped connection still delivers some whole chunks.
+EDGES = "".join(
+    f"{_rng.randrange(20000)} {_rng.randrange(20000)}\n" for _ in range(100000)
+).encode()
+
+
+class DatasetHandler(BaseHTTPRequestHandler):
+    """Serves ``server.files`` with byte-range support.
+
+    ``?drop`` cuts the connection a third of the way into the first full
+    response for a path, ``?norange`` makes the server ignore ``Range`` and
+    always answer ``200``, and ``?noetag`` leaves out the ``ETag``, which is
+    otherwise ``server.etags[path]`` and checked against ``If-Range``. Every
+    request is logged to ``server.requests`` as ``(path, range, status)``,
+    and its ``If-Range`` to ``server.if_ranges``.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, status, body=b"", headers=()):
+        self.server.requests.append((self.path, self.headers.get("Range"), status))
+        self.server.if_ranges.append(self.headers.get("If-Range"))
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return body
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        data = self.server.files.get(path)
+        if data is None:
+            self.wfile.write(self._respond(404))
+            return
+        etag = self.server.etags.get(path, '"v1"')
+        headers = [] if "noetag" in query else [("ETag", etag)]
+        match = re.match(r"bytes=(\d+)-", self.headers.get("Range", ""))
+        if_range = self.headers.get("If-Range", etag)
+        if match and "norange" not in query and if_range == etag:
+            start = int(match.group(1))
+            if start >= len(data):
+                self.wfile.write(self._respond(416))
+                return
+            headers.append(
+                ("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+            )
+            body = self._respond(206, data[start:], headers)
+        else:
+            body = self._respond(200, data, headers)
+        if "drop" in query and path not in self.server.dropped:
+            self.server.dropped.add(path)
+            self.wfile.write(body[: len(body) // 3])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DatasetHandler)
+    server.files = {
+        "/plain.txt": EDGES,
+        "/edges.txt.gz": gzip.compress(EDGES),
+        "/bad.gz": b"<html>Not Found</html>",
+    }
+    server.etags = {}
+    server.requests = []
+    server.if_ranges = []
+    server.dropped = set()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _read(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def test_plain_download(server, tmp_path):
+    save_path = str(tmp_path / "plain.txt")
+    download = download_dataset(f"{server.url}/plain.txt", save_path)
+    assert download["path"] == save_path
+    assert download["size"] == len(EDGES)
+    assert download["etag"] == '"v1"'
+    assert _read(save_path) == EDGES
+    assert not os.path.exists(save_path + ".part")
+
+
+def test_gzip_decoded_on_the_fly(server, tmp_path):
+    save_path = str(tmp_path / "edges.txt")
+    download = download_dataset(f"{server.url}/edges.txt.gz", save_path)
+    assert download["size"] == len(EDGES)
+    assert _read(save_path) == EDGES
+
+
+@pytest.mark.parametrize("name", ["plain.txt", "edges.txt.gz"])
+def test_dropped_connection_resumes_with_range(server, tmp_path, name):
+    save_path = str(tmp_path / "edges.txt")
+    assert download_dataset(f"{server.url}/{name}?drop", save_path) is not None
+    assert _read(save_path) == EDGES
+    (_, first_range, first_status), (_, resume_range, resume_status) = server.requests
+    assert (first_range, first_status) == (None, 200)
+    assert resume_range.startswith("bytes=") and resume_range != "bytes=0-"
+    assert resume_status == 206
+
+
+def test_server_ignoring_range_restarts(server, tmp_path):
+    save_path = str(tmp_path / "plain.txt")
+    assert (
+        download_dataset(f"{server.url}/plain.txt?drop&norange", save_path) is not None
+    )
+    assert _read(save_path) == EDGES
+    (_, _, first_status), (_, resume_range, resume_status) = server.requests
+    assert first_status == 200
+    assert resume_range is not None and resume_status == 200
+
+
+def _interrupt(server, url, save_path):
+    """Leaves a ``.part`` file behind, as a run killed mid-download would."""
+    assert download_dataset(url, save_path, max_resumes=0) is None
+    assert 0 < os.path.getsize(save_path + ".part") < len(EDGES)
+    server.requests.clear()
+    server.if_ranges.clear()
+
+
+def test_leftover_part_resumes_with_if_range(server, tmp_path):
+    save_path = str(tmp_path / "plain.txt")
+    _interrupt(server, f"{server.url}/plain.txt?drop", save_path)
+    download = download_dataset(f"{server.url}/plain.txt", save_path)
+    assert download["size"] == len(EDGES)
+    assert _read(save_path) == EDGES
+    [(_, resume_range, status)] = server.requests
+    assert resume_range != "bytes=0-" and status == 206
+    assert server.if_ranges == ['"v1"']
+    assert not os.path.exists(save_path + ".part.json")
+
+
+def test_leftover_part_of_changed_file_restarts(server, tmp_path):
+    save_path = str(tmp_path / "plain.txt")
+    _interrupt(server, f"{server.url}/plain.txt?drop", save_path)
+    changed = EDGES[::-1]
+    server.files["/plain.txt"] = changed
+    server.etags["/plain.txt"] = '"v2"'
+    download = download_dataset(f"{server.url}/plain.txt", save_path)
+    assert download["etag"] == '"v2"'
+    assert _read(save_path) == changed
+    [(_, _, status)] = server.requests
+    assert status == 200
+
+
+def test_leftover_part_without_validator_restarts(server, tmp_path):
+    save_path = str(tmp_path / "plain.txt")
+    _interrupt(server, f"{server.url}/plain.txt?drop&noetag", save_path)
+    assert download_dataset(f"{server.url}/plain.txt?noetag", save_path) is not None
+    assert _read(save_path) == EDGES
+    assert server.requests == [("/plain.txt?noetag", None, 200)]
+
+
+def test_invalid_gzip_fails_without_part_file(server, tmp_path):
+    save_path = str(tmp_path / "bad.txt")
+    assert download_dataset(f"{server.url}/bad.gz", save_path) is None
+    assert not os.path.exists(save_path)
+    assert not os.path.exists(save_path + ".part")
+
+
+def test_ingest_datasets(server, tmp_path, monkeypatch):
+    output_dir = str(tmp_path / "graphs") + "/"
+    monkeypatch.setattr(graph_io, "OUTPUT_DIR", output_dir)
+    monkeypatch.setattr(ingest, "OUTPUT_DIR", output_dir)
+    dataset_dir = str(tmp_path / "datasets")
+    datasets = [
+        {
+            "name": "edges",
+            "url": f"{server.url}/edges.txt.gz?drop",
+            "format": "edgelist",
+        },
+        {"name": "plain", "url": f"{server.url}/plain.txt", "format": "edgelist"},
+        {"name": "bad", "url": f"{server.url}/bad.gz", "format": "edgelist"},
+        {"name": "missing", "url": f"{server.url}/missing.txt", "format": "edgelist"},
+    ]
+
+    results = ingest_datasets(datasets, dataset_dir, process_workers=1, seed=0)
+    assert results["bad"] is None and results["missing"] is None
+    for name in ("edges", "plain"):
+        assert results[name] == output_dir + f"dataset/{name}_dag.dagz"
+        assert os.path.exists(results[name])
+        assert _read(os.path.join(dataset_dir, f"{name}.txt")) == EDGES
+    dag = graph_io.load_graph(results["edges"])
+    assert dag.num_edges > 0
+
+    manifest = DatasetManifest.for_directory(dataset_dir)
+    assert manifest.is_processed(datasets[0], results["edges"], seed=0)
+
+    # A second run finds everything up to date and fetches nothing.
+    server.requests.clear()
+    rerun = ingest_datasets(datasets[:2], dataset_dir, process_workers=1, seed=0)
+    assert rerun == {name: results[name] for name in ("edges", "plain")}
+    assert server.requests == []
@@ -0,0 +1,45 @@
+import pytest
+
+from src.utils.edgelist_stream import stream_edgelist_to_dag
+
+
+def _edges(dag):
+    graph = dag.to_networkx()
+    return sorted(graph.edges())
+
+
+def test_numeric_ids(tmp_path):
+    path = tmp_path / "edges.txt"
+    path.write_text("# comment\n3 1\n1 2\n2 3\n1 1\n3 1\n")
+    dag, _ = stream_edgelist_to_dag(str(path), seed=0)
+    assert _edges(dag) == [(1, 2), (1, 3), (2, 3)]
+
+
+def test_negative_ids(tmp_path):
+    path = tmp_path / "edges.txt"
+    path.write_text("-5 -3\n-7 -2\n")
+    dag, _ = stream_edgelist_to_dag(str(path), seed=0)
+    assert _edges(dag) == [(-7, -2), (-5, -3)]
+
+
+def test_non_numeric_id_after_numeric_lines(tmp_path):
+    path = tmp_path / "edges.txt"
+    path.write_text("1 2\n2 3\nfoo bar\n")
+    for chunk_size in (4, 64 * 1024 * 1024):
+        dag, _ = stream_edgelist_to_dag(str(path), chunk_size=chunk_size, seed=0)
+        assert _edges(dag) == [("1", "2"), ("2", "3"), ("foo", "bar")]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1 2 100\n2 3 200\n\n", [(1, 2), (2, 3)]),
+        ("1 2 3\n4 5 6\n\n", [(1, 2), (4, 5)]),
+        ("\n1 2\n  \n\n2 3\n", [(1, 2), (2, 3)]),
+    ],
+)
+def test_extra_columns_with_blank_lines(tmp_path, text, expected):
+    path = tmp_path / "edges.txt"
+    path.write_text(text)
+    dag, _ = stream_edgelist_to_dag(str(path), seed=0)
+    assert _edges(dag) == expected
@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("matplotlib")
+import matplotlib
+
+matplotlib.use("Agg")
+
+from src.benchmark.main import (
+    plot_average_per_network,
+    plot_comparison_per_algorithm,
+    plot_comparison_per_network,
+)
+
+PARAM_SETS = [{"m": 1}, {"m": 2}]
+ALGORITHMS = ["EDF", "HEFT"]
+
+
+def _runs(sizes):
+    return {
+        "size": sizes,
+        "makespan": [float(size) for size in sizes],
+        "utilization": [0.5] * len(sizes),
+    }
+
+
+def _results():
+    # HEFT skipped size 20 with the second parameter set.
+    return {
+        "EDF": {
+            str(PARAM_SETS[0]): _runs([10, 20]),
+            str(PARAM_SETS[1]): _runs([10, 20]),
+        },
+        "HEFT": {str(PARAM_SETS[0]): _runs([10, 20]), str(PARAM_SETS[1]): _runs([10])},
+    }
+
+
+def test_plots_follow_recorded_sizes_when_cells_are_skipped(tmp_path):
+    results = _results()
+    plot_comparison_per_network(
+        "barabasi_albert", results, PARAM_SETS, output=str(tmp_path / "network.png")
+    )
+    all_results = {"barabasi_albert": results}
+    plot_comparison_per_algorithm(
+        all_results,
+        {"barabasi_albert": PARAM_SETS},
+        ALGORITHMS,
+        ["barabasi_albert"],
+        output=str(tmp_path / "algorithm.png"),
+    )
+    plot_average_per_network(
+        all_results,
+        ALGORITHMS,
+        ["barabasi_albert"],
+        output=str(tmp_path / "average.png"),
+    )
+    assert len(list(tmp_path.iterdir())) == 3
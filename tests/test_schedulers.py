@@ -0,0 +1,175 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from src.benchmark.cost_model import CostModel
+from src.benchmark.dict_schedulers import SCHEDULERS as DICT_SCHEDULERS
+from src.benchmark.edf import edf_deadlines, edf_schedule
+from src.benchmark.heft import SLOT_BLOCK, IdleSlots, heft_schedule
+from src.benchmark.heft_star import calculate_centrality, heft_star_schedule
+from src.benchmark.incremental import IncrementalHEFT
+from src.benchmark.online import OnlineScheduler, dag_events
+from src.benchmark.trace import SchedulerTrace
+from src.generation.dag_generator import generate_dag
+
+RESOURCES = [{"speed": speed} for speed in (0.5, 1.0, 1.5, 2.0) * 3]
+
+
+def _heft_star(dag, resources, **kwargs):
+    return heft_star_schedule(dag, resources, centrality="path_count", **kwargs)
+
+
+@pytest.fixture
+def dag():
+    return generate_dag("layer_by_layer", 200, seed=1)
+
+
+@pytest.fixture
+def cost_model(dag):
+    rng = np.random.default_rng(0)
+    return CostModel.from_matrix(
+        dag, rng.random((dag.num_tasks, len(RESOURCES))) * dag.weight[:, None]
+    )
+
+
+@pytest.mark.parametrize("scheduler", [heft_schedule, edf_schedule, _heft_star])
+@pytest.mark.parametrize("with_matrix", [False, True])
+def test_eft_kernels_agree(dag, cost_model, scheduler, with_matrix):
+    model = cost_model if with_matrix else None
+    scalar = scheduler(dag, RESOURCES, cost_model=model, kernel="scalar")
+    vector = scheduler(dag, RESOURCES, cost_model=model, kernel="vector")
+    assert dict(scalar[0]) == dict(vector[0])
+    assert scalar[1] == vector[1]
+
+
+def test_incremental_heft_with_cost_matrix(dag, cost_model):
+    graph = dag.to_networkx()
+    scheduler = IncrementalHEFT(graph, RESOURCES, cost_model=cost_model)
+    assert scheduler.result == heft_schedule(graph, RESOURCES, cost_model=cost_model)
+
+    row = [1.0] * len(RESOURCES)
+    scheduler.update_weight(dag.labels[5], 3, exec_time=row)
+    scheduler.add_task("new", 2, predecessors={dag.labels[0]: 0.5}, exec_time=row)
+    with pytest.raises(ValueError):
+        scheduler.add_task("other", 2)
+    result = scheduler.reschedule()
+    assert result == heft_schedule(
+        scheduler.to_networkx(), RESOURCES, cost_model=scheduler.to_cost_model()
+    )
+
+
+def test_online_scheduler_with_cost_matrix(dag, cost_model):
+    scheduler = OnlineScheduler(RESOURCES)
+    placements = list(scheduler.run(dag_events(dag, cost_model=cost_model)))
+    assert len(placements) == dag.num_tasks
+    for task, resource, start, end in placements:
+        expected = cost_model.exec_time[dag.index[task], resource]
+        assert end - start == pytest.approx(expected)
+
+
+def test_sliced_deadlines_are_latest_finish_times():
+    chain = nx.DiGraph()
+    for label, weight in (("a", 1), ("b", 2), ("c", 3)):
+        chain.add_node(label, weight=weight, num_cores=1)
+    chain.add_edge("a", "b", weight=0)
+    chain.add_edge("b", "c", weight=0)
+    # The critical path is 6 long, so the schedule ends at 12 with factor 2.
+    assert edf_deadlines(chain, factor=2.0) == {"a": 7.0, "b": 9.0, "c": 12.0}
+    assert edf_deadlines(chain) == {"a": 1.0, "b": 3.0, "c": 6.0}
+
+
+def test_idle_slots_find_first_fitting_gap():
+    slots = IdleSlots()
+    busy = []
+    rng = np.random.default_rng(0)
+    # Short tasks with short gaps between them span several blocks of slots.
+    for start in range(0, 40 * SLOT_BLOCK, 4):
+        end = start + 3 - rng.random()
+        slots.reserve(start, end)
+        busy.append((start, end))
+    for _ in range(300):
+        ready_time, duration = rng.random() * 200 * SLOT_BLOCK, rng.random() * 1.5
+        free = [(0, busy[0][0])]
+        free += [(a[1], b[0]) for a, b in zip(busy, busy[1:])]
+        free.append((busy[-1][1], float("inf")))
+        expected = next(
+            max(start, ready_time)
+            for start, end in free
+            if max(start, ready_time) + duration <= end
+        )
+        assert slots.earliest_start(ready_time, duration) == expected
+        slots.reserve(expected, expected + duration)
+        busy = sorted(busy + [(expected, expected + duration)])
+
+
+@pytest.mark.parametrize("policy", ["edf", "fifo"])
+def test_online_ready_ties_keep_arrival_order(policy):
+    scheduler = OnlineScheduler([{"speed": 1.0}], policy=policy)
+    # Both successors become ready in one dispatch; their labels do not compare.
+    assert scheduler.submit("b", preds=["root"]) == []
+    assert scheduler.submit(1, preds=["root"]) == []
+    placements = scheduler.submit("root")
+    assert [task for task, *_ in placements] == ["root", "b", 1]
+
+
+def test_online_rejects_evicted_tasks():
+    scheduler = OnlineScheduler([{"speed": 1.0}])
+    scheduler.submit("a", num_successors=1)
+    scheduler.submit("b", preds=["a"], num_successors=0)
+    assert scheduler.evicted == 1 and scheduler.resident == 0
+    for task in ("a", "b"):
+        with pytest.raises(ValueError):
+            scheduler.submit(task)
+    with pytest.raises(ValueError):
+        scheduler.submit("c", preds=["x", "a"])
+    assert scheduler.resident == 0 and not scheduler.blocked
+
+
+@pytest.mark.parametrize("level", [None, "off", "summary", "task"])
+def test_heft_star_reports_unplaced_tasks_through_trace(level, capsys):
+    dag = generate_dag("barabasi_albert", 300, seed=1)
+    # No two cores share a speed, so no GANG task can be placed.
+    cores = [{"speed": speed} for speed in (0.5, 1.0, 1.5)]
+    trace = None if level is None else SchedulerTrace(level)
+    _heft_star(dag, cores, trace=trace)
+    lines = capsys.readouterr().out.splitlines()
+    if level in (None, "off"):
+        assert lines == []
+        return
+    unplaced = trace.runs[-1]["unplaced"]
+    assert unplaced > 0
+    assert f"{unplaced} tasks could not be scheduled." in lines
+    named = [line for line in lines if line.startswith("Task ")]
+    assert len(named) == (unplaced if level == "task" else 0)
+
+
+@pytest.mark.parametrize("name", ["HEFT", "HEFT*"])
+def test_dict_baselines_match_compiled_schedulers(dag, name):
+    graph = dag.to_networkx()
+    compiled = {"HEFT": heft_schedule, "HEFT*": heft_star_schedule}[name]
+    baseline = DICT_SCHEDULERS[name](graph, RESOURCES)
+    result = compiled(dag, RESOURCES)
+    assert result[1] == baseline[1]
+    assert {core: tasks for core, tasks in result[0].items() if tasks} == {
+        core: tasks for core, tasks in baseline[0].items() if tasks
+    }
+
+
+def test_path_count_centrality_separates_deep_tasks():
+    # Paths double with every layer, to 2**1199 (over 800 nats) through the
+    # layers, while a tail below layer k has only 2**k paths through it.
+    layers = 1200
+    graph = nx.DiGraph()
+    for layer in range(layers):
+        for node in ("a", "b"):
+            graph.add_node((layer, node), weight=1, num_cores=1)
+            if layer:
+                graph.add_edge((layer - 1, "a"), (layer, node), weight=0)
+                graph.add_edge((layer - 1, "b"), (layer, node), weight=0)
+    for k in range(1, 6):
+        graph.add_node(("tail", k), weight=1, num_cores=1)
+        graph.add_edge((k, "a"), ("tail", k), weight=0)
+    scores = dict(zip(graph.nodes, calculate_centrality(graph, "path_count")))
+    tails = [scores[("tail", k)] for k in range(1, 6)]
+    assert all(np.isfinite(tails))
+    assert tails == sorted(set(tails))